@@ -12,6 +12,7 @@ from fastapi.middleware.cors import CORSMiddleware
 
 
 import os
+import asyncio
 
 from app.models.database import engine
 from app.models import database
@@ -39,6 +40,10 @@ from app.utils.schedulers.cron.trait_compression_cron import compress_old_traits
 
 from app.services.nudge_service import process_nudges
 from app.services.hourly_notifier import hourly_notify_users
+from app.services.mistral_ai_service import close_llm_clients
+from app.services.translation_service import close_translation_clients
+from app.utils.message_catalog import warm_message_catalog
+from app.utils.client_pool import close_loop_clients
 
 from pytz import timezone as pytz_timezone  # ✅ Rename to avoid collision
 IST = pytz_timezone("Asia/Kolkata")         # ✅ Create pytz-compatible timezone object
@@ -91,8 +96,16 @@ async def lifespan(app: FastAPI):
 
 
     scheduler.start()
+
+    # 🌐 Translate and voice the fixed system messages in the background
+    catalog_task = asyncio.create_task(warm_message_catalog())
+
     yield
+    catalog_task.cancel()
     scheduler.shutdown()
+    await close_llm_clients()
+    await close_translation_clients()
+    await close_loop_clients()
 
 # Create FastAPI app with lifespan
 app = FastAPI(
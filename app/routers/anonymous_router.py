@@ -28,7 +28,7 @@ from app.schemas.user_schemas import (
 )
 
 from app.utils.audio_processor import synthesize_voice
-from app.services.translation_service import translate
+from app.services.translation_service import translate, translate_many
 
 logger = logging.getLogger("update_onboarding")
 
@@ -118,7 +118,7 @@ async def update_onboarding(
     # Wakeword instruction text
     base_instruction = "Please record your wake word 3 times so Neura can activate by voice. Example: 'Hey Neura or Neura Baby'."
     user_lang = user.preferred_lang or "en"
-    translated_text = translate(base_instruction, source_lang="en", target_lang=user_lang) if user_lang != "en" else base_instruction
+    translated_text = await translate(base_instruction, source_lang="en", target_lang=user_lang) if user_lang != "en" else base_instruction
 
     # Robust TTS call with logging
     stream_url = None
@@ -145,28 +145,8 @@ async def update_onboarding(
 
 
 #---------------------------------------------------
-# Translation Caching & UI Translation
+# UI Translation (cached inside translate, see translation_cache)
 #---------------------------------------------------
-CACHE_ROOT = Path(os.getenv("HF_HOME", "/data"))
-CACHE_DIR = CACHE_ROOT / "translation_cache"
-CACHE_DIR.mkdir(parents=True, exist_ok=True)
-
-def _get_lang_cache_path(lang: str) -> Path:
-    return CACHE_DIR / f"{lang}.json"
-
-def _load_lang_cache(lang: str) -> Dict[str, str]:
-    path = _get_lang_cache_path(lang)
-    if path.exists():
-        with open(path, "r", encoding="utf-8") as f:
-            return json.load(f)
-    return {}
-
-def _save_lang_cache(lang: str, cache: Dict[str, str]):
-    path = _get_lang_cache_path(lang)
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump(cache, f, ensure_ascii=False, indent=2)
-
-
 @router.post("/translate-ui", response_model=TranslationResponse)
 async def translate_ui_texts(
     payload: TranslationRequest,
@@ -183,24 +163,8 @@ async def translate_ui_texts(
     user.preferred_lang = payload.target_lang
     db.commit()
 
-    lang_cache = _load_lang_cache(payload.target_lang)
-    translations: Dict[str, str] = {}
-    missing_texts = [txt for txt in payload.strings if txt not in lang_cache]
-
-    if missing_texts:
-        for batch in chunked(missing_texts, 50):
-            batch_results = await asyncio.gather(*[
-                translate(text=txt, source_lang="en", target_lang=payload.target_lang)
-                for txt in batch
-            ])
-            for txt, translated in zip(batch, batch_results):
-                lang_cache[txt] = translated
-                translations[txt] = translated
-    
-        _save_lang_cache(payload.target_lang, lang_cache)
-
-    for txt in payload.strings:
-        translations[txt] = lang_cache.get(txt, txt)
+    translated = await translate_many(payload.strings, source_lang="en", target_lang=payload.target_lang)
+    translations: Dict[str, str] = dict(zip(payload.strings, translated))
 
     return {
         "message": "✅ UI translations returned",
@@ -3,7 +3,12 @@
 # Licensed under the MIT License - see the LICENSE file for details.
 
 import os
+import json
+import time
+from typing import Optional
 from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.responses import StreamingResponse
+from fastapi.encoders import jsonable_encoder
 from sqlalchemy.orm import Session
 from app.models.database import SessionLocal
 from app.models.user import User, TierLevel
@@ -13,17 +18,23 @@ from app.utils.tier_logic import get_monthly_limit
 from pydantic import BaseModel
 from datetime import datetime
 
-from app.services.intent_router_core import detect_and_route_intent
+from app.services.intent_router_core import detect_and_route_intent, classify_intent
 from app.schemas.intent_schemas import IntentRequest
-from app.services.fallback_chat_ai import handle_chat_fallback
+from app.services.fallback_chat_ai import (
+    handle_chat_fallback, build_fallback_prompt, record_fallback_exchange, start_speculative_fallback
+)
 from app.utils.red_flag_utils import detect_red_flag, SEVERE_KEYWORDS
 from app.utils.prompt_templates import red_flag_response, creator_info_response, self_query_response
-from app.services.emotion_tone_updater import update_emotion_status
-from app.utils.ai_engine import generate_ai_reply
+from app.services.emotion_tone_updater import update_emotion_status, start_emotion_memo
+from app.utils.ai_engine import generate_ai_reply, stream_ai_reply
+from app.utils.llm_scheduler import set_llm_priority
+from app.utils.sentence_splitter import stream_sentences
+from app.utils.usage_tracker import track_usage_event
 from app.services.persona_engine import run_persona_engine
 from app.utils.persona_prompt_wrapper import inject_persona_into_prompt
 from app.models.sos_contact import SOSContact
 from app.services.translation_service import translate
+from app.utils.native_generation import is_native_generation, record_reply_latency
 
 router = APIRouter(prefix="/chat", tags=["Chat Auth"])
 ASSISTANT_NAME = "Neura"
@@ -40,36 +51,11 @@ class ChatRequest(BaseModel):
     message: str
     conversation_id: int = 1
 
-@router.post("/chat-with-neura")
-async def chat_with_neura(
-    request: Request,
-    payload: ChatRequest,
-    db: Session = Depends(get_db),
-    user_data: dict = Depends(require_token)
-):
-    ensure_token_user_match(user_data["sub"], payload.device_id)
-
-    user = db.query(User).filter(User.temp_uid == payload.device_id).first()
-
-    # ✅ Check if at least one SOS contact is saved
-    has_sos_contact = db.query(SOSContact).filter(SOSContact.device_id == payload.device_id).first()
-    if not has_sos_contact:
-        return {
-            "reply": "🛡️ Please add an SOS contact to continue. This is required for your safety.",
-            "require_sos_contact": True
-        }
-
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
-
-    # 🌐 Translate input
-    user_lang = user.preferred_lang or "en"
-    if user_lang != "en":
-        original_text = payload.message
-        payload.message = translate(original_text, source_lang=user_lang, target_lang="en")
-
-    is_important = any(word in payload.message.lower() for word in ["remember", "goal", "habit", "remind", "dream", "mission"])
-
+async def _check_quota_and_red_flags(user: User, message: str, user_lang: str, is_important: bool) -> Optional[dict]:
+    """
+    Shared by the blocking and streaming chat endpoints.
+    Returns a ready reply when the monthly quota is used up or a red flag fires, else None.
+    """
     now = datetime.utcnow()
     if user.last_gpt_reset.month != now.month or user.last_gpt_reset.year != now.year:
         user.monthly_gpt_count = 0
@@ -94,11 +80,11 @@ async def chat_with_neura(
         }
 
     # 🚩 Red flag detection
-    red_flag = detect_red_flag(payload.message)
+    red_flag = detect_red_flag(message)
     ai_name = user.ai_name or "Neura"
 
     if red_flag == "code":
-        reply_text = red_flag_response(reason="code or internal details", lang=user_lang)
+        reply_text = await red_flag_response(reason="code or internal details", lang=user_lang)
         return {
             "reply": reply_text,
             "memory_enabled": user.memory_enabled,
@@ -108,7 +94,7 @@ async def chat_with_neura(
         }
 
     if red_flag == "creator":
-        reply_text = creator_info_response(lang=user_lang)
+        reply_text = await creator_info_response(lang=user_lang)
         return {
             "reply": reply_text,
             "memory_enabled": user.memory_enabled,
@@ -118,7 +104,7 @@ async def chat_with_neura(
         }
 
     if red_flag == "self_query":
-        reply_text = self_query_response(ai_name=ai_name, lang=user_lang)
+        reply_text = await self_query_response(ai_name=ai_name, lang=user_lang)
         return {
             "reply": reply_text,
             "memory_enabled": user.memory_enabled,
@@ -128,7 +114,7 @@ async def chat_with_neura(
         }
 
     if red_flag == "sos":
-        is_force = any(term in payload.message.lower() for term in SEVERE_KEYWORDS)
+        is_force = any(term in message.lower() for term in SEVERE_KEYWORDS)
         reply_text = "🚨 Emergency detected. Triggering SOS alert."
         return {
             "reply": reply_text,
@@ -140,27 +126,65 @@ async def chat_with_neura(
             "messages_remaining": monthly_limit - user.monthly_gpt_count
         }
 
+    return None
+
+
+@router.post("/chat-with-neura")
+async def chat_with_neura(
+    request: Request,
+    payload: ChatRequest,
+    db: Session = Depends(get_db),
+    user_data: dict = Depends(require_token)
+):
+    ensure_token_user_match(user_data["sub"], payload.device_id)
+
+    user = db.query(User).filter(User.temp_uid == payload.device_id).first()
+
+    # ✅ Check if at least one SOS contact is saved
+    has_sos_contact = db.query(SOSContact).filter(SOSContact.device_id == payload.device_id).first()
+    if not has_sos_contact:
+        return {
+            "reply": "🛡️ Please add an SOS contact to continue. This is required for your safety.",
+            "require_sos_contact": True
+        }
+
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+    set_llm_priority(user)
+    start_emotion_memo()
+
+    # 🌐 Translate input (English is still needed for red flags, keywords and intents)
+    user_lang = user.preferred_lang or "en"
+    native = is_native_generation(user_lang)
+    native_message = payload.message if native else None
+    turn_started = time.monotonic()
+    if user_lang != "en":
+        original_text = payload.message
+        payload.message = await translate(original_text, source_lang=user_lang, target_lang="en")
+    translation_seconds = time.monotonic() - turn_started
+
+    is_important = any(word in payload.message.lower() for word in ["remember", "goal", "habit", "remind", "dream", "mission"])
+
+    early_reply = await _check_quota_and_red_flags(user, payload.message, user_lang, is_important)
+    if early_reply:
+        return early_reply
+
+    monthly_limit = get_monthly_limit(user.tier)
+
     emotion_label = await update_emotion_status(user, payload.message, db, source="chat")
     await run_persona_engine(db, user)
 
-    intent_prompt = f"""
-    You are an assistant that classifies user intent.
-    Return ONLY one word from this list:
-    [journal, journal_list, journal_delete, journal_modify,
-     checkin, checkin_list, checkin_delete, checkin_modify,
-     habit, habit_list, habit_modify, habit_delete,
-     goal, goal_list, goal_modify, goal_delete,
-     search, notification, smart_reply,
-     creator_mode, creator_caption, creator_content_ideas,
-     creator_weekly_plan, creator_audience_helper, creator_viral_reels,
-     creator_seo, creator_email, creator_time_planner,
-     creator_youtube_script, creator_blog,
-     fallback]
-    User input: {payload.message}
-    Intent:
-    """
-    intent_raw = generate_ai_reply(inject_persona_into_prompt(user, intent_prompt, db))
-    intent = intent_raw.strip().lower()
+    speculative = start_speculative_fallback(db, user, payload.message, payload.conversation_id, native_message=native_message)
+    try:
+        classification = await classify_intent(user, payload.message, db)
+    except BaseException:
+        if speculative:
+            speculative.discard()
+        raise
+    intent = classification.intent
+
+    if speculative and intent != "fallback":
+        speculative.discard()
 
     if intent == "fallback":
         fallback_result = await handle_chat_fallback(
@@ -169,11 +193,17 @@ async def chat_with_neura(
             user_message=payload.message,
             is_important=is_important,
             conversation_id=payload.conversation_id,
+            speculative=speculative,
+            native_message=native_message,
         )
 
-        # 🌐 Translate fallback reply to user's language
-        if user_lang != "en" and "reply" in fallback_result:
-            fallback_result["reply"] = translate(fallback_result["reply"], source_lang="en", target_lang=user_lang)
+        # 🌐 Translate fallback reply to user's language (native replies already are)
+        if user_lang != "en" and not native and "reply" in fallback_result:
+            translate_started = time.monotonic()
+            fallback_result["reply"] = await translate(fallback_result["reply"], source_lang="en", target_lang=user_lang)
+            translation_seconds += time.monotonic() - translate_started
+        if user_lang != "en":
+            record_reply_latency(user_lang, native, time.monotonic() - turn_started, translation_seconds)
 
         fallback_result.update({
             "messages_used_this_month": user.monthly_gpt_count,
@@ -190,12 +220,13 @@ async def chat_with_neura(
             conversation_id=payload.conversation_id
         ),
         db=db,
-        user_data=user_data
+        user_data=user_data,
+        classification=classification
     )
 
     # 🌐 Translate intent reply if needed
     if user_lang != "en" and "reply" in intent_result:
-        intent_result["reply"] = translate(intent_result["reply"], source_lang="en", target_lang=user_lang)
+        intent_result["reply"] = await translate(intent_result["reply"], source_lang="en", target_lang=user_lang)
 
     return {
         **intent_result,
@@ -205,3 +236,124 @@ async def chat_with_neura(
         "messages_remaining": monthly_limit - user.monthly_gpt_count,
         "important": is_important
     }
+
+
+# ---------------------------
+# ✅ Streaming Chat (SSE)
+# ---------------------------
+
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+@router.post("/chat-with-neura/stream")
+async def chat_with_neura_stream(
+    request: Request,
+    payload: ChatRequest,
+    db: Session = Depends(get_db),
+    user_data: dict = Depends(require_token)
+):
+    """
+    Server-sent-events twin of /chat-with-neura.
+    Conversational turns stream `token` events as the model writes them (sentence by
+    sentence for non-English users, so each sentence can be translated, unless their
+    language uses native generation). Other intents
+    and early replies arrive as a single `token` event. A final `done` event carries
+    the same metadata the blocking endpoint returns.
+    """
+    ensure_token_user_match(user_data["sub"], payload.device_id)
+
+    user = db.query(User).filter(User.temp_uid == payload.device_id).first()
+
+    has_sos_contact = db.query(SOSContact).filter(SOSContact.device_id == payload.device_id).first()
+    if not has_sos_contact:
+        early = {
+            "reply": "🛡️ Please add an SOS contact to continue. This is required for your safety.",
+            "require_sos_contact": True
+        }
+        return StreamingResponse(iter([_sse("token", {"text": early["reply"]}), _sse("done", early)]), media_type="text/event-stream")
+
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+    set_llm_priority(user)
+    start_emotion_memo()
+
+    user_lang = user.preferred_lang or "en"
+    native = is_native_generation(user_lang)
+    message = payload.message
+    turn_started = time.monotonic()
+    if user_lang != "en":
+        message = await translate(message, source_lang=user_lang, target_lang="en")
+    translation_seconds = time.monotonic() - turn_started
+
+    is_important = any(word in message.lower() for word in ["remember", "goal", "habit", "remind", "dream", "mission"])
+
+    early_reply = await _check_quota_and_red_flags(user, message, user_lang, is_important)
+    if early_reply:
+        return StreamingResponse(iter([_sse("token", {"text": early_reply["reply"]}), _sse("done", early_reply)]), media_type="text/event-stream")
+
+    monthly_limit = get_monthly_limit(user.tier)
+
+    emotion_label = await update_emotion_status(user, message, db, source="chat")
+    await run_persona_engine(db, user)
+
+    classification = await classify_intent(user, message, db)
+
+    async def event_stream():
+        meta = {
+            "emotion": emotion_label,
+            "memory_enabled": user.memory_enabled,
+            "important": is_important
+        }
+
+        nonlocal translation_seconds
+
+        if classification.intent == "fallback":
+            if native:
+                # The model answers in the user's language, so tokens stream straight through
+                prompt = await build_fallback_prompt(db, user, payload.message, payload.conversation_id, reply_lang=user_lang)
+            else:
+                prompt = await build_fallback_prompt(db, user, message, payload.conversation_id)
+            reply_parts = []
+
+            if user_lang == "en" or native:
+                async for chunk in stream_ai_reply(prompt):
+                    reply_parts.append(chunk)
+                    yield _sse("token", {"text": chunk})
+                ai_reply = "".join(reply_parts).strip()
+            else:
+                async for sentence in stream_sentences(stream_ai_reply(prompt)):
+                    reply_parts.append(sentence)
+                    translate_started = time.monotonic()
+                    translated = await translate(sentence, source_lang="en", target_lang=user_lang)
+                    translation_seconds += time.monotonic() - translate_started
+                    yield _sse("token", {"text": f"{translated} "})
+                ai_reply = " ".join(reply_parts).strip()
+
+            if user_lang != "en":
+                record_reply_latency(user_lang, native, time.monotonic() - turn_started, translation_seconds)
+            user_message = payload.message if native else message
+            record_fallback_exchange(db, user, user_message, ai_reply, is_important, payload.conversation_id)
+            track_usage_event(db, user, category="chat_fallback")
+            meta["intent"] = "fallback"
+        else:
+            intent_result = await detect_and_route_intent(
+                request=request,
+                payload=IntentRequest(user_id=user.id, message=message, conversation_id=payload.conversation_id),
+                db=db,
+                user_data=user_data,
+                classification=classification
+            )
+            if user_lang != "en" and "reply" in intent_result:
+                intent_result["reply"] = await translate(intent_result["reply"], source_lang="en", target_lang=user_lang)
+            if intent_result.get("reply"):
+                yield _sse("token", {"text": intent_result["reply"]})
+            meta = {**intent_result, **meta}
+
+        meta.update({
+            "messages_used_this_month": user.monthly_gpt_count,
+            "messages_remaining": monthly_limit - user.monthly_gpt_count
+        })
+        yield _sse("done", jsonable_encoder(meta))
+
+    return StreamingResponse(event_stream(), media_type="text/event-stream")
@@ -287,7 +287,7 @@ async def handle_event_push(
 
     # --- Generate message via AI (with fallback) ---
     try:
-        full_prompt = generate_ai_reply(ai_prompt)
+        full_prompt = await generate_ai_reply(ai_prompt)
     except Exception as e:
         logger.warning(f"⚠️ AI generation failed: {e}")
         # fallback: prefer custom prompt or a terse auto message
@@ -312,7 +312,7 @@ async def handle_event_push(
     user_lang = user.preferred_lang or "en"
     try:
         if user_lang != "en":
-            full_prompt = translate(full_prompt, source_lang="en", target_lang=user_lang)
+            full_prompt = await translate(full_prompt, source_lang="en", target_lang=user_lang)
     except Exception as e:
         logger.warning(f"⚠️ Translation failed: {e}")
 
@@ -8,6 +8,18 @@ from fastapi import APIRouter
 from sqlalchemy.orm import Session
 from app.models.database import SessionLocal
 from app.models.user import User
+from app.utils.intent_classifier import get_fast_path_stats
+from app.utils.ai_engine import get_cache_stats, get_backend_stats
+from app.utils.single_flight import get_single_flight_stats
+from app.utils.circuit_breaker import get_breaker_stats
+from app.services.fallback_chat_ai import get_speculation_stats
+from app.services.emotion_tone_updater import get_emotion_backend_stats
+from app.utils.translation_cache import get_translation_cache_stats
+from app.services.translation_service import get_translation_stats, get_translation_backend_stats
+from app.utils.language_detector import get_language_detection_stats
+from app.utils.message_catalog import get_message_catalog_stats
+from app.utils.native_generation import get_native_generation_stats
+from app.utils.audio_processor import get_tts_cache_stats, get_tts_stream_stats, get_tts_pool_stats
 import os
 
 router = APIRouter()
@@ -57,3 +69,25 @@ async def health_check():
 
     finally:
         db.close()
+
+
+@router.get("/healthz/ai-metrics")
+async def ai_metrics():
+    return {
+        "intent_fast_path": get_fast_path_stats(),
+        "llm_cache": get_cache_stats(),
+        "single_flight": get_single_flight_stats(),
+        "circuit_breakers": get_breaker_stats(),
+        "model_backends": get_backend_stats(),
+        "speculative_fallback": get_speculation_stats(),
+        "emotion": get_emotion_backend_stats(),
+        "translation_cache": get_translation_cache_stats(),
+        "translation_batching": get_translation_stats(),
+        "translation_backend": get_translation_backend_stats(),
+        "language_detection": get_language_detection_stats(),
+        "message_catalog": get_message_catalog_stats(),
+        "native_generation": get_native_generation_stats(),
+        "tts_cache": get_tts_cache_stats(),
+        "tts_stream": get_tts_stream_stats(),
+        "tts_pool": get_tts_pool_stats()
+    }
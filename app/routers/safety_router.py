@@ -31,8 +31,10 @@ from app.services.safety_notifier import notify_nearby_users
 from app.utils.tier_logic import is_pro_user, is_event_trigger_allowed, get_user_metadata_retention_days
 from app.utils.location_utils import haversine_km, get_location_details
 from app.utils.ai_engine import generate_ai_reply
+from app.utils.llm_scheduler import set_llm_priority
 from app.utils.persona_prompt_wrapper import inject_persona_into_prompt
 from app.services.translation_service import translate
+from app.utils.message_catalog import message, localized, catalog_audio
 from app.utils.voice_sender import synthesize_voice
 from app.utils.firebase import send_fcm_push
 from app.utils.voice_sender import send_voice_to_neura
@@ -93,23 +95,13 @@ async def sos_alert(
     sms_contacts = [{"name": c.name, "phone": c.phone} for c in contacts]
 
 
-    # 🚨 Base confirmation text
-    base_text = "Your SOS alert was received. Help is on the way. Please stay safe."
-
-    # 🌐 Translate if needed
+    # 🚨 Base confirmation text (precomputed in every language)
+    base_text = message("sos_received")
     user_lang = user.preferred_lang or "en"
-    final_text = translate(base_text, source_lang="en", target_lang=user_lang) if user_lang != "en" else base_text
+    final_text = await localized(base_text, user_lang)
 
-    # 🔊 Generate voice file
-    try:
-        audio_url = synthesize_voice(
-            text=final_text,
-            gender=user.voice or "female",
-            emotion=user.emotion_status or "unknown",
-            lang=user.preferred_lang or "en"
-        )
-    except Exception as e:
-        audio_url = None
+    # 🔊 Pre-synthesized voice confirmation
+    audio_url = await catalog_audio(base_text, user_lang, user.voice or "female")
 
 
     # 📲 Send FCM confirmation to the triggering user
@@ -163,9 +155,9 @@ async def log_sos_alert(
     db.refresh(log)
 
     # 2️⃣ Voice confirmation for triggering user
-    base_text = "SOS alert triggered. I'm with you. Stay calm and help is coming."
+    base_text = message("sos_logged")
     user_lang = user.preferred_lang or "en"
-    final_text = translate(base_text, source_lang="en", target_lang=user_lang) if user_lang != "en" else base_text
+    final_text = await localized(base_text, user_lang)
 
     try:
         await send_voice_to_neura(
@@ -174,7 +166,8 @@ async def log_sos_alert(
             text=final_text,
             gender=user.voice or "female",
             emotion=user.emotion_status or "unknown",
-            lang=user.preferred_lang or "en"
+            lang=user_lang,
+            audio_url=await catalog_audio(base_text, user_lang, user.voice or "female")
         )
     except Exception as e:
         print(f"⚠️ Failed to send voice confirmation: {e}")
@@ -479,12 +472,12 @@ async def generate_unsafe_summary(
     )
 
     # 🔁 Call Mistral
-    summary_en = generate_ai_reply(inject_persona_into_prompt(prompt, user, db))
+    summary_en = await generate_ai_reply(inject_persona_into_prompt(prompt, user, db), task="summarize")
     user_lang = user.preferred_lang or "en"
-    summary_final = translate(summary_en, "en", user_lang) if user_lang != "en" else summary_en
+    summary_final = await translate(summary_en, "en", user_lang) if user_lang != "en" else summary_en
 
     try:
-        audio_url = synthesize_voice(
+        audio_url = await synthesize_voice(
             text=summary_final,
             gender=user.voice or "female",
             emotion=user.emotion_status or "unknown",
@@ -570,12 +563,12 @@ async def generate_community_summary(
         "\n\nReports:\n" + "\n".join(prompt_lines) + "\n\nSummary:"
     )
 
-    summary_en = generate_ai_reply(inject_persona_into_prompt(prompt, user, db))
+    summary_en = await generate_ai_reply(inject_persona_into_prompt(prompt, user, db), task="summarize")
     user_lang = user.preferred_lang or "en"
-    summary_final = translate(summary_en, "en", user_lang) if user_lang != "en" else summary_en
+    summary_final = await translate(summary_en, "en", user_lang) if user_lang != "en" else summary_en
 
     try:
-        audio_url = synthesize_voice(
+        audio_url = await synthesize_voice(
             text=summary_final,
             gender=user.voice or "female",
             emotion=user.emotion_status or "unknown",
@@ -660,6 +653,9 @@ async def get_safe_route_suggestion_with_ai(
     if not user:
         raise HTTPException(status_code=404, detail="User not found.")
 
+    # Route advice for someone who may be in danger jumps the LLM queue
+    set_llm_priority(user, sos=True)
+
     cutoff = datetime.utcnow() - timedelta(days=5)
     recent_reports = db.query(UnsafeAreaReport).filter(
         UnsafeAreaReport.timestamp >= cutoff,
@@ -708,12 +704,12 @@ async def get_safe_route_suggestion_with_ai(
         "Route:\n" + "\n".join(lines) + "\n\nTips:"
     )
 
-    summary_en = generate_ai_reply(inject_persona_into_prompt(prompt, user, db))
+    summary_en = await generate_ai_reply(inject_persona_into_prompt(prompt, user, db), task="summarize")
     user_lang = user.preferred_lang or "en"
-    summary_translated = translate(summary_en, "en", user_lang) if user_lang != "en" else summary_en
+    summary_translated = await translate(summary_en, "en", user_lang) if user_lang != "en" else summary_en
 
     try:
-        audio_url = synthesize_voice(
+        audio_url = await synthesize_voice(
             text=summary_translated,
             gender=user.voice or "female",
             emotion=user.emotion_status or "unknown",
@@ -4,10 +4,13 @@
 
 
 import aiohttp
+import asyncio
 import os
 import json
+import logging
 import tempfile
 import time
+from typing import Awaitable, Callable, Optional, Tuple
 from fastapi import APIRouter, File, UploadFile, Form, HTTPException, Depends, Request, WebSocket, WebSocketDisconnect
 from sqlalchemy.orm import Session
 from pydantic import BaseModel
@@ -16,22 +19,32 @@ from app.utils.jwt_utils import verify_access_token
 from app.models.database import SessionLocal
 from app.models.user import User, TierLevel
 from app.models.message_model import Message
-from app.utils.audio_processor import transcribe_audio, synthesize_voice, transcribe_audio_bytes
+from app.utils.audio_processor import (
+    transcribe_audio, synthesize_voice, synthesize_playlist, transcribe_audio_bytes, stream_voice, cached_voice_url
+)
 from app.utils.auth_utils import require_token, ensure_token_user_match, build_chat_history
-from app.utils.ai_engine import generate_ai_reply
+from app.utils.ai_engine import generate_ai_reply, stream_ai_reply
+from app.utils.llm_scheduler import set_llm_priority
+from app.utils.sentence_splitter import stream_sentences
 from app.utils.tier_logic import get_monthly_limit
 from app.utils.red_flag_utils import detect_red_flag, SEVERE_KEYWORDS
 from app.utils.prompt_templates import red_flag_response, creator_info_response, self_query_response
+from app.utils.message_catalog import message, localized, catalog_audio
 from app.utils.rate_limit_utils import get_tier_limit, limiter
 from app.schemas.intent_schemas import IntentRequest
-from app.services.intent_router_core import detect_and_route_intent
-from app.services.emotion_tone_updater import update_emotion_status
+from app.services.intent_router_core import detect_and_route_intent, classify_intent
+from app.services.emotion_tone_updater import update_emotion_status, start_emotion_memo
 from app.services.persona_engine import run_persona_engine
-from app.utils.persona_prompt_wrapper import inject_persona_into_prompt
+from app.utils.persona_prompt_wrapper import inject_persona_into_prompt, build_persona_header
+from app.utils.prompt_builder import PromptSection, build_prompt
 from app.models.sos_contact import SOSContact
 from app.services.translation_service import translate, detect_language
+from app.utils.native_generation import is_native_generation, native_reply_instruction, record_reply_latency
 from app.services.handle_interpreter_mode import handle_interpreter_mode
 from app.services.handle_ambient_mode import handle_ambient_mode
+from app.utils.tts_worker_pool import TTSProviderError
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/ws", tags=["WebSocket Auth"])
 ASSISTANT_NAME = "Neura"
@@ -76,17 +89,18 @@ async def stream_audio_input(websocket: WebSocket):
 
         user_lang = user.preferred_lang or "en"
         user_gender = user.voice or "male"
+        # 📡 Opt-in: send the first sentence as a partial reply while the rest is generated
+        stream_replies = websocket.headers.get("x-stream-replies", "").lower() == "true"
+        # 🔊 Opt-in: reply speech arrives as binary frames on this socket instead of a storage URL
+        stream_audio = websocket.headers.get("x-audio-delivery", "").lower() == "stream"
         monthly_limit = get_monthly_limit(user.tier)
         total_usage = user.monthly_gpt_count + user.monthly_voice_count
 
         # ✅ Rate limit check
-        def send_limit_warning(reply_text):
-            audio_url = synthesize_voice(
-                text=reply_text,
-                gender=user_gender,
-                emotion="sad",
-                lang=user_lang
-            )
+        async def send_limit_warning(key):
+            reply_en = message(key, limit=monthly_limit)
+            reply_text = await localized(reply_en, user_lang)
+            audio_url = await catalog_audio(reply_en, user_lang, user_gender)
             return {
                 "reply": reply_text,
                 "audio_stream_url": audio_url,
@@ -99,15 +113,11 @@ async def stream_audio_input(websocket: WebSocket):
             }
 
         if user.tier == TierLevel.free and total_usage >= monthly_limit:
-            reply_en = f"⚠️ You've used your {monthly_limit} total messages this month."
-            reply = translate(reply_en, source_lang="en", target_lang=user_lang) if user_lang != "en" else reply_en
-            await websocket.send_json(send_limit_warning(reply))
+            await websocket.send_json(await send_limit_warning("voice_limit_total"))
             return
 
         if user.tier != TierLevel.free and user.monthly_voice_count >= monthly_limit:
-            reply_en = f"⚠️ You've used your {monthly_limit} voice messages this month."
-            reply = translate(reply_en, source_lang="en", target_lang=user_lang) if user_lang != "en" else reply_en
-            await websocket.send_json(send_limit_warning(reply))
+            await websocket.send_json(await send_limit_warning("voice_limit_voice"))
             return
 
         # ✅ Tier-based silence timeout
@@ -118,6 +128,39 @@ async def stream_audio_input(websocket: WebSocket):
         }
         silence_timeout = tier_timeout_map.get(user.tier, 1.2)
 
+        async def deliver(reply: dict):
+            """
+            Sends one reply. In stream mode its speech follows as binary frames, framed
+            by {"audio_start"} and {"audio_end"} messages; replies that already have
+            audio (catalog messages, cached synthesis) keep their URL.
+            """
+            speak = (
+                stream_audio and reply.get("reply")
+                and not reply.get("audio_stream_url") and not reply.get("audio_delivered")
+            )
+            if not speak:
+                await websocket.send_json(reply)
+                return
+
+            emotion = reply.get("emotion") or user.emotion_status or "unknown"
+            cached_url = await cached_voice_url(reply["reply"], gender=user_gender, emotion=emotion, lang=user_lang)
+            if cached_url:
+                await websocket.send_json({**reply, "audio_stream_url": cached_url})
+                return
+
+            await websocket.send_json(reply)
+            await websocket.send_json({"audio_start": True, "format": "mp3"})
+            try:
+                async for audio_chunk in stream_voice(reply["reply"], gender=user_gender, emotion=emotion, lang=user_lang):
+                    await websocket.send_bytes(audio_chunk)
+            except (TTSProviderError, aiohttp.ClientError, asyncio.TimeoutError) as e:
+                # The stream broke off; keep the session and offer the whole reply as a file instead
+                logger.warning(f"⚠️ TTS stream failed for user {user.id}, falling back to a stored file: {e}")
+                fallback_url = await _voice_or_none(reply["reply"], gender=user_gender, emotion=emotion, lang=user_lang)
+                await websocket.send_json({"audio_end": True, "error": "tts_stream_failed", "audio_stream_url": fallback_url})
+                return
+            await websocket.send_json({"audio_end": True})
+
         buffer = b""
         last_recv = time.time()
 
@@ -139,10 +182,12 @@ async def stream_audio_input(websocket: WebSocket):
                     db=db,
                     request=None,
                     conversation_id=1,
-                    monthly_limit=monthly_limit
+                    monthly_limit=monthly_limit,
+                    on_partial=deliver if stream_replies else None,
+                    synthesize_audio=not stream_audio
                 )
 
-                await websocket.send_json(response)
+                await deliver(response)
                 buffer = b""
 
             last_recv = now
@@ -218,21 +263,95 @@ async def stream_elevenlabs_audio(
 
 
 
+async def _voice_or_none(text: str, gender: str, emotion: str, lang: str) -> Optional[str]:
+    """synthesize_voice for replies that can still be sent without audio; failures are logged."""
+    try:
+        return await synthesize_voice(text=text, gender=gender, emotion=emotion, lang=lang)
+    except Exception:
+        logger.exception(f"❌ TTS failed for a {lang} reply, sending it without audio")
+        return None
+
+
+async def _stream_fallback_reply(
+    full_prompt: str,
+    user: User,
+    user_lang: str,
+    emotion_label: str,
+    on_partial: Callable[[dict], Awaitable[None]],
+    translate_reply: bool = True,
+    synthesize_audio: bool = True
+) -> Tuple[str, Optional[str]]:
+    """
+    Streams the LLM reply and starts TTS on the first complete sentence.
+    Returns the full (translated) reply and the audio URL for the remainder.
+    `translate_reply=False` is for replies generated in the user's language already.
+    `synthesize_audio=False` sends every sentence as a text-only partial, for
+    callers that stream the speech themselves; no audio URL is returned.
+    """
+    spoken, remainder = [], []
+
+    async for sentence in stream_sentences(stream_ai_reply(full_prompt)):
+        if user_lang != "en" and translate_reply:
+            sentence = await translate(sentence, source_lang="en", target_lang=user_lang)
+
+        if not synthesize_audio:
+            spoken.append(sentence)
+            await on_partial({"partial": True, "reply": sentence, "emotion": emotion_label})
+            continue
+
+        if not spoken:
+            spoken.append(sentence)
+            first_audio = await _voice_or_none(
+                sentence,
+                gender=user.voice or "male",
+                emotion=emotion_label,
+                lang=user_lang
+            )
+            await on_partial({"partial": True, "reply": sentence, "audio_stream_url": first_audio})
+        else:
+            remainder.append(sentence)
+
+    rest_audio = None
+    if remainder:
+        rest_audio = await _voice_or_none(
+            " ".join(remainder),
+            gender=user.voice or "male",
+            emotion=emotion_label,
+            lang=user_lang
+        )
+    return " ".join(spoken + remainder), rest_audio
+
+
 async def process_voice_input(
     transcript: str,
     user: User,
     db: Session,
     request: Request = None,
     conversation_id: int = 1,
-    monthly_limit: int = 100
+    monthly_limit: int = 100,
+    on_partial: Optional[Callable[[dict], Awaitable[None]]] = None,
+    synthesize_audio: bool = True
 ) -> dict:
+    """
+    Runs one voice turn. When `on_partial` is given, conversational replies are
+    streamed: the first sentence is synthesized and sent through it as soon as it
+    is complete, and the returned audio covers only the rest of the reply.
+    With `synthesize_audio=False` generated replies come back without audio
+    (`audio_stream_url` is None) for the caller to voice; replies marked
+    `audio_delivered` were already sent sentence by sentence through `on_partial`.
+    """
+    set_llm_priority(user)
+    start_emotion_memo()
 
     user_lang = user.preferred_lang or "en"
-    spoken_lang = detect_language(transcript)
+    native = is_native_generation(user_lang)
+    native_transcript = transcript
+    turn_started = time.monotonic()
+    spoken_lang = detect_language(transcript, hint=user_lang)
 
     # 🔄 Automatically handle spoken-lang mismatch with polite response in preferred_lang
     if user.active_mode != "interpreter" and spoken_lang != user_lang:
-        transcript = translate(transcript, source_lang=spoken_lang, target_lang="en")
+        transcript = await translate(transcript, source_lang=spoken_lang, target_lang="en")
 
     # ✅ Ambient drift/SOS always on
     await handle_ambient_mode(user, transcript, db)
@@ -246,16 +365,16 @@ async def process_voice_input(
         user.output_audio_mode = "speaker"
         db.commit()
         return {
-            "reply": "🔊 Speaker mode enabled. I'll speak out loud now.",
-            "audio_stream_url": synthesize_voice("Speaker mode enabled. I'll speak out loud now.", gender=user.voice, emotion="joy", lang=user_lang)
+            "reply": await localized(message("speaker_on"), user_lang),
+            "audio_stream_url": await catalog_audio(message("speaker_on"), user_lang, user.voice)
         }
 
     if "turn off speaker" in transcript.lower() or "be silent" in transcript.lower():
         user.output_audio_mode = "silent"
         db.commit()
         return {
-            "reply": "🔇 Silent mode activated. I'll respond quietly.",
-            "audio_stream_url": synthesize_voice("Silent mode activated. I'll respond quietly.", gender=user.voice, emotion="neutral", lang=user_lang)
+            "reply": await localized(message("speaker_off"), user_lang),
+            "audio_stream_url": await catalog_audio(message("speaker_off"), user_lang, user.voice)
         }
 
     # ✅ Interpreter toggle commands
@@ -263,8 +382,8 @@ async def process_voice_input(
         user.active_mode = "interpreter"
         db.commit()
         return {
-            "reply": "🟢 Interpreter mode activated.",
-            "audio_stream_url": synthesize_voice("Interpreter mode activated.", gender=user.voice, emotion="joy", lang=user_lang),
+            "reply": await localized(message("interpreter_on"), user_lang),
+            "audio_stream_url": await catalog_audio(message("interpreter_on"), user_lang, user.voice),
             "memory_enabled": user.memory_enabled,
             "messages_used_this_month": user.monthly_voice_count,
             "messages_remaining": monthly_limit - user.monthly_voice_count
@@ -274,8 +393,8 @@ async def process_voice_input(
         user.active_mode = None
         db.commit()
         return {
-            "reply": "🛑 Interpreter mode deactivated.",
-            "audio_stream_url": synthesize_voice("Interpreter mode turned off.", gender=user.voice, emotion="unknown", lang=user_lang),
+            "reply": await localized(message("interpreter_off"), user_lang),
+            "audio_stream_url": await catalog_audio(message("interpreter_off"), user_lang, user.voice),
             "memory_enabled": user.memory_enabled,
             "messages_used_this_month": user.monthly_voice_count,
             "messages_remaining": monthly_limit - user.monthly_voice_count
@@ -289,38 +408,39 @@ async def process_voice_input(
     red_flag = detect_red_flag(transcript)
 
     if red_flag == "code":
-        reply_text = red_flag_response(reason="code or internal details", lang=user_lang)
+        reply_text = await red_flag_response(reason="code or internal details", lang=user_lang)
         return {
             "reply": reply_text,
             "memory_enabled": user.memory_enabled,
             "messages_used_this_month": user.monthly_voice_count,
             "messages_remaining": monthly_limit - user.monthly_voice_count,
-            "audio_stream_url": synthesize_voice(reply_text, gender=user.voice or "female", emotion="unknown", lang=user_lang)
+            "audio_stream_url": await catalog_audio(message("red_flag", reason="code or internal details"), user_lang, user.voice or "female")
         }
 
     if red_flag == "creator":
-        reply_text = creator_info_response(lang=user_lang)
+        reply_text = await creator_info_response(lang=user_lang)
         return {
             "reply": reply_text,
             "memory_enabled": user.memory_enabled,
             "messages_used_this_month": user.monthly_voice_count,
             "messages_remaining": monthly_limit - user.monthly_voice_count,
-            "audio_stream_url": synthesize_voice(reply_text, gender=user.voice or "female", emotion="surprise", lang=user_lang)
+            "audio_stream_url": await catalog_audio(message("creator_info"), user_lang, user.voice or "female")
         }
 
     if red_flag == "self_query":
-        reply_text = self_query_response(ai_name=user.ai_name or "Neura", lang=user_lang)
+        ai_name = user.ai_name or "Neura"
+        reply_text = await self_query_response(ai_name=ai_name, lang=user_lang)
         return {
             "reply": reply_text,
             "memory_enabled": user.memory_enabled,
             "messages_used_this_month": user.monthly_voice_count,
             "messages_remaining": monthly_limit - user.monthly_voice_count,
-            "audio_stream_url": synthesize_voice(reply_text, gender=user.voice or "female", emotion="joy", lang=user_lang)
+            "audio_stream_url": await catalog_audio(message("self_query", ai_name=ai_name), user_lang, user.voice or "female")
         }
 
     if red_flag == "sos":
         is_force = any(term in transcript.lower() for term in SEVERE_KEYWORDS)
-        reply_text = "🚨 Emergency detected. Triggering SOS alert."
+        reply_text = await localized(message("sos_detected"), user_lang)
         return {
             "reply": reply_text,
             "trigger_sos": True,
@@ -328,42 +448,41 @@ async def process_voice_input(
             "memory_enabled": user.memory_enabled,
             "messages_used_this_month": user.monthly_voice_count,
             "messages_remaining": monthly_limit - user.monthly_voice_count,
-            "audio_stream_url": synthesize_voice(reply_text, gender=user.voice or "female", emotion="fear", lang=user_lang)
+            "audio_stream_url": await catalog_audio(message("sos_detected"), user_lang, user.voice or "female")
         }
 
     # ✅ Intent detection
-    intent_prompt = f"""
-    You are an assistant that classifies user intent.
-    Return ONLY one word from this list:
-    [journal, journal_list, journal_delete, journal_modify,
-     checkin, checkin_list, checkin_delete, checkin_modify,
-     habit, habit_list, habit_modify, habit_delete,
-     goal, goal_list, goal_modify, goal_delete,
-     search, notification, smart_reply,
-     creator_mode, creator_caption, creator_content_ideas,
-     creator_weekly_plan, creator_audience_helper, creator_viral_reels,
-     creator_seo, creator_email, creator_time_planner,
-     creator_youtube_script, creator_blog,
-     fallback]
-    User input: {transcript}
-    Intent:
-    """
-    intent = generate_ai_reply(inject_persona_into_prompt(user, intent_prompt, db)).strip().lower()
+    classification = await classify_intent(user, transcript, db)
+    intent = classification.intent
 
     if intent == "fallback":
-        prompt = f"User: {transcript}\n{ASSISTANT_NAME}:"
+        # 🌐 Native generation: the model hears the user's own words and answers in their language
+        full_prompt = build_prompt([
+            PromptSection("persona", build_persona_header(user, db), priority=1, separator=""),
+            PromptSection("language", native_reply_instruction(user_lang) if native else "", priority=0),
+            PromptSection("user", f"User: {native_transcript if native else transcript}\n{ASSISTANT_NAME}:", priority=0, separator=""),
+        ], intent="voice_fallback")
+
+        if on_partial is not None:
+            assistant_reply, audio_stream_url = await _stream_fallback_reply(
+                full_prompt, user, user_lang, emotion_label, on_partial,
+                translate_reply=not native, synthesize_audio=synthesize_audio
+            )
+        else:
+            assistant_reply = await generate_ai_reply(full_prompt)
 
-        assistant_reply = generate_ai_reply(inject_persona_into_prompt(user, prompt, db))
+            if user_lang != "en" and not native:
+                assistant_reply = await translate(assistant_reply, source_lang="en", target_lang=user_lang)
 
-        if user_lang != "en":
-            assistant_reply = translate(assistant_reply, source_lang="en", target_lang=user_lang)
+            audio_stream_url = await synthesize_voice(
+                text=assistant_reply,
+                gender=user.voice or "male",
+                emotion=emotion_label,
+                lang=user_lang
+            ) if synthesize_audio else None
 
-        audio_stream_url = synthesize_voice(
-            text=assistant_reply,
-            gender=user.voice or "male",
-            emotion=emotion_label,
-            lang=user_lang
-        )
+        if user_lang != "en":
+            record_reply_latency(user_lang, native, time.monotonic() - turn_started, channel="voice")
 
         # 🔄 Track voice usage only
         user.monthly_voice_count += 1
@@ -371,12 +490,14 @@ async def process_voice_input(
 
         return {
             "reply": assistant_reply,
+            "audio_continuation": on_partial is not None,
             "emotion": emotion_label,
             "memory_enabled": user.memory_enabled,  # still returned for UI display
             "messages_used_this_month": user.monthly_voice_count,
             "messages_remaining": monthly_limit - user.monthly_voice_count,
             "important": is_important,
-            "audio_stream_url": audio_stream_url
+            "audio_stream_url": audio_stream_url,
+            "audio_delivered": on_partial is not None and not synthesize_audio
         }
 
     # ✅ All other intents
@@ -384,19 +505,37 @@ async def process_voice_input(
         request=request,
         payload=IntentRequest(user_id=user.id, message=transcript, conversation_id=conversation_id),
         db=db,
-        user_data={"sub": user.temp_uid}
+        user_data={"sub": user.temp_uid},
+        classification=classification
     )
 
     if user_lang != "en" and "reply" in intent_result:
-        intent_result["reply"] = translate(intent_result["reply"], source_lang="en", target_lang=user_lang)
+        intent_result["reply"] = await translate(intent_result["reply"], source_lang="en", target_lang=user_lang)
 
-    if "reply" in intent_result:
-        intent_result["audio_stream_url"] = synthesize_voice(
+    if "reply" in intent_result and not synthesize_audio:
+        intent_result["audio_stream_url"] = None
+        user.monthly_voice_count += 1
+        db.commit()
+    elif "reply" in intent_result:
+        # 🔊 Long replies (scripts, summaries) are voiced sentence-chunk by chunk;
+        # on the websocket the first chunk goes out before the rest is ready
+        async def send_first_chunk(url: str):
+            await on_partial({"partial": True, "reply": intent_result["reply"], "audio_stream_url": url})
+
+        playlist = await synthesize_playlist(
             text=intent_result["reply"],
             gender=user.voice,
             emotion=emotion_label,
-            lang=user_lang
+            lang=user_lang,
+            on_first=send_first_chunk if on_partial is not None else None
         )
+        if on_partial is not None:
+            intent_result["audio_continuation"] = True
+            intent_result["audio_stream_url"] = playlist[1] if len(playlist) > 1 else None
+            intent_result["audio_playlist"] = playlist[1:]
+        else:
+            intent_result["audio_stream_url"] = playlist[0]
+            intent_result["audio_playlist"] = playlist
         user.monthly_voice_count += 1
         db.commit()
 
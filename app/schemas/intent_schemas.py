@@ -4,8 +4,14 @@
 
 
 from pydantic import BaseModel
+from typing import Dict, Any
 
 class IntentRequest(BaseModel):
     user_id: int
     message: str
     conversation_id: int = 1
+
+
+class IntentClassification(BaseModel):
+    intent: str
+    entities: Dict[str, Any] = {}
@@ -4,11 +4,17 @@
 
 
 import os
+import asyncio
 import logging
 import requests
+from contextvars import ContextVar
+from typing import Optional, Tuple
 from sqlalchemy.orm import Session
 from app.models.user import User
 from app.utils.trait_logger import log_user_trait
+from app.services.local_emotion_model import LocalEmotionModel
+from app.utils.response_cache import TTLCache, content_hash
+from app.utils.stats_counter import StatsCounter
 
 logger = logging.getLogger(__name__)
 
@@ -19,6 +25,11 @@ if os.getenv("ENV") != "production":
 
 HF_TOKEN = os.getenv("HUGGINGFACE_TOKEN")
 EMOTION_MODEL_ID = "j-hartmann/emotion-english-distilroberta-base"
+# "remote" = Hugging Face Inference API, "local" = in-process batched model (see local_emotion_model)
+EMOTION_BACKEND = os.getenv("EMOTION_BACKEND", "remote").lower()
+EMOTION_API_TIMEOUT = float(os.getenv("EMOTION_API_TIMEOUT", "5"))
+EMOTION_CACHE_SIZE = int(os.getenv("EMOTION_CACHE_SIZE", "5000"))
+EMOTION_CACHE_TTL = float(os.getenv("EMOTION_CACHE_TTL", str(24 * 3600)))
 
 API_URL = f"https://api-inference.huggingface.co/models/{EMOTION_MODEL_ID}"
 HEADERS = {
@@ -26,18 +37,25 @@ HEADERS = {
     "Content-Type": "application/json"
 }
 
+VALID_EMOTIONS = ["joy", "anger", "fear", "sadness", "love", "surprise"]
+
+_local_model = LocalEmotionModel(EMOTION_MODEL_ID) if EMOTION_BACKEND == "local" else None
+
+
+def _top_label(predictions: list) -> str:
+    top = max(predictions, key=lambda x: x.get("score", 0))
+    label = top["label"].lower()
+    return label if label in VALID_EMOTIONS else "unknown"
+
+
 def _call_emotion_api(text: str) -> str:
     try:
-        response = requests.post(API_URL, headers=HEADERS, json={"inputs": text})
+        response = requests.post(API_URL, headers=HEADERS, json={"inputs": text}, timeout=EMOTION_API_TIMEOUT)
         response.raise_for_status()
         result = response.json()
 
         if isinstance(result, list) and len(result) > 0 and isinstance(result[0], list):
-            predictions = result[0]
-            top = max(predictions, key=lambda x: x.get("score", 0))
-            label = top["label"].lower()
-            valid = ["joy", "anger", "fear", "sadness", "love", "surprise"]
-            return label if label in valid else "unknown"
+            return _top_label(result[0])
         else:
             logger.warning(f"⚠️ Unexpected emotion API response format: {result}")
             return "unknown"
@@ -46,12 +64,93 @@ def _call_emotion_api(text: str) -> str:
         return "unknown"
 
 
+def _classify_emotion(text: str) -> str:
+    """Blocking classification with the configured backend; local failures fall back to the API."""
+    if _local_model is None or not _local_model.available:
+        return _call_emotion_api(text)
+    try:
+        return _top_label(_local_model.predict(text))
+    except Exception as e:
+        logger.warning(f"❌ Local emotion model failed, using API: {e}")
+        return _call_emotion_api(text)
+
+
+async def _classify_emotion_async(text: str) -> str:
+    if _local_model is None or not _local_model.available:
+        return await asyncio.to_thread(_call_emotion_api, text)
+    try:
+        return _top_label(await _local_model.predict_async(text))
+    except Exception as e:
+        logger.warning(f"❌ Local emotion model failed, using API: {e}")
+        return await asyncio.to_thread(_call_emotion_api, text)
+
+
+# ---------------------------
+# ✅ Emotion Memo
+# ---------------------------
+
+# Labels depend only on the text, so one message is classified once however many
+# call sites ask (chat turn, save_user_message, ambient mode, voice turn).
+_emotion_cache = TTLCache(max_entries=EMOTION_CACHE_SIZE, ttl=EMOTION_CACHE_TTL)
+_request_memo: ContextVar[Optional[dict]] = ContextVar("emotion_memo", default=None)
+_memo_stats = StatsCounter()
+
+
+def start_emotion_memo():
+    """Open a per-request memo; call at the start of a chat or voice turn."""
+    _request_memo.set({})
+
+
+def _lookup_emotion(text: str) -> Tuple[str, Optional[str]]:
+    """Returns (key, cached label or None)."""
+    key = content_hash(text.strip())
+    memo = _request_memo.get()
+    if memo is not None and key in memo:
+        _memo_stats.bump("memo_hits")
+        return key, memo[key]
+    label = _emotion_cache.get(key)
+    if label is not None:
+        _memo_stats.bump("lru_hits")
+        if memo is not None:
+            memo[key] = label
+        return key, label
+    _memo_stats.bump("misses")
+    return key, None
+
+
+def _remember_emotion(key: str, label: str):
+    memo = _request_memo.get()
+    if memo is not None:
+        memo[key] = label
+    # A failed call is retried next time instead of pinning "unknown"
+    if label != "unknown":
+        _emotion_cache.set(key, label)
+
+
+def get_emotion_backend_stats() -> dict:
+    stats = {"backend": "local" if _local_model else "remote"}
+    if _local_model:
+        stats.update(_local_model.stats())
+    memo = _memo_stats.snapshot()
+    lookups = sum(memo.values())
+    hits = memo.get("memo_hits", 0) + memo.get("lru_hits", 0)
+    stats["cache"] = {
+        **memo,
+        "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+        "lru": _emotion_cache.stats(),
+    }
+    return stats
+
+
 async def update_emotion_status(user: User, recent_prompt: str, db: Session, source: str = "chat_or_voice") -> str:
     """
     Analyzes user emotion and updates `user.emotion_status` in DB.
     Logs trait for memory tracking.
     """
-    emotion_label = _call_emotion_api(recent_prompt)
+    key, emotion_label = _lookup_emotion(recent_prompt)
+    if emotion_label is None:
+        emotion_label = await _classify_emotion_async(recent_prompt)
+        _remember_emotion(key, emotion_label)
 
     if emotion_label != "unknown":
         try:
@@ -67,4 +166,8 @@ async def update_emotion_status(user: User, recent_prompt: str, db: Session, sou
 
 def infer_emotion_label(text: str) -> str:
     """Returns the emotion label from Hugging Face model for individual message storage."""
-    return _call_emotion_api(text)
+    key, emotion_label = _lookup_emotion(text)
+    if emotion_label is None:
+        emotion_label = _classify_emotion(text)
+        _remember_emotion(key, emotion_label)
+    return emotion_label
@@ -3,6 +3,11 @@
 # Licensed under the MIT License - see the LICENSE file for details.
 
 
+import os
+import time
+import asyncio
+import logging
+from typing import Optional
 from sqlalchemy.orm import Session
 from app.models.user import User
 from app.models.message_model import Message
@@ -11,20 +16,203 @@ from app.utils.auth_utils import build_chat_history
 from app.utils.ai_engine import generate_ai_reply
 from app.utils.red_flag_utils import detect_red_flag
 from app.utils.prompt_templates import red_flag_response, creator_info_response, self_query_response
-from app.utils.persona_prompt_wrapper import inject_persona_into_prompt
+from app.utils.persona_prompt_wrapper import build_persona_header
+from app.utils.prompt_builder import PromptSection, build_prompt
 from app.utils.usage_tracker import track_usage_event
+from app.utils.intent_classifier import INTENT_INDEX, FAST_PATH_ENABLED, FAST_PATH_THRESHOLD
 from app.services.smart_snapshot_generator import generate_memory_snapshot
 from app.services.translation_service import translate
+from app.utils.native_generation import native_reply_instruction
+from app.utils.stats_counter import StatsCounter
+
+logger = logging.getLogger(__name__)
 
 ASSISTANT_NAME = "Neura"
 
+# Start the fallback reply while the intent is still being classified (costs extra upstream calls)
+SPECULATIVE_FALLBACK_ENABLED = os.getenv("SPECULATIVE_FALLBACK_ENABLED", "false").lower() == "true"
+
+async def build_fallback_prompt(
+    db: Session,
+    user: User,
+    user_message: str,
+    conversation_id: int,
+    reply_lang: Optional[str] = None
+) -> str:
+    """
+    Builds the persona + memory prompt for a plain conversational turn,
+    trimmed to the chat_fallback token budget.
+    With `reply_lang` the model is told to answer in that language (native generation).
+    """
+
+    # 🧠 Build chat memory context
+    history = await build_chat_history(db, user.id, conversation_id) if user.memory_enabled else ""
+
+    # 🧠 🧠 NEW: Inject memory snapshot context
+    snapshot = generate_memory_snapshot(user.id)
+    memory_context = snapshot.get("summary", "")
+
+    # 🤖 Persona header with fallback-safe injection
+    try:
+        persona_header = build_persona_header(user, db)
+    except Exception as e:
+        persona_header = ""  # fallback to simple prompt
+
+    return build_prompt([
+        PromptSection("persona", persona_header, priority=2, separator=""),
+        PromptSection("memory", f"(Context: {memory_context})" if memory_context else "", priority=3),
+        PromptSection("history", history, priority=1, keep="tail"),
+        PromptSection("language", native_reply_instruction(reply_lang) if reply_lang else "", priority=0),
+        PromptSection("user", f"User: {user_message}\n{ASSISTANT_NAME}:", priority=0, separator=""),
+    ], intent="chat_fallback")
+
+
+def record_fallback_exchange(
+    db: Session,
+    user: User,
+    user_message: str,
+    ai_reply: str,
+    is_important: bool,
+    conversation_id: int
+):
+    """Saves the exchange to memory (if enabled) and counts it against the monthly quota."""
+
+    # 💾 Save to memory if enabled
+    if user.memory_enabled:
+        db.add_all([
+            Message(user_id=user.id, conversation_id=conversation_id, sender="user", message=user_message, important=is_important),
+            Message(user_id=user.id, conversation_id=conversation_id, sender="assistant", message=ai_reply, important=False),
+        ])
+
+    # 🔢 Increment usage
+    user.monthly_gpt_count += 1
+    db.commit()
+
+
+# ---------------------------
+# ✅ Speculative Fallback
+# ---------------------------
+
+_spec_stats = StatsCounter()
+
+
+class SpeculativeFallback:
+    """
+    A fallback reply generated in the background while the intent is classified.
+    The prompt is built inside the task as well, so starting one never delays classification.
+    """
+
+    def __init__(self, db: Session, user: User, user_message: str, conversation_id: int, native_message: Optional[str]):
+        self.started_at = time.monotonic()
+        self.settled = False
+        self.task = asyncio.ensure_future(self._run(db, user, user_message, conversation_id, native_message))
+        _spec_stats.bump("started")
+
+    async def _run(self, db: Session, user: User, user_message: str, conversation_id: int, native_message: Optional[str]) -> str:
+        prompt = await _fallback_prompt(db, user, user_message, conversation_id, native_message)
+        return await generate_ai_reply(prompt)
+
+    async def result(self) -> str:
+        self.settled = True
+        _spec_stats.bump("used")
+        return await self.task
+
+    def discard(self):
+        """Another intent won or the turn ended early: cancel the reply and count the work thrown away."""
+        if self.settled:
+            return
+        self.settled = True
+        _spec_stats.bump("discarded")
+        _spec_stats.bump("wasted_seconds", time.monotonic() - self.started_at)
+        if self.task.done():
+            # The upstream call finished before classification did, all of it was wasted
+            _spec_stats.bump("discarded_after_completion")
+            if not self.task.cancelled():
+                self.task.exception()
+        else:
+            self.task.cancel()
+
+
+def start_speculative_fallback(
+    db: Session,
+    user: User,
+    user_message: str,
+    conversation_id: int,
+    native_message: Optional[str] = None
+) -> Optional[SpeculativeFallback]:
+    """
+    Start generating the fallback reply for `user_message` right away, or return None
+    when speculation is disabled or the message is unlikely to end up as fallback.
+    `native_message` is the untranslated text, for languages with native generation.
+    """
+    if not SPECULATIVE_FALLBACK_ENABLED:
+        return None
+
+    # Red flags get canned replies, and confident local intents never reach the fallback
+    if detect_red_flag(user_message):
+        return None
+    if FAST_PATH_ENABLED:
+        intent, confidence = INTENT_INDEX.predict(user_message)
+        if intent and intent != "fallback" and confidence >= FAST_PATH_THRESHOLD:
+            return None
+
+    return SpeculativeFallback(db, user, user_message, conversation_id, native_message)
+
+
+def get_speculation_stats() -> dict:
+    snapshot = _spec_stats.snapshot()
+
+    started = snapshot.get("started", 0)
+    discarded = snapshot.get("discarded", 0)
+    return {
+        "enabled": SPECULATIVE_FALLBACK_ENABLED,
+        "started": started,
+        "used": snapshot.get("used", 0),
+        "discarded": discarded,
+        "discarded_after_completion": snapshot.get("discarded_after_completion", 0),
+        "waste_rate": round(discarded / started, 4) if started else 0.0,
+        "wasted_seconds": round(snapshot.get("wasted_seconds", 0.0), 2),
+    }
+
+
+async def _fallback_prompt(db: Session, user: User, user_message: str, conversation_id: int, native_message: Optional[str]) -> str:
+    if native_message:
+        return await build_fallback_prompt(db, user, native_message, conversation_id, reply_lang=user.preferred_lang)
+    return await build_fallback_prompt(db, user, user_message, conversation_id)
+
+
 async def handle_chat_fallback(
     db: Session,
     user: User,
     user_message: str,
     is_important: bool,
     conversation_id: int,
+    speculative: Optional[SpeculativeFallback] = None,
+    native_message: Optional[str] = None,
+):
+    """
+    Plain conversational turn. `speculative` is a reply already started by
+    start_speculative_fallback; it is awaited instead of calling the model again,
+    and cancelled on every path that ends without it (red flags, errors).
+    With `native_message` (the user's untranslated text) the reply is generated
+    directly in the user's language; `user_message` (English) is still used for
+    red flags and emotion.
+    """
+    try:
+        return await _answer_fallback(db, user, user_message, is_important, conversation_id, speculative, native_message)
+    finally:
+        if speculative:
+            speculative.discard()  # no-op once its reply was used
+
 
+async def _answer_fallback(
+    db: Session,
+    user: User,
+    user_message: str,
+    is_important: bool,
+    conversation_id: int,
+    speculative: Optional[SpeculativeFallback],
+    native_message: Optional[str],
 ):
     user_lang = user.preferred_lang or "en"
     ai_name = user.ai_name or "Neura"
@@ -32,7 +220,7 @@ async def handle_chat_fallback(
     # 🚩 Red flag detection
     red_flag = detect_red_flag(user_message)
     if red_flag == "code":
-        reply_text = red_flag_response(reason="code or internal details", lang=user_lang)
+        reply_text = await red_flag_response(reason="code or internal details", lang=user_lang)
         return {
             "reply": reply_text,
             "memory_enabled": user.memory_enabled,
@@ -41,7 +229,7 @@ async def handle_chat_fallback(
         }
 
     if red_flag == "creator":
-        reply_text = creator_info_response(lang=user_lang)
+        reply_text = await creator_info_response(lang=user_lang)
         return {
             "reply": reply_text,
             "memory_enabled": user.memory_enabled,
@@ -50,7 +238,7 @@ async def handle_chat_fallback(
         }
 
     if red_flag == "self_query":
-        reply_text = self_query_response(ai_name=ai_name, lang=user_lang)
+        reply_text = await self_query_response(ai_name=ai_name, lang=user_lang)
         return {
             "reply": reply_text,
             "memory_enabled": user.memory_enabled,
@@ -61,7 +249,7 @@ async def handle_chat_fallback(
     if red_flag == "sos":
         reply_text = "🚨 Emergency keyword detected. Please say 'Neura, help me' aloud to trigger SOS."
         if user_lang != "en":
-            reply_text = translate(reply_text, source_lang="en", target_lang=user_lang)
+            reply_text = await translate(reply_text, source_lang="en", target_lang=user_lang)
         return {
             "reply": reply_text,
             "memory_enabled": user.memory_enabled,
@@ -72,37 +260,13 @@ async def handle_chat_fallback(
     # ✅ Emotion update
     emotion_label = await update_emotion_status(user, user_message, db, source="chat_fallback")
 
-    # 🧠 Build chat memory context
-    if user.memory_enabled:
-        history = build_chat_history(db, user.id, conversation_id)
-        raw_prompt = f"{history}\nUser: {user_message}\n{ASSISTANT_NAME}:"
+    if speculative:
+        ai_reply = await speculative.result()
     else:
-        raw_prompt = f"User: {user_message}\n{ASSISTANT_NAME}:"
-
-    # 🧠 🧠 NEW: Inject memory snapshot context
-    snapshot = generate_memory_snapshot(user.id)
-    memory_context = snapshot.get("summary", "")
-    if memory_context:
-        raw_prompt = f"(Context: {memory_context})\n" + raw_prompt
-
-    # 🤖 Mistral reply with fallback-safe injection
-    try:
-        full_prompt = inject_persona_into_prompt(user, raw_prompt, db)
-    except Exception as e:
-        full_prompt = raw_prompt  # fallback to simple prompt
+        full_prompt = await _fallback_prompt(db, user, user_message, conversation_id, native_message)
+        ai_reply = await generate_ai_reply(full_prompt)
 
-    ai_reply = generate_ai_reply(full_prompt)
-
-    # 💾 Save to memory if enabled
-    if user.memory_enabled:
-        db.add_all([
-            Message(user_id=user.id, conversation_id=conversation_id, sender="user", message=user_message, important=is_important),
-            Message(user_id=user.id, conversation_id=conversation_id, sender="assistant", message=ai_reply, important=False),
-        ])
-
-    # 🔢 Increment usage
-    user.monthly_gpt_count += 1
-    db.commit()
+    record_fallback_exchange(db, user, native_message or user_message, ai_reply, is_important, conversation_id)
 
     track_usage_event(db, user, category="chat_fallback")
 
@@ -23,7 +23,7 @@ async def handle_ambient_mode(user, transcript: str, db):
     # Step 3: If drift is found, push a nudge (voice or text based on context)
     if drift_message and user.voice_nudges_enabled:
         user_lang = user.preferred_lang or "en"
-        nudge_text = translate(drift_message, source_lang="en", target_lang=user_lang) if user_lang != "en" else drift_message
+        nudge_text = await translate(drift_message, source_lang="en", target_lang=user_lang) if user_lang != "en" else drift_message
 
         low_battery = user.battery_level is not None and user.battery_level < 15
         no_speaker = user.output_audio_mode != "speaker"
@@ -37,7 +37,7 @@ async def handle_ambient_mode(user, transcript: str, db):
                 timestamp=datetime.utcnow()
             ))
         else:
-            stream_url = synthesize_voice(
+            stream_url = await synthesize_voice(
                 text=nudge_text,
                 gender=user.voice or "female",
                 emotion=emotion_label,
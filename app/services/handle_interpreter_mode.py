@@ -25,7 +25,7 @@ async def handle_interpreter_mode(
     db: Session
 ):
     user_id = user.id
-    spoken_lang = detect_language(transcript)
+    spoken_lang = detect_language(transcript, hint=user.preferred_lang)
     user_gender = user.voice if user.voice in ["male", "female"] else "male"
     emotion = user.emotion_status or "joy"
     current_time = time.time()
@@ -49,13 +49,13 @@ async def handle_interpreter_mode(
 
     # 🌍 Translate to other speaker's lang
     target_lang = mapping[other_speaker] or ("en" if spoken_lang != "en" else "hi")
-    translated_text = translate(transcript, source_lang=spoken_lang, target_lang=target_lang)
+    translated_text = await translate(transcript, source_lang=spoken_lang, target_lang=target_lang)
 
     # 🗣 Construct voice line: Person A/B said...
     tag = "👤 A said:" if current_speaker == 'A' else "👤 B replied:"
     reply_text = f"{tag} {translated_text}"
 
-    audio_url = synthesize_voice(
+    audio_url = await synthesize_voice(
         text=reply_text,
         gender=user_gender,
         emotion=emotion,
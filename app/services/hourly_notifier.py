@@ -6,12 +6,14 @@
 
 import logging
 import asyncio
-import random
 from datetime import datetime, timedelta
 from sqlalchemy.orm import Session
 from app.models.database import SessionLocal
 from app.models.user import User, TierLevel
 from app.utils.voice_sender import send_voice_to_neura
+from app.utils.tts_worker_pool import LANE_BACKGROUND
+from app.utils.llm_scheduler import set_llm_priority
+from app.utils.client_pool import run_with_clients
 from app.utils.ambient_guard import (
     is_night_time,
     is_fragile_emotion,
@@ -23,7 +25,7 @@ from app.services.nudge_service import generate_nudge_for_user
 from app.services.trait_drift_detector import detect_trait_drift
 
 from app.utils.tier_logic import is_in_private_mode
-from app.services.translation_service import translate
+from app.utils.message_catalog import SYSTEM_MESSAGES, choose_message, localized, catalog_audio
 
 from app.utils.location_utils import deliver_travel_tip
 from app.utils.ambient_guard import is_night_time, is_fragile_emotion, is_gps_near_unsafe_area
@@ -42,49 +44,16 @@ def get_time_based_prompt(user: User) -> str:
     )
 
     emotion = user.emotion_status or ""
-
-    if emotion == "sadness":
-        return "Just checking in 💙 You're not alone—I'm here."
-    elif emotion == "tired":
-        return "Hi, just checking in. Maybe it's a good moment to pause and rest."
-    elif emotion == "joy":
-        return "I love that you're feeling good today! Keep shining."
-    elif emotion == "anger":
-        return "It’s okay to feel frustrated sometimes. I’m here if you need a reset."
-    elif emotion == "fear":
-        return "Everything’s going to be alright. You’ve got this. 🫶"
-    elif emotion == "surprise":
-        return "Sounds like an unexpected day! I’m here if you want to talk."
-    elif emotion == "love":
-        return "Sending warmth and good vibes your way 💖"
+    emotion_prompts = SYSTEM_MESSAGES["hourly_emotion"]
+    if emotion in emotion_prompts:
+        return emotion_prompts[emotion]
 
     # Fallback to time-based prompts
-    prompts = {
-        "morning": [
-            "Good morning! Ready to make today amazing?",
-            "Hi there, hope you woke up refreshed.",
-            "Morning! I'm here if you want to plan your day."
-        ],
-        "afternoon": [
-            "Hey, how's your day going so far?",
-            "I'm here if you need a break.",
-            "Hi! Just checking in to see how you're feeling."
-        ],
-        "evening": [
-            "Good evening. Want to unwind together?",
-            "Hope your day went well. Anything on your mind?",
-            "Evening check-in—I'm here to help if you need me."
-        ],
-        "night": [
-            "It's late—remember to rest well.",
-            "Hi, just making sure you're okay before bed.",
-            "Time to relax. Sweet dreams when you're ready!"
-        ]
-    }
-
-    return random.choice(prompts[time_context])
+    return choose_message("hourly_time", time_context)
 
 async def run_hourly_notifier():
+    # Cron fan-out: queue behind interactive requests for LLM and provider slots
+    set_llm_priority(batch=True)
     db: Session = SessionLocal()
     try:
         users = db.query(User).filter(
@@ -95,6 +64,7 @@ async def run_hourly_notifier():
         ).all()
 
         tasks = []
+        outgoing = []
         now = datetime.utcnow()
 
         for user in users:
@@ -138,42 +108,42 @@ async def run_hourly_notifier():
                 else:
                     nudge_text = get_time_based_prompt(user)
 
-                # 🌐 Translate if user prefers a native language
-                user_lang = user.preferred_lang or "en"
-                if user_lang != "en":
-                    try:
-                        nudge_text = translate(nudge_text, source_lang="en", target_lang=user_lang)
-                    except Exception as e:
-                        logger.warning(f"⚠️ Translation failed for user {user.id}: {e}")
-
-                logger.info(f"🔔 Sending hourly nudge to {user.id} ({user.temp_uid})")
-
-                tasks.append(send_voice_to_neura(
-                    text=nudge_text,
-                    device_id=user.temp_uid,
-                    gender=user.voice,
-                    request=None,
-                    emotion=user.emotion_status or "unknown",
-                    lang=user_lang
-                ))
-
-                # ✅ Also push FCM fallback for Kotlin overlay
-                if user.fcm_token:
-                    try:
-                        send_fcm_push(
-                            token=user.fcm_token,
-                            data={
-                                "hourly_text": nudge_text,
-                                "hourly_lang": user_lang,
-                                "hourly_emoji": "⏰"
-                            }
-                        )
-                        logger.info(f"📲 Sent hourly FCM fallback to {user.id}")
-                    except Exception as e:
-                        logger.warning(f"⚠️ FCM hourly push failed for user {user.id}: {e}")
+                outgoing.append((user, nudge_text))
 
             user.last_hourly_nudge_sent = now
 
+        # 🌐 Fallback prompts come from the message catalog, already translated and voiced
+        for user, nudge_en in outgoing:
+            user_lang = user.preferred_lang or "en"
+            nudge_text = await localized(nudge_en, user_lang)
+            logger.info(f"🔔 Sending hourly nudge to {user.id} ({user.temp_uid})")
+
+            tasks.append(send_voice_to_neura(
+                text=nudge_text,
+                device_id=user.temp_uid,
+                gender=user.voice,
+                request=None,
+                emotion=user.emotion_status or "unknown",
+                lang=user_lang,
+                audio_url=await catalog_audio(nudge_en, user_lang, user.voice),
+                lane=LANE_BACKGROUND
+            ))
+
+            # ✅ Also push FCM fallback for Kotlin overlay
+            if user.fcm_token:
+                try:
+                    send_fcm_push(
+                        token=user.fcm_token,
+                        data={
+                            "hourly_text": nudge_text,
+                            "hourly_lang": user_lang,
+                            "hourly_emoji": "⏰"
+                        }
+                    )
+                    logger.info(f"📲 Sent hourly FCM fallback to {user.id}")
+                except Exception as e:
+                    logger.warning(f"⚠️ FCM hourly push failed for user {user.id}: {e}")
+
         db.commit()
         await asyncio.gather(*tasks)
 
@@ -197,16 +167,8 @@ async def maybe_send_travel_tip(user: User, db: Session) -> bool:
         return False
 
 def get_generic_travel_fallback() -> str:
-    prompts = [
-        "Hi! Just checking in 👋 Hope you're settling in well.",
-        "Neura here — if you're exploring somewhere new, I'm with you!",
-        "Hope your journey is going smoothly 🛫 Let me know if you need tips.",
-        "Settling in okay? I'm just a wakeword away 😊",
-        "If you're in a new place, don’t forget to stay safe and hydrated 💧",
-        "Hey traveler 👣 Let me know if you'd like local suggestions.",
-        "Hope you're enjoying your day. Want a quick vibe check?"
-    ]
-    return random.choice(prompts)
+    return choose_message("travel_fallback")
 
 def hourly_notify_users():
-    asyncio.run(run_hourly_notifier())
\ No newline at end of file
+    # Closes the LLM, translation and storage clients this job's loop opened
+    run_with_clients(run_hourly_notifier)
\ No newline at end of file
@@ -32,7 +32,7 @@ async def handle_checkin_add(request: Request, db: Session, user: User, intent_p
 
         prompt = checkin_add_prompt(intent_payload, emotion_label)
 
-        ai_response = generate_ai_reply(inject_persona_into_prompt(user, prompt, db))
+        ai_response = await generate_ai_reply(inject_persona_into_prompt(user, prompt, db))
 
         insight = json.loads(ai_response).get("ai_insight", "")
 
@@ -20,7 +20,7 @@ async def handle_checkin_delete(request, user: User, message: str, db: Session):
     """
     prompt = checkin_delete_prompt(message)
 
-    mistral_response = generate_ai_reply(inject_persona_into_prompt(user, prompt, db))
+    mistral_response = await generate_ai_reply(inject_persona_into_prompt(user, prompt, db), task="extract")
 
     try:
         parsed = json.loads(mistral_response)
@@ -28,7 +28,7 @@ async def handle_checkin_modify(request: Request, user: User, message: str, db:
     prompt = checkin_modify_prompt(message, emotion_label)
 
     try:
-        parsed = json.loads(generate_ai_reply(inject_persona_into_prompt(user, prompt, db)))
+        parsed = json.loads(await generate_ai_reply(inject_persona_into_prompt(user, prompt, db), task="extract"))
 
         # 🔍 Locate check-in by ID or date
         checkin = None
@@ -57,7 +57,7 @@ End with a warm suggestion like “Want to add something?” or “Need a tip fo
     """
 
     try:
-        reply = generate_ai_reply(inject_persona_into_prompt(user, prompt, db))
+        reply = await generate_ai_reply(inject_persona_into_prompt(user, prompt, db), task="summarize")
 
     except Exception:
         reply = "Here's a reflection on your emotions this week. You’ve done your best, and that matters."
@@ -36,7 +36,7 @@ async def handle_creator_blog(request: Request, user: User, message: str, db: Se
     )
 
     try:
-        response = generate_ai_reply(inject_persona_into_prompt(user, prompt, db))
+        response = await generate_ai_reply(inject_persona_into_prompt(user, prompt, db), task="long_form")
         # ✅ Increment usage counter
         user.monthly_creator_count += 1
         db.commit()
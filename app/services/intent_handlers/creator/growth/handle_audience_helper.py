@@ -35,7 +35,7 @@ async def handle_creator_audience_helper(request: Request, user: User, message:
     )
 
     try:
-        response = generate_ai_reply(inject_persona_into_prompt(user, prompt, db))
+        response = await generate_ai_reply(inject_persona_into_prompt(user, prompt, db))
         # ✅ Increment usage counter
         user.monthly_creator_count += 1
         db.commit()
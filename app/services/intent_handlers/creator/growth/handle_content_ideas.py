@@ -35,7 +35,7 @@ async def handle_creator_content_ideas(request: Request, user: User, message: st
     )
 
     try:
-        response = generate_ai_reply(inject_persona_into_prompt(user, prompt, db))
+        response = await generate_ai_reply(inject_persona_into_prompt(user, prompt, db))
 
         # ✅ Increment usage counter
         user.monthly_creator_count += 1
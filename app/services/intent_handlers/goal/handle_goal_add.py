@@ -30,7 +30,7 @@ async def handle_goal_add(request: Request, user: User, message: str, db: Sessio
     prompt = goal_add_prompt(message, emotion_label)
 
     try:
-        response = generate_ai_reply(inject_persona_into_prompt(user, prompt, db))
+        response = await generate_ai_reply(inject_persona_into_prompt(user, prompt, db), task="extract")
 
         parsed = json.loads(response)
 
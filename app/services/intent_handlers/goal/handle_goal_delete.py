@@ -23,7 +23,7 @@ async def handle_delete_goal(request: Request, user: User, message: str, db: Ses
 
     prompt = goal_delete_prompt(message)
 
-    mistral_response = generate_ai_reply(inject_persona_into_prompt(user, prompt, db))
+    mistral_response = await generate_ai_reply(inject_persona_into_prompt(user, prompt, db), task="extract")
 
     try:
         parsed = json.loads(mistral_response)
@@ -82,7 +82,7 @@ Write a motivational reflection summarizing their weekly goals:
 Use an encouraging tone that matches their emotional state.
 Close with a line like "Let’s carry this energy forward" or "Let’s reset for a fresh week".
 """
-        ai_summary = generate_ai_reply(inject_persona_into_prompt(user, full_prompt, db))
+        ai_summary = await generate_ai_reply(inject_persona_into_prompt(user, full_prompt, db), task="summarize")
 
     except Exception:
         ai_summary = "(AI summary unavailable)"
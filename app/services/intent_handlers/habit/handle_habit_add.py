@@ -29,7 +29,7 @@ async def handle_add_habit(request: Request, user: User, message: str, db: Sessi
     """
     prompt = habit_add_prompt(message, emotion_label)
 
-    mistral_response = generate_ai_reply(inject_persona_into_prompt(user, prompt, db))
+    mistral_response = await generate_ai_reply(inject_persona_into_prompt(user, prompt, db), task="extract")
 
     try:
         parsed = json.loads(mistral_response)
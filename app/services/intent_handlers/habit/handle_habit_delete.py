@@ -22,7 +22,7 @@ async def handle_delete_habit(request: Request, user: User, message: str, db: Se
     prompt = habit_delete_prompt(message)
 
     try:
-        response = generate_ai_reply(inject_persona_into_prompt(user, prompt, db))
+        response = await generate_ai_reply(inject_persona_into_prompt(user, prompt, db), task="extract")
 
         data = json.loads(response)
         habit = db.query(Habit).filter(Habit.id == data["habit_id"]).first()
@@ -29,7 +29,7 @@ async def handle_modify_habit(request: Request, user: User, message: str, db: Se
     prompt = habit_modify_prompt(message, emotion_label)
 
     try:
-        response = json.loads(generate_ai_reply(inject_persona_into_prompt(user, prompt, db)))
+        response = json.loads(await generate_ai_reply(inject_persona_into_prompt(user, prompt, db), task="extract"))
 
         data = response
         habit = db.query(Habit).filter(Habit.id == data["habit_id"]).first()
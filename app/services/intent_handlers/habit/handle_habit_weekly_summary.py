@@ -56,7 +56,7 @@ Streaks: {[h.habit_name for h in streaks]}
     # 🎯 AI Insight
     try:
         ai_prompt = habit_summary_prompt(completed, missed, streaks)
-        ai_reply = generate_ai_reply(inject_persona_into_prompt(user, ai_prompt, db))
+        ai_reply = await generate_ai_reply(inject_persona_into_prompt(user, ai_prompt, db), task="summarize")
 
     except Exception:
         ai_reply = "(AI summary unavailable)"
@@ -64,7 +64,7 @@ Streaks: {[h.habit_name for h in streaks]}
     # 🌱 Habit Recommender
     try:
         recommend_prompt = habit_recommender_prompt(user.name, completed, missed, streaks)
-        habit_suggestions = generate_ai_reply(inject_persona_into_prompt(user, recommend_prompt, db))
+        habit_suggestions = await generate_ai_reply(inject_persona_into_prompt(user, recommend_prompt, db), task="summarize")
     except Exception:
         habit_suggestions = "(No new suggestions available)"
 
@@ -10,7 +10,8 @@ from app.services.emotion_tone_updater import update_emotion_status
 from app.utils.red_flag_utils import detect_red_flag
 from app.utils.ai_engine import generate_ai_reply
 from app.utils.prompt_templates import red_flag_response, creator_info_response, self_query_response
-from app.utils.persona_prompt_wrapper import inject_persona_into_prompt
+from app.utils.persona_prompt_wrapper import build_persona_header
+from app.utils.prompt_builder import PromptSection, build_prompt
 from app.utils.usage_tracker import track_usage_event
 from app.services.smart_snapshot_generator import generate_memory_snapshot
 from app.services.translation_service import translate
@@ -31,27 +32,27 @@ async def handle_fallback_ai(request: Request, db: Session, user: User, intent_p
             return {
                 "status": "success",
                 "intent": "fallback",
-                "reply": red_flag_response("code or internal details", lang=user_lang)
+                "reply": await red_flag_response("code or internal details", lang=user_lang)
             }
 
         if red_flag == "creator":
             return {
                 "status": "success",
                 "intent": "fallback",
-                "reply": creator_info_response(lang=user_lang)
+                "reply": await creator_info_response(lang=user_lang)
             }
 
         if red_flag == "self_query":
             return {
                 "status": "success",
                 "intent": "fallback",
-                "reply": self_query_response(ai_name=ai_name, lang=user_lang)
+                "reply": await self_query_response(ai_name=ai_name, lang=user_lang)
             }
 
         if red_flag == "sos":
             reply_text = "🚨 Emergency keyword detected. Please say 'Neura, help me' aloud to trigger SOS."
             if user_lang != "en":
-                reply_text = translate(reply_text, source_lang="en", target_lang=user_lang)
+                reply_text = await translate(reply_text, source_lang="en", target_lang=user_lang)
             return {
                 "status": "success",
                 "intent": "fallback",
@@ -61,21 +62,23 @@ async def handle_fallback_ai(request: Request, db: Session, user: User, intent_p
         # ✅ Emotion tag
         emotion_label = await update_emotion_status(user, user_query, db, source="voice_fallback")
 
-        # ✨ Prompt with fallback-safe persona injection
-        raw_prompt = f"User: {user_query}\nNeura:"
-
         # 🧠 NEW: Inject memory snapshot context
         snapshot = generate_memory_snapshot(user.id)
         memory_context = snapshot.get("summary", "")
-        if memory_context:
-            raw_prompt = f"(Context: {memory_context})\n" + raw_prompt
 
+        # ✨ Prompt with fallback-safe persona injection
         try:
-            full_prompt = inject_persona_into_prompt(user, raw_prompt, db)
+            persona_header = build_persona_header(user, db)
         except Exception as e:
-            full_prompt = raw_prompt  # fallback to basic prompt
+            persona_header = ""  # fallback to basic prompt
+
+        full_prompt = build_prompt([
+            PromptSection("persona", persona_header, priority=2, separator=""),
+            PromptSection("memory", f"(Context: {memory_context})" if memory_context else "", priority=3),
+            PromptSection("user", f"User: {user_query}\nNeura:", priority=0, separator=""),
+        ], intent="voice_fallback")
 
-        ai_reply = generate_ai_reply(full_prompt)
+        ai_reply = await generate_ai_reply(full_prompt)
 
         track_usage_event(db, user, category="voice_fallback")
 
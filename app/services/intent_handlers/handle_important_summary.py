@@ -56,7 +56,7 @@ Summary (with emotional insight):
     prompt += "\n\nSummary:\n"
 
     final_prompt = inject_persona_into_prompt(user, prompt, db)
-    ai_response = generate_ai_reply(final_prompt).strip()
+    ai_response = (await generate_ai_reply(final_prompt, task="summarize")).strip()
 
 
     # ✅ Proactive voice nudge if eligible
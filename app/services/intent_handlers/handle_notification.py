@@ -30,7 +30,7 @@ async def handle_notification_add(request: Request, db: Session, user: User, int
         # 🌐 Translate if user has a non-English language preference
         user_lang = user.preferred_lang or "en"
         if user_lang != "en":
-            content = translate(content, source_lang="en", target_lang=user_lang)
+            content = await translate(content, source_lang="en", target_lang=user_lang)
 
         new_notification = NotificationLog(
             user_id=user.id,
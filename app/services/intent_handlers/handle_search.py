@@ -9,7 +9,7 @@ from fastapi import HTTPException, Request
 from app.utils.ai_engine import generate_ai_reply
 from app.utils.auth_utils import ensure_token_user_match
 from app.services.search_service import search_wikipedia, search_duckduckgo, format_results_for_summary
-from app.utils.persona_prompt_wrapper import inject_persona_into_prompt
+from app.utils.persona_prompt_wrapper import build_persona_header
 from app.utils.usage_tracker import track_usage_event
 
 import logging
@@ -39,7 +39,12 @@ async def handle_search(request: Request, user: User, message: str, db: Session)
             raise HTTPException(status_code=404, detail="No DuckDuckGo results found.")
         prompt = format_results_for_summary(results, query)
         try:
-            summary = generate_ai_reply(inject_persona_into_prompt(user, prompt, db))
+            summary = await generate_ai_reply(
+                prompt,
+                cache="search_summary",
+                persona=build_persona_header(user, db),
+                task="summarize"
+            )
 
         except Exception as e:
             raise HTTPException(status_code=500, detail=f"AI summarization failed: {str(e)}")
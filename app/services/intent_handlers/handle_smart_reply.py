@@ -22,13 +22,13 @@ async def handle_smart_reply(request: Request, user: User, message: str, db: Ses
         return {
             "status": "success",
             "intent": "fallback",
-            "reply": red_flag_response("code or internal details")
+            "reply": await red_flag_response("code or internal details")
         }
     if red_flag == "creator":
         return {
             "status": "success",
             "intent": "fallback",
-            "reply": creator_info_response()
+            "reply": await creator_info_response()
         }
 
     # ✅ Add emotion tone into prompt
@@ -52,7 +52,7 @@ Example:
     """
 
     try:
-        ai_response = generate_ai_reply(inject_persona_into_prompt(user, prompt, db))
+        ai_response = await generate_ai_reply(inject_persona_into_prompt(user, prompt, db))
 
         replies = json.loads(ai_response)
 
@@ -29,7 +29,7 @@ async def handle_journal_add(request: Request, user: User, message: str, db: Ses
         # 🔍 Mistral prompt to generate reflective insight
         prompt = journal_add_prompt(message, emotion_label)
 
-        ai_insight = generate_ai_reply(inject_persona_into_prompt(user, prompt, db))
+        ai_insight = await generate_ai_reply(inject_persona_into_prompt(user, prompt, db))
 
         new_entry = JournalEntry(
             user_id=user.id,
@@ -21,7 +21,7 @@ async def handle_journal_delete(request: Request, user: User, message: str, db:
     prompt = journal_delete_prompt(message)
 
     try:
-        parsed = json.loads(generate_ai_reply(inject_persona_into_prompt(user, prompt, db)))
+        parsed = json.loads(await generate_ai_reply(inject_persona_into_prompt(user, prompt, db), task="extract"))
         entry_id = parsed["entry_id"]
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Failed to extract entry ID: {e}")
@@ -25,7 +25,7 @@ async def handle_journal_modify(request: Request, user: User, message: str, db:
     prompt = journal_modify_prompt(message, emotion_label)
 
     try:
-        parsed = json.loads(generate_ai_reply(inject_persona_into_prompt(user, prompt, db)))
+        parsed = json.loads(await generate_ai_reply(inject_persona_into_prompt(user, prompt, db), task="extract"))
         entry_id = parsed["entry_id"]
         new_text = parsed["new_text"]
     except Exception as e:
@@ -44,7 +44,7 @@ async def handle_journal_modify(request: Request, user: User, message: str, db:
     Reflect on the following updated journal entry and provide 2–3 sentences of helpful insight:
     "{new_text}"
     """
-    entry.ai_insight = generate_ai_reply(inject_persona_into_prompt(user, new_prompt, db))
+    entry.ai_insight = await generate_ai_reply(inject_persona_into_prompt(user, new_prompt, db))
     entry.emotion_label = emotion_label
 
     db.commit()
@@ -59,7 +59,7 @@ Close with a sentence like "Would you like a calming tip?" or "Want to explore t
 """
 
     try:
-        ai_insight = generate_ai_reply(inject_persona_into_prompt(user, ai_prompt, db))
+        ai_insight = await generate_ai_reply(inject_persona_into_prompt(user, ai_prompt, db), task="summarize")
 
     except Exception:
         ai_insight = "You've been processing a range of emotions this week. Just remember — every feeling is valid and healing takes time."
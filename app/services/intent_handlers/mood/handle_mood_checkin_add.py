@@ -24,7 +24,7 @@ async def handle_mood_checkin_add(request: Request, user: User, message: str, db
 
     # Motivational reply from AI
     prompt = f"A user rated their mood {mood_rating}/10 and energy {energy}. Their note: '{note}'. Give a short motivational response."
-    ai_feedback = generate_ai_reply(inject_persona_into_prompt(user, prompt, db))
+    ai_feedback = await generate_ai_reply(inject_persona_into_prompt(user, prompt, db))
 
     # Save to DB
     mood_log = MoodLog(
@@ -5,11 +5,13 @@
 from fastapi import APIRouter, Depends, Request, HTTPException
 from sqlalchemy.orm import Session
 from pydantic import BaseModel
+from typing import Optional
+import os
 import json
 
 from app.models.database import SessionLocal
 from app.models.user import User
-from app.schemas.intent_schemas import IntentRequest
+from app.schemas.intent_schemas import IntentRequest, IntentClassification
 from app.utils.auth_utils import require_token, ensure_token_user_match
 from app.utils.ai_engine import generate_ai_reply
 from app.utils.intent_tracker import track_intent_usage
@@ -79,11 +81,15 @@ from app.services.intent_handlers.handle_weekly_trait_summary import handle_week
 
 
 from app.services.handle_nudge_trigger import handle_nudge_trigger
-from app.utils.persona_prompt_wrapper import inject_persona_into_prompt
-from app.utils.intent_mappings_utils import INTENT_ALIAS_MAP, INTENT_EXAMPLES, ALL_VALID_INTENTS
+from app.utils.persona_prompt_wrapper import inject_persona_into_prompt, build_persona_header
+from app.utils.intent_mappings_utils import ALL_VALID_INTENTS
+from app.utils.intent_classifier import fast_classify, should_shadow_check, record_llm_agreement, select_few_shots
 
 router = APIRouter(prefix="/intent-core", tags=["Intent Router"])
 
+# Number of nearest aliases and examples included in the classification prompt
+INTENT_PROMPT_TOP_K = int(os.getenv("INTENT_PROMPT_TOP_K", "6"))
+
 def get_db():
     db = SessionLocal()
     try:
@@ -92,55 +98,86 @@ def get_db():
         db.close()
 
 
-async def detect_and_route_intent(
-    request: Request,
-    payload: IntentRequest,
-    db: Session = Depends(get_db),
-    user_data: dict = Depends(require_token)
-):
-    ensure_token_user_match(user_data["sub"], payload.user_id)
+def build_intent_prompt(message: str) -> str:
+    """
+    Intent prompt with only the few-shot aliases/examples closest to the message,
+    one compact `"phrase" -> intent` line each.
+    """
+    aliases, examples = select_few_shots(message, INTENT_PROMPT_TOP_K)
+    alias_lines = "\n".join(f"{json.dumps(phrase)} -> {intent}" for phrase, intent in aliases)
+    example_lines = "\n".join(f"{json.dumps(phrase)} -> {intent}" for phrase, intent in examples)
 
-    user = db.query(User).filter(User.id == payload.user_id).first()
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
+    return f"""You are Neura, a smart assistant. Map the user's request to the most relevant intent from this list:
+{','.join(ALL_VALID_INTENTS)}
 
-    # Use inject_persona_into_prompt to enrich the intent prompt
-    user_input_escaped = json.dumps(payload.message)
-    intent_prompt = f"""
-    You are Neura, a smart assistant. Map the user's request to the most relevant **intent** from this list:
+Similar aliases:
+{alias_lines}
 
-    {', '.join(ALL_VALID_INTENTS)}
+Similar examples:
+{example_lines}
 
-    Also use these **aliases** and **examples** to understand real-life phrasing:
+Now classify this user message:
+{json.dumps(message)}
 
-    ALIASES:
-    {json.dumps(INTENT_ALIAS_MAP, indent=2)}
+Respond ONLY in this format:
+{{"intent": "<one of the intents above>", "entities": {{"goal_id": <int|null>, "habit_id": <int|null>}}}}"""
 
-    EXAMPLES:
-    {json.dumps(INTENT_EXAMPLES, indent=2)}
 
-    Now classify this user message:
-    {user_input_escaped}
+async def classify_intent(user: User, message: str, db: Session) -> IntentClassification:
+    """
+    Single classification stage shared by chat, voice and the intent router.
+    High-confidence messages are resolved locally; otherwise one LLM call
+    returns both the intent and its entities.
+    """
+    local_intent, _ = fast_classify(message)
+    shadow = local_intent is not None and should_shadow_check()
+    if local_intent and not shadow:
+        return IntentClassification(intent=local_intent, entities={})
 
-    Respond ONLY in this format:
-    {{
-      "intent": "<one of the intents above>",
-      "entities": {{
-        "goal_id": <int|null>,
-        "habit_id": <int|null>
-      }}
-    }}
-    """.strip()
-
-    raw_response = generate_ai_reply(inject_persona_into_prompt(user, intent_prompt, db))
+    # Persona enriches the prompt but is kept out of the cache key
+    raw_response = await generate_ai_reply(
+        build_intent_prompt(message),
+        cache="intent",
+        persona=build_persona_header(user, db),
+        task="classify"
+    )
 
     try:
         parsed = json.loads(raw_response)
-        intent = parsed["intent"].strip().lower()
-        entities = parsed["entities"]
+        classification = IntentClassification(
+            intent=parsed["intent"].strip().lower(),
+            entities=parsed.get("entities") or {}
+        )
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Invalid AI response: {e}")
 
+    record_llm_agreement(message, classification.intent, confident=shadow)
+    return classification
+
+
+async def detect_and_route_intent(
+    request: Request,
+    payload: IntentRequest,
+    db: Session = Depends(get_db),
+    user_data: dict = Depends(require_token),
+    classification: Optional[IntentClassification] = None
+):
+    """
+    Routes a message to its intent handler.
+    Pass `classification` when the caller already ran `classify_intent` to skip a second LLM call.
+    """
+    ensure_token_user_match(user_data["sub"], payload.user_id)
+
+    user = db.query(User).filter(User.id == payload.user_id).first()
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+
+    if classification is None:
+        classification = await classify_intent(user, payload.message, db)
+
+    intent = classification.intent
+    entities = classification.entities
+
     track_intent_usage(db, user, intent, payload.message)
 
     # Routing
@@ -0,0 +1,61 @@
+# Copyright (c) 2025 Shiladitya Mallick
+# This file is part of the Neura - Your Smart Assistant project.
+# Licensed under the MIT License - see the LICENSE file for details.
+
+
+import os
+import asyncio
+import logging
+from concurrent.futures import Future
+from typing import List
+
+from app.utils.micro_batch import BatchJob, MicroBatchWorker
+
+logger = logging.getLogger(__name__)
+
+# ---------------------------
+# ✅ Settings
+# ---------------------------
+
+EMOTION_BATCH_SIZE = int(os.getenv("EMOTION_BATCH_SIZE", "16"))
+# How long the worker waits for more texts after the first one arrives
+EMOTION_BATCH_WAIT_MS = float(os.getenv("EMOTION_BATCH_WAIT_MS", "10"))
+EMOTION_LOCAL_TIMEOUT = float(os.getenv("EMOTION_LOCAL_TIMEOUT", "10"))
+# The model handles up to 512 tokens; longer texts are cut by the tokenizer
+EMOTION_MAX_LENGTH = 512
+
+# ---------------------------
+# ✅ Micro-batching Worker
+# ---------------------------
+
+class LocalEmotionModel(MicroBatchWorker):
+    """
+    Runs the emotion model in-process on CPU.
+    Concurrent messages are classified together in one pipeline call (see MicroBatchWorker).
+    """
+
+    def __init__(self, model_id: str):
+        super().__init__("emotion-model", EMOTION_BATCH_SIZE, EMOTION_BATCH_WAIT_MS)
+        self.model_id = model_id
+        self._pipeline = None
+
+    def _load(self):
+        from transformers import pipeline
+
+        logger.info(f"🎭 Loading local emotion model: {self.model_id}")
+        self._pipeline = pipeline("text-classification", model=self.model_id, top_k=None, device=-1)
+
+    def _process(self, batch: List[BatchJob]):
+        results = self._pipeline([job.text for job in batch], truncation=True, max_length=EMOTION_MAX_LENGTH)
+        for job, predictions in zip(batch, results):
+            job.future.set_result(predictions)
+
+    def submit(self, text: str) -> Future:
+        """Queue one text; the future resolves to the model's label/score list."""
+        return self.submit_job(BatchJob(text))
+
+    def predict(self, text: str) -> list:
+        return self.submit(text).result(timeout=EMOTION_LOCAL_TIMEOUT)
+
+    async def predict_async(self, text: str) -> list:
+        return await asyncio.wait_for(asyncio.wrap_future(self.submit(text)), timeout=EMOTION_LOCAL_TIMEOUT)
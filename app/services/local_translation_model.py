@@ -0,0 +1,117 @@
+# Copyright (c) 2025 Shiladitya Mallick
+# This file is part of the Neura - Your Smart Assistant project.
+# Licensed under the MIT License - see the LICENSE file for details.
+
+
+import os
+import asyncio
+import logging
+from concurrent.futures import Future
+from typing import Dict, List, Tuple
+
+from app.utils.micro_batch import BatchJob, MicroBatchWorker
+
+logger = logging.getLogger(__name__)
+
+# ---------------------------
+# ✅ Settings
+# ---------------------------
+
+TRANSLATION_LOCAL_MODEL = os.getenv("TRANSLATION_LOCAL_MODEL", "facebook/nllb-200-distilled-600M")
+TRANSLATION_BATCH_SIZE = int(os.getenv("TRANSLATION_BATCH_SIZE", "16"))
+# How long the worker waits for more strings after the first one arrives
+TRANSLATION_BATCH_WAIT_MS = float(os.getenv("TRANSLATION_BATCH_WAIT_MS", "10"))
+TRANSLATION_LOCAL_TIMEOUT = float(os.getenv("TRANSLATION_LOCAL_TIMEOUT", "20"))
+TRANSLATION_LOCAL_THREADS = int(os.getenv("TRANSLATION_LOCAL_THREADS", "0"))  # 0 = torch default
+TRANSLATION_MAX_INPUT_TOKENS = 256
+
+# LANG_MAP uses the Space's codes; the NLLB checkpoints name a few languages differently
+NLLB_CODE_ALIASES = {
+    "ara_Arab": "arb_Arab",
+    "cmn_Hans": "zho_Hans",
+    "fil_Latn": "tgl_Latn",
+    "kor_Kore": "kor_Hang",
+    "msa_Latn": "zsm_Latn",
+    "nor_Latn": "nob_Latn",
+}
+
+# ---------------------------
+# ✅ Batching Worker
+# ---------------------------
+
+class _Job(BatchJob):
+    def __init__(self, text: str, src: str, tgt: str):
+        super().__init__(text)
+        self.src = NLLB_CODE_ALIASES.get(src, src)
+        self.tgt = NLLB_CODE_ALIASES.get(tgt, tgt)
+
+
+class LocalTranslationModel(MicroBatchWorker):
+    """
+    Runs a distilled NLLB model in-process on CPU.
+    Strings that share a language pair in a micro-batch (see MicroBatchWorker) are
+    translated in a single generate() call.
+    """
+
+    def __init__(self, model_id: str):
+        super().__init__("translation-model", TRANSLATION_BATCH_SIZE, TRANSLATION_BATCH_WAIT_MS)
+        self.model_id = model_id
+        self._tokenizer = None
+        self._model = None
+
+    def _load(self):
+        import torch
+        from transformers import AutoModelForSeq2SeqLM, AutoTokenizer
+
+        if TRANSLATION_LOCAL_THREADS > 0:
+            torch.set_num_threads(TRANSLATION_LOCAL_THREADS)
+        logger.info(f"🌐 Loading local translation model: {self.model_id}")
+        self._tokenizer = AutoTokenizer.from_pretrained(self.model_id)
+        self._model = AutoModelForSeq2SeqLM.from_pretrained(self.model_id)
+        self._model.eval()
+
+    def _translate(self, texts: List[str], src: str, tgt: str) -> List[str]:
+        import torch
+
+        self._tokenizer.src_lang = src
+        inputs = self._tokenizer(
+            texts, return_tensors="pt", padding=True, truncation=True, max_length=TRANSLATION_MAX_INPUT_TOKENS
+        )
+        with torch.inference_mode():
+            output = self._model.generate(
+                **inputs,
+                forced_bos_token_id=self._tokenizer.convert_tokens_to_ids(tgt),
+                max_new_tokens=int(inputs["input_ids"].shape[1] * 2) + 10,
+            )
+        return self._tokenizer.batch_decode(output, skip_special_tokens=True)
+
+    def _process(self, batch: List[_Job]):
+        groups: Dict[Tuple[str, str], List[_Job]] = {}
+        for job in batch:
+            groups.setdefault((job.src, job.tgt), []).append(job)
+
+        for (src, tgt), jobs in groups.items():
+            try:
+                results = self._translate([job.text for job in jobs], src, tgt)
+                for job, translated in zip(jobs, results):
+                    job.future.set_result(translated)
+            except Exception as e:
+                logger.warning(f"❌ Local translation batch failed ({src}->{tgt}): {e}")
+                for job in jobs:
+                    if not job.future.done():
+                        job.future.set_exception(e)
+
+    def submit(self, text: str, src: str, tgt: str) -> Future:
+        """Queue one string (NLLB codes); the future resolves to its translation."""
+        return self.submit_job(_Job(text, src, tgt))
+
+    def translate(self, text: str, src: str, tgt: str) -> str:
+        return self.submit(text, src, tgt).result(timeout=TRANSLATION_LOCAL_TIMEOUT)
+
+    async def translate_async(self, text: str, src: str, tgt: str) -> str:
+        return await asyncio.wait_for(
+            asyncio.wrap_future(self.submit(text, src, tgt)), timeout=TRANSLATION_LOCAL_TIMEOUT
+        )
+
+    def stats(self) -> dict:
+        return {"model": self.model_id, **super().stats()}
@@ -3,9 +3,18 @@
 # Licensed under the MIT License - see the LICENSE file for details.
 
 import os
+import json
+import asyncio
 import logging
-import requests
+import httpx
 from time import sleep
+from contextvars import ContextVar
+from typing import AsyncIterator, Optional
+
+from app.utils.single_flight import SingleFlight
+from app.utils.client_pool import LoopClientPool
+from app.utils.circuit_breaker import CircuitBreaker, CircuitOpenError
+from app.utils.response_cache import content_hash
 
 # ---------------------------
 # ✅ Logger Setup
@@ -27,6 +36,34 @@ SPACE_URL = os.getenv(
     "LLM_SPACE_URL",
     "https://hf.space/embed/deepseek-ai/deepseek-vl2-small/api/predict"
 )
+# Optional second Space used for failover and hedged requests
+SECONDARY_SPACE_URL = os.getenv("LLM_SECONDARY_SPACE_URL")
+# Server-sent-events endpoint of the same Space; streaming falls back to one chunk when unset
+STREAM_URL = os.getenv("LLM_STREAM_URL")
+
+# ---------------------------
+# ✅ Connection Pool Settings
+# ---------------------------
+
+LLM_TIMEOUT = float(os.getenv("LLM_TIMEOUT", "15"))
+# Upper bound for one reply including retries, failover and hedging
+LLM_DEADLINE = float(os.getenv("LLM_DEADLINE", "20"))
+# Start the secondary Space if the primary has not answered after this many seconds (0 = no hedging)
+LLM_HEDGE_DELAY = float(os.getenv("LLM_HEDGE_DELAY", "0"))
+LLM_MAX_CONNECTIONS = int(os.getenv("LLM_MAX_CONNECTIONS", "50"))
+LLM_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("LLM_MAX_KEEPALIVE_CONNECTIONS", "20"))
+LLM_KEEPALIVE_EXPIRY = float(os.getenv("LLM_KEEPALIVE_EXPIRY", "60"))
+LLM_HTTP2 = os.getenv("LLM_HTTP2", "true").lower() == "true"
+
+LLM_LIMITS = httpx.Limits(
+    max_connections=LLM_MAX_CONNECTIONS,
+    max_keepalive_connections=LLM_MAX_KEEPALIVE_CONNECTIONS,
+    keepalive_expiry=LLM_KEEPALIVE_EXPIRY,
+)
+
+MAX_RETRIES = 2
+
+UNREACHABLE_REPLY = "⚠️ AI is currently unreachable. Please try again later."
 
 # ---------------------------
 # ✅ Headers
@@ -36,53 +73,344 @@ HEADERS = {"Content-Type": "application/json"}
 if HF_TOKEN:
     HEADERS["Authorization"] = f"Bearer {HF_TOKEN}"
 
+# ---------------------------
+# ✅ Shared HTTP Clients
+# ---------------------------
+
+# One pooled AsyncClient per event loop: the app's loop, plus any loop a cron job opens with asyncio.run
+_async_clients: "LoopClientPool[httpx.AsyncClient]" = LoopClientPool("llm", lambda: httpx.AsyncClient(
+    headers=HEADERS,
+    timeout=LLM_TIMEOUT,
+    limits=LLM_LIMITS,
+    http2=LLM_HTTP2,
+))
+_sync_client: Optional[httpx.Client] = None
+
+
+def _get_sync_client() -> httpx.Client:
+    """Return the pooled blocking client used by cron jobs and other sync callers."""
+    global _sync_client
+    if _sync_client is None or _sync_client.is_closed:
+        _sync_client = httpx.Client(
+            headers=HEADERS,
+            timeout=LLM_TIMEOUT,
+            limits=LLM_LIMITS,
+            http2=LLM_HTTP2,
+        )
+    return _sync_client
+
+
+async def close_llm_clients():
+    """Close the shared clients. Called from the app lifespan on shutdown."""
+    global _sync_client
+    await _async_clients.close()
+    if _sync_client is not None:
+        _sync_client.close()
+        _sync_client = None
+
+
+# Identical prompts in flight at the same time share one upstream request
+_llm_flight = SingleFlight("llm")
+
+# ---------------------------
+# ✅ Circuit Breakers
+# ---------------------------
+
+def _make_breaker(name: str) -> CircuitBreaker:
+    return CircuitBreaker(
+        name,
+        failure_rate_threshold=float(os.getenv("LLM_BREAKER_FAILURE_RATE", "0.5")),
+        window_size=int(os.getenv("LLM_BREAKER_WINDOW", "20")),
+        min_calls=int(os.getenv("LLM_BREAKER_MIN_CALLS", "5")),
+        open_seconds=float(os.getenv("LLM_BREAKER_OPEN_SECONDS", "30")),
+    )
+
+
+_breakers = {url: _make_breaker(f"llm:{label}") for label, url in (
+    ("primary", SPACE_URL),
+    ("secondary", SECONDARY_SPACE_URL),
+    ("stream", STREAM_URL),
+) if url}
+
+
+def _breaker_for(url: str) -> CircuitBreaker:
+    """Breakers for task-specific Spaces (see ai_engine.MODEL_BACKENDS) are created on first use."""
+    breaker = _breakers.get(url)
+    if breaker is None:
+        breaker = _breakers.setdefault(url, _make_breaker(f"llm:{url}"))
+    return breaker
+
+
+def _space_targets(space_url: Optional[str] = None) -> list:
+    """The requested Space first, then the secondary Space as failover."""
+    targets = []
+    for url in (space_url or SPACE_URL, SECONDARY_SPACE_URL):
+        if url and url not in targets:
+            targets.append(url)
+    return targets
+
+
+def _parse_space_response(result) -> str:
+    if "data" in result and isinstance(result["data"], list):
+        return result["data"][0]
+    logger.warning("⚠️ Unexpected Space response format: %s", result)
+    return "⚠️ Unexpected AI response format."
+
 # ---------------------------
 # ✅ Hugging Face Space Function
 # ---------------------------
 
-def get_mistral_reply(prompt: str) -> str:
+async def get_mistral_reply_async(
+    prompt: str,
+    space_url: Optional[str] = None,
+    timeout: Optional[float] = None,
+    deadline: Optional[float] = None,
+) -> str:
+    """
+    Non-blocking variant of `get_mistral_reply`.
+    Reuses one pooled AsyncClient so the event loop is never held by an LLM round trip.
+    Bounded by LLM_DEADLINE; open circuits fail fast to the "unreachable" reply.
+
+    `space_url`, `timeout` and `deadline` override the defaults for one call
+    (ai_engine routes task classes to different Spaces this way).
+    """
+
+    if not (space_url or SPACE_URL):
+        logger.error("❌ Missing Hugging Face Space URL.")
+        return "⚠️ AI Space URL not configured."
+
+    targets = _space_targets(space_url)
+    key = content_hash(f"{targets[0]}\n{prompt}")
+    return await _llm_flight.do(key, lambda: _request_reply_async(prompt, targets, timeout, deadline))
+
+
+# Loop time at which the current request's LLM_DEADLINE expires (hedge tasks inherit it)
+_deadline_at: ContextVar[Optional[float]] = ContextVar("llm_deadline_at", default=None)
+
+
+def _deadline_passed() -> bool:
+    expires = _deadline_at.get()
+    return expires is not None and asyncio.get_running_loop().time() >= expires
+
+
+async def _call_space_async(url: str, prompt: str, timeout: Optional[float] = None) -> str:
+    """One attempt against one Space, guarded by its circuit breaker."""
+    breaker = _breaker_for(url)
+    if not breaker.allow_request():
+        raise CircuitOpenError(url)
+    try:
+        logger.info(f"🔁 Sending prompt to Hugging Face Space: {url}")
+        response = await _async_clients.get().post(url, json={"data": [prompt]}, timeout=timeout or LLM_TIMEOUT)
+        response.raise_for_status()
+    except httpx.HTTPError:
+        breaker.record_failure()
+        raise
+    except asyncio.CancelledError:
+        if _deadline_passed():
+            # Cut off by the request deadline: the Space was too slow, count it
+            breaker.record_failure()
+        else:
+            # Not the upstream's fault (e.g. a discarded speculative reply or a lost hedge)
+            breaker.record_cancelled()
+        raise
+    breaker.record_success()
+    return _parse_space_response(response.json())
+
+
+async def _call_with_retries_async(url: str, prompt: str, timeout: Optional[float] = None) -> str:
+    for attempt in range(1, MAX_RETRIES + 1):
+        try:
+            return await _call_space_async(url, prompt, timeout)
+        except httpx.HTTPError:
+            logger.warning("⚠️ API request failed (attempt %d/%d). Retrying...", attempt, MAX_RETRIES)
+            if attempt == MAX_RETRIES:
+                raise
+            await asyncio.sleep(1)  # brief pause before retry
+
+
+async def _hedged_call_async(prompt: str, targets: list, timeout: Optional[float] = None) -> str:
+    """Primary first; the secondary joins after LLM_HEDGE_DELAY and the first success wins."""
+    pending = {asyncio.ensure_future(_call_space_async(targets[0], prompt, timeout))}
+    last_error = None
+    try:
+        done, pending = await asyncio.wait(pending, timeout=LLM_HEDGE_DELAY)
+        for task in done:
+            if task.exception() is None:
+                return task.result()
+            last_error = task.exception()
+
+        pending.add(asyncio.ensure_future(_call_space_async(targets[1], prompt, timeout)))
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    # The slower Space is cancelled below and recorded as cancelled, not
+                    # failed: being slower than a hedge delay is not an upstream error
+                    return task.result()
+                last_error = task.exception()
+        raise last_error
+    finally:
+        for task in pending:
+            task.cancel()
+
+
+async def _request_reply_async(
+    prompt: str,
+    targets: list,
+    timeout: Optional[float] = None,
+    deadline: Optional[float] = None,
+) -> str:
+    async def attempt_all() -> str:
+        if LLM_HEDGE_DELAY > 0 and len(targets) > 1:
+            return await _hedged_call_async(prompt, targets, timeout)
+
+        last_error = None
+        for url in targets:  # failover in order
+            try:
+                return await _call_with_retries_async(url, prompt, timeout)
+            except (httpx.HTTPError, CircuitOpenError) as e:
+                last_error = e
+        raise last_error
+
+    deadline = deadline or LLM_DEADLINE
+    _deadline_at.set(asyncio.get_running_loop().time() + deadline)
+    try:
+        return await asyncio.wait_for(attempt_all(), timeout=deadline)
+
+    except CircuitOpenError:
+        logger.warning("⚠️ LLM circuit open, failing fast.")
+        return UNREACHABLE_REPLY
+
+    except (httpx.HTTPError, asyncio.TimeoutError):
+        logger.exception("❌ Space API request failed after retries.")
+        return UNREACHABLE_REPLY
+
+    except Exception:
+        logger.exception("❌ Unexpected error in AI response.")
+        return "⚠️ AI couldn't process your request."
+
+
+def get_mistral_reply(prompt: str, space_url: Optional[str] = None, timeout: Optional[float] = None) -> str:
     """
     Send a prompt to the DeepSeek Hugging Face Space and return the generated text.
     Function name kept unchanged for backward compatibility.
-    Retries once in case of temporary failures.
+    Blocking shim for cron jobs and other sync callers; async code should use
+    `get_mistral_reply_async`.
     """
 
-    if not SPACE_URL:
+    if not (space_url or SPACE_URL):
         logger.error("❌ Missing Hugging Face Space URL.")
         return "⚠️ AI Space URL not configured."
 
-    try_count = 0
-    max_retries = 2
+    targets = _space_targets(space_url)
+    key = content_hash(f"{targets[0]}\n{prompt}")
+    return _llm_flight.do_sync(key, lambda: _request_reply(prompt, targets, timeout))
 
-    while try_count < max_retries:
-        try:
-            logger.info(f"🔁 Sending prompt to Hugging Face Space: {SPACE_URL}")
-            response = requests.post(
-                SPACE_URL,
-                headers=HEADERS,
-                json={"data": [prompt]},
-                timeout=30
-            )
 
+def _call_space(url: str, prompt: str, timeout: Optional[float] = None) -> str:
+    breaker = _breaker_for(url)
+    if not breaker.allow_request():
+        raise CircuitOpenError(url)
+    try:
+        logger.info(f"🔁 Sending prompt to Hugging Face Space: {url}")
+        response = _get_sync_client().post(url, json={"data": [prompt]}, timeout=timeout or LLM_TIMEOUT)
+        response.raise_for_status()
+    except httpx.HTTPError:
+        breaker.record_failure()
+        raise
+    breaker.record_success()
+    return _parse_space_response(response.json())
+
+
+def _request_reply(prompt: str, targets: list, timeout: Optional[float] = None) -> str:
+    try:
+        for url in targets:  # failover in order, no hedging for background jobs
+            for attempt in range(1, MAX_RETRIES + 1):
+                try:
+                    return _call_space(url, prompt, timeout)
+                except CircuitOpenError:
+                    logger.warning("⚠️ LLM circuit open for %s, skipping.", url)
+                    break
+                except httpx.HTTPError:
+                    logger.warning("⚠️ API request failed (attempt %d/%d). Retrying...", attempt, MAX_RETRIES)
+                    if attempt < MAX_RETRIES:
+                        sleep(1)  # brief pause before retry
+
+        logger.error("❌ Space API request failed after retries.")
+        return UNREACHABLE_REPLY
+
+    except Exception:
+        logger.exception("❌ Unexpected error in AI response.")
+        return "⚠️ AI couldn't process your request."
+
+
+# ---------------------------
+# ✅ Streaming
+# ---------------------------
+
+def _parse_stream_chunk(payload: str) -> Optional[str]:
+    """Extract text from one SSE `data:` payload (Gradio list or {"token"/"text"} dict)."""
+    try:
+        data = json.loads(payload)
+    except ValueError:
+        return payload
+    if isinstance(data, list) and data and isinstance(data[0], str):
+        return data[0]
+    if isinstance(data, dict):
+        return data.get("token") or data.get("text")
+    return None
+
+
+async def stream_mistral_reply_async(prompt: str) -> AsyncIterator[str]:
+    """
+    Yield reply text as it is generated.
+    Gradio Spaces stream the cumulative output, so only the new suffix is yielded.
+    """
+
+    if not STREAM_URL:
+        yield await get_mistral_reply_async(prompt)
+        return
+
+    breaker = _breakers[STREAM_URL]
+    if not breaker.allow_request():
+        logger.warning("⚠️ LLM stream circuit open, failing fast.")
+        yield UNREACHABLE_REPLY
+        return
+
+    emitted = ""
+    try:
+        logger.info(f"🔁 Streaming prompt from Hugging Face Space: {STREAM_URL}")
+        async with _async_clients.get().stream("POST", STREAM_URL, json={"data": [prompt]}) as response:
             response.raise_for_status()
-            result = response.json()
-
-            # Parse the Space response
-            if "data" in result and isinstance(result["data"], list):
-                return result["data"][0]
-            else:
-                logger.warning("⚠️ Unexpected Space response format: %s", result)
-                return "⚠️ Unexpected AI response format."
-
-        except requests.exceptions.RequestException as e:
-            try_count += 1
-            logger.warning("⚠️ API request failed (attempt %d/%d). Retrying...", try_count, max_retries)
-            sleep(1)  # brief pause before retry
-
-            if try_count == max_retries:
-                logger.exception("❌ Space API request failed after retries.")
-                return "⚠️ AI is currently unreachable. Please try again later."
-
-        except Exception as e:
-            logger.exception("❌ Unexpected error in AI response.")
-            return "⚠️ AI couldn't process your request."
+            async for line in response.aiter_lines():
+                if not line.startswith("data:"):
+                    continue
+                payload = line[len("data:"):].strip()
+                if payload == "[DONE]":
+                    break
+                text = _parse_stream_chunk(payload)
+                if not text:
+                    continue
+                if text.startswith(emitted):
+                    delta, emitted = text[len(emitted):], text
+                else:
+                    delta, emitted = text, emitted + text
+                if delta:
+                    yield delta
+        breaker.record_success()
+
+    except (asyncio.CancelledError, GeneratorExit):
+        # The client went away mid-stream; give back a half-open probe slot
+        breaker.record_cancelled()
+        raise
+
+    except httpx.HTTPError:
+        breaker.record_failure()
+        logger.exception("❌ Space streaming request failed.")
+        if not emitted:
+            yield UNREACHABLE_REPLY
+
+    except Exception:
+        # Every allowed call must settle its breaker slot
+        breaker.record_failure()
+        raise
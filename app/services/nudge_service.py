@@ -12,13 +12,13 @@ from app.models.goal import Goal
 from app.models.habit import Habit
 from app.models.message_model import Message
 from app.models.notification import NotificationLog
-from app.utils.audio_processor import synthesize_voice
+from app.utils.audio_processor import submit_voice
 from app.utils.tier_logic import (
     is_voice_ping_allowed, is_pro_user, is_trait_decay_allowed, is_in_private_mode
 )
 
 from app.services.trait_drift_detector import detect_trait_drift
-from app.services.translation_service import translate
+from app.utils.message_catalog import SYSTEM_MESSAGES, localized_sync, cached_catalog_audio
 from app.utils.firebase import send_fcm_push
 
 logger = logging.getLogger(__name__)
@@ -121,19 +121,13 @@ def build_nudge_text(user: User, goals, habits):
         "Tap to review or say 'Mark as done' anytime!"
     )
 
+# Fixed texts live in the message catalog, translated and voiced ahead of time
+EMOTION_NUDGES = SYSTEM_MESSAGES["emotion_nudge"]
+DEFAULT_EMOTION_NUDGE = SYSTEM_MESSAGES["emotion_nudge_default"]
+
 def generate_emotion_based_nudge(user: User) -> str:
     emotion = user.emotion_status or "love"
-
-    fallback_nudges = {
-        "joy": "You seem upbeat today! Keep riding that wave 🌈",
-        "sadness": "Just checking in 💙 You're not alone—I'm here.",
-        "anger": "It's okay to feel off. I'm here if you want to vent.",
-        "fear": "Everything’s going to be alright. You're not alone.",
-        "love": "Sending good vibes your way 💖",
-        "surprise": "Hope the day’s unfolding well! Let me know if I can help.",
-    }
-
-    return fallback_nudges.get(emotion, "Hi! Just checking in. Hope you're doing well.")
+    return EMOTION_NUDGES.get(emotion, DEFAULT_EMOTION_NUDGE)
 
 # -------------------------------
 # Delivery Functions (All Modes)
@@ -142,15 +136,18 @@ def generate_emotion_based_nudge(user: User) -> str:
 def send_voice_nudge(user: User, text: str, db: Session, is_emotion: bool = False):
     try:
         user_lang = user.preferred_lang or "en"
-        if user_lang != "en":
-            text = translate(text, source_lang="en", target_lang=user_lang)
-
-        stream_url = synthesize_voice(
-            text,
-            gender=user.voice if user.voice in ["male", "female"] else "male",
-            emotion=user.emotion_status or "unknown",
-            lang=user_lang
-        )
+        gender = user.voice if user.voice in ["male", "female"] else "male"
+        stream_url = cached_catalog_audio(text, user_lang, gender)
+        text = localized_sync(text, user_lang)
+
+        if stream_url is None:
+            # Called from the nudge cron thread: queue on the background lane and wait
+            stream_url = submit_voice(
+                text,
+                gender=gender,
+                emotion=user.emotion_status or "unknown",
+                lang=user_lang
+            ).result()
 
         notification = NotificationLog(
             user_id=user.id,
@@ -170,8 +167,7 @@ def send_voice_nudge(user: User, text: str, db: Session, is_emotion: bool = Fals
 def store_local_notification(user: User, text: str, db: Session, is_emotion: bool = False):
     try:
         user_lang = user.preferred_lang or "en"
-        if user_lang != "en":
-            text = translate(text, source_lang="en", target_lang=user_lang)
+        text = localized_sync(text, user_lang)
 
         notification = NotificationLog(
             user_id=user.id,
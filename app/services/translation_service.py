@@ -4,10 +4,21 @@
 # Licensed under the MIT License - see the LICENSE file for details.
 
 import os
+import time
 import logging
 import httpx
-from langdetect import detect
 import asyncio
+import threading
+from typing import Dict, List, Optional
+from app.utils.single_flight import SingleFlight
+from app.utils.client_pool import LoopClientPool
+from app.utils.stats_counter import StatsCounter
+from app.utils.translation_cache import (
+    translation_key, get_cached_translation, store_translation,
+    get_cached_translation_async, store_translation_async,
+)
+from app.utils.language_detector import detect_language
+from app.services.local_translation_model import LocalTranslationModel, TRANSLATION_LOCAL_MODEL
 
 logger = logging.getLogger(__name__)
 
@@ -32,46 +43,317 @@ LANG_MAP = {
 API_URL = "https://byshiladityamallick-neura-translation-api.hf.space/api/v4/translator"
 SECRET_TOKEN = os.getenv("HUGGINGFACE_TOKEN")  # fallback if .env not loaded
 
+HEADERS = {"Authorization": f"Bearer {SECRET_TOKEN}"}
+TRANSLATION_TIMEOUT = float(os.getenv("TRANSLATION_TIMEOUT", "30"))
+TRANSLATION_LIMITS = httpx.Limits(
+    max_connections=int(os.getenv("TRANSLATION_MAX_CONNECTIONS", "20")),
+    max_keepalive_connections=int(os.getenv("TRANSLATION_MAX_KEEPALIVE_CONNECTIONS", "10")),
+    keepalive_expiry=float(os.getenv("TRANSLATION_KEEPALIVE_EXPIRY", "60")),
+)
+MAX_RETRIES = 3
+BACKOFF_BASE = 2.0
+
+# Identical (src, tgt, text) translations in flight share one upstream request
+_translate_flight = SingleFlight("translate")
+
+# ✅ Request packing for translate_many: short strings share one upstream call
+TRANSLATION_PACK_SEPARATOR = "\n|||\n"
+TRANSLATION_PACK_MAX_CHARS = int(os.getenv("TRANSLATION_PACK_MAX_CHARS", "480"))
+TRANSLATION_PACK_MAX_ITEMS = int(os.getenv("TRANSLATION_PACK_MAX_ITEMS", "16"))
+TRANSLATION_MAX_CONCURRENCY = int(os.getenv("TRANSLATION_MAX_CONCURRENCY", "8"))
+
+_pack_stats = StatsCounter()
+
+# ✅ Backend: "remote" (the Space above) or "local" (distilled NLLB on CPU for short strings;
+# longer texts, and anything the local model fails on, still go to the Space)
+TRANSLATION_BACKEND = os.getenv("TRANSLATION_BACKEND", "remote").lower()
+TRANSLATION_LOCAL_MAX_CHARS = int(os.getenv("TRANSLATION_LOCAL_MAX_CHARS", "300"))
+
+_local_model = LocalTranslationModel(TRANSLATION_LOCAL_MODEL) if TRANSLATION_BACKEND == "local" else None
+_backend_stats = StatsCounter()
+
+# ---------------------------
+# ✅ Shared HTTP Clients
+# ---------------------------
+
+# An AsyncClient's pool belongs to one event loop; cron jobs that call asyncio.run get their own
+_async_clients: "LoopClientPool[httpx.AsyncClient]" = LoopClientPool(
+    "translation", lambda: httpx.AsyncClient(headers=HEADERS, timeout=TRANSLATION_TIMEOUT, limits=TRANSLATION_LIMITS)
+)
+_sync_client: Optional[httpx.Client] = None
+_client_lock = threading.Lock()
 
-async def translate(text: str, source_lang: str = "en", target_lang: str = "hi") -> str:
-    """Translate text using Hugging Face NLLB API with retries, no signature changes."""
 
+def _get_sync_client() -> httpx.Client:
+    global _sync_client
+    with _client_lock:
+        if _sync_client is None or _sync_client.is_closed:
+            _sync_client = httpx.Client(headers=HEADERS, timeout=TRANSLATION_TIMEOUT, limits=TRANSLATION_LIMITS)
+        return _sync_client
+
+
+async def close_translation_clients():
+    """Close the pooled clients. Called from the app lifespan on shutdown."""
+    global _sync_client
+    await _async_clients.close()
+    if _sync_client is not None:
+        _sync_client.close()
+        _sync_client = None
+
+# ---------------------------
+# ✅ Translate (async + sync)
+# ---------------------------
+
+def _resolve(text: str, source_lang: str, target_lang: str):
+    """Returns (src, tgt, cache key)."""
     src = LANG_MAP.get(source_lang, "eng_Latn")
     tgt = LANG_MAP.get(target_lang, "hin_Deva")
+    return src, tgt, translation_key(src, tgt, text)
+
+
+async def translate(text: str, source_lang: str = "en", target_lang: str = "hi") -> str:
+    """
+    Translate text using Hugging Face NLLB API with retries, no signature changes.
+    Results are cached in memory and on disk (see translation_cache), keyed on (src, tgt, text).
+    Must be awaited; sync code (cron jobs, template helpers) should use `translate_sync`.
+    """
+    if not text or not text.strip() or source_lang == target_lang:
+        return text
+
+    src, tgt, key = _resolve(text, source_lang, target_lang)
+    cached = await get_cached_translation_async(key)
+    if cached is not None:
+        return cached
+
+    translated = await _translate_flight.do(key, lambda: _request_translation(text, src, tgt))
+    if translated is None:
+        return text
+    await store_translation_async(key, translated)
+    return translated
+
+
+def translate_sync(text: str, source_lang: str = "en", target_lang: str = "hi") -> str:
+    """Blocking twin of `translate` sharing its cache, coalescing and connection pool."""
+    if not text or not text.strip() or source_lang == target_lang:
+        return text
+
+    src, tgt, key = _resolve(text, source_lang, target_lang)
+    cached = get_cached_translation(key)
+    if cached is not None:
+        return cached
+
+    translated = _translate_flight.do_sync(key, lambda: _request_translation_sync(text, src, tgt))
+    if translated is None:
+        return text
+    store_translation(key, translated)
+    return translated
+
+
+def _parse_translation(response: httpx.Response, text: str) -> str:
+    response.raise_for_status()
+    return response.json().get("translation_text", text)
+
+
+def _log_failure(attempt: int, error: Exception, started: float, backoff: float):
+    logger.warning(
+        f"[Translate Retry {attempt + 1}/{MAX_RETRIES}] Error: {error} "
+        f"(elapsed {time.monotonic() - started:.2f}s, backing off {backoff:.0f}s)"
+    )
+
+
+def _log_result(attempt: int, started: float, backoff_total: float, ok: bool):
+    elapsed = time.monotonic() - started
+    if not ok:
+        logger.error(
+            f"[Translate] All retries failed after {elapsed:.2f}s "
+            f"({backoff_total:.0f}s in backoff). Returning original text."
+        )
+    elif attempt > 0:
+        logger.info(f"[Translate] succeeded on attempt {attempt + 1} after {elapsed:.2f}s ({backoff_total:.0f}s in backoff)")
+
+
+def _use_local(text: str) -> bool:
+    return _local_model is not None and _local_model.available and len(text) <= TRANSLATION_LOCAL_MAX_CHARS
+
+
+def _local_failed(error: Exception):
+    _backend_stats.bump("local_failures")
+    logger.warning(f"[Translate] local model failed, using remote Space: {error}")
 
-    headers = {
-        "Authorization": f"Bearer {SECRET_TOKEN}"
-    }
 
-    max_retries = 3
-    backoff_base = 2.0
+async def _request_translation(text: str, src: str, tgt: str) -> Optional[str]:
+    """Returns None when every retry failed, so the fallback (original text) is not cached."""
+    if _use_local(text):
+        try:
+            translated = await _local_model.translate_async(text, src, tgt)
+            _backend_stats.bump("local")
+            return translated
+        except Exception as e:
+            _local_failed(e)
+
+    _backend_stats.bump("remote")
+    started, backoff_total = time.monotonic(), 0.0
+    for attempt in range(MAX_RETRIES):
+        try:
+            response = await _async_clients.get().get(API_URL, params={"text": text, "source": src, "target": tgt})
+            translated = _parse_translation(response, text)
+            _log_result(attempt, started, backoff_total, ok=True)
+            return translated
+        except httpx.HTTPError as e:
+            backoff = BACKOFF_BASE ** attempt if attempt < MAX_RETRIES - 1 else 0.0  # 1s → 2s
+            _log_failure(attempt, e, started, backoff)
+            if backoff:
+                await asyncio.sleep(backoff)
+                backoff_total += backoff
+    _log_result(MAX_RETRIES, started, backoff_total, ok=False)
+    return None
+
 
-    for attempt in range(max_retries):
+def _request_translation_sync(text: str, src: str, tgt: str) -> Optional[str]:
+    if _use_local(text):
         try:
-            async with httpx.AsyncClient(timeout=30) as client:
-                response = await client.get(
-                    API_URL,
-                    params={"text": text, "source": src, "target": tgt},
-                    headers=headers,
-                )
-                response.raise_for_status()
-                result = response.json()
-                return result.get("translation_text", text)
-
-        except (httpx.HTTPError, httpx.RequestError) as e:
-            logger.warning(f"[Translate Retry {attempt+1}/{max_retries}] Error: {e}")
-            if attempt < max_retries - 1:
-                await asyncio.sleep(backoff_base ** attempt)  # 1s → 2s → 4s
-            else:
-                logger.error("[Translate] All retries failed. Returning original text.")
-                return text
-
-
-
-def detect_language(text: str) -> str:
-    """Detect the ISO 639-1 language code of a string."""
-    try:
-        return detect(text)
-    except Exception as e:
-        logger.warning(f"[LanguageDetector] Failed to detect language: {e}")
-        return "en"
+            translated = _local_model.translate(text, src, tgt)
+            _backend_stats.bump("local")
+            return translated
+        except Exception as e:
+            _local_failed(e)
+
+    _backend_stats.bump("remote")
+    started, backoff_total = time.monotonic(), 0.0
+    for attempt in range(MAX_RETRIES):
+        try:
+            response = _get_sync_client().get(API_URL, params={"text": text, "source": src, "target": tgt})
+            translated = _parse_translation(response, text)
+            _log_result(attempt, started, backoff_total, ok=True)
+            return translated
+        except httpx.HTTPError as e:
+            backoff = BACKOFF_BASE ** attempt if attempt < MAX_RETRIES - 1 else 0.0
+            _log_failure(attempt, e, started, backoff)
+            if backoff:
+                time.sleep(backoff)
+                backoff_total += backoff
+    _log_result(MAX_RETRIES, started, backoff_total, ok=False)
+    return None
+
+# ---------------------------
+# ✅ Batched Translation
+# ---------------------------
+
+def _pack_texts(texts: List[str]) -> List[List[str]]:
+    """
+    Group texts into packs under the size limits; texts containing the separator go alone.
+    Strings the local model will handle also go alone: its worker batches them itself.
+    """
+    packs, current, size = [], [], 0
+    for text in texts:
+        if "|||" in text or len(text) >= TRANSLATION_PACK_MAX_CHARS or _use_local(text):
+            packs.append([text])
+            continue
+        if current and (size + len(text) > TRANSLATION_PACK_MAX_CHARS or len(current) >= TRANSLATION_PACK_MAX_ITEMS):
+            packs.append(current)
+            current, size = [], 0
+        current.append(text)
+        size += len(text) + len(TRANSLATION_PACK_SEPARATOR)
+    if current:
+        packs.append(current)
+    return packs
+
+
+def _plan_many(texts: List[str], src: str, tgt: str):
+    """Dedupe and serve cache hits; returns (results so far, packs still to translate)."""
+    results: Dict[str, str] = {}
+    pending = []
+    for text in dict.fromkeys(texts):
+        if not text or not text.strip():
+            results[text] = text
+            continue
+        cached = get_cached_translation(translation_key(src, tgt, text))
+        if cached is not None:
+            results[text] = cached
+        else:
+            pending.append(text)
+
+    _pack_stats.bump("strings", len(texts))
+    _pack_stats.bump("deduped_or_cached", len(texts) - len(pending))
+    return results, _pack_texts(pending)
+
+
+def _unpack(pack: List[str], translated: Optional[str], results: Dict[str, str], src: str, tgt: str) -> bool:
+    """Split a packed translation back onto its strings. False if the parts do not line up."""
+    parts = [part.strip() for part in translated.split("|||")] if translated else []
+    _pack_stats.bump("packed_requests")
+    if len(parts) != len(pack) or not all(parts):
+        _pack_stats.bump("pack_mismatches")
+        return False
+    for text, part in zip(pack, parts):
+        store_translation(translation_key(src, tgt, text), part)
+        results[text] = part
+    return True
+
+
+async def translate_many(texts: List[str], source_lang: str = "en", target_lang: str = "hi") -> List[str]:
+    """
+    Translate a list of strings, returning results in the same order.
+    Repeated and cached strings cost nothing; the rest are packed several to a request.
+    A pack whose translation does not split back into the same number of parts is
+    retried string by string.
+    """
+    if source_lang == target_lang:
+        return list(texts)
+
+    src = LANG_MAP.get(source_lang, "eng_Latn")
+    tgt = LANG_MAP.get(target_lang, "hin_Deva")
+    # Cache lookups and writes touch SQLite, so they run in a worker thread
+    results, packs = await asyncio.to_thread(_plan_many, texts, src, tgt)
+    limit = asyncio.Semaphore(TRANSLATION_MAX_CONCURRENCY)
+
+    async def run_pack(pack: List[str]):
+        if len(pack) == 1 and _use_local(pack[0]):
+            # No connection to protect; the local worker batches concurrent strings
+            results[pack[0]] = await translate(pack[0], source_lang=source_lang, target_lang=target_lang)
+            return
+        async with limit:
+            if len(pack) > 1:
+                joined = TRANSLATION_PACK_SEPARATOR.join(pack)
+                key = translation_key(src, tgt, joined)
+                translated = await _translate_flight.do(key, lambda: _request_translation(joined, src, tgt))
+                if await asyncio.to_thread(_unpack, pack, translated, results, src, tgt):
+                    return
+            for text in pack:
+                results[text] = await translate(text, source_lang=source_lang, target_lang=target_lang)
+
+    await asyncio.gather(*[run_pack(pack) for pack in packs])
+    return [results[text] for text in texts]
+
+
+def translate_many_sync(texts: List[str], source_lang: str = "en", target_lang: str = "hi") -> List[str]:
+    """Blocking twin of `translate_many` for cron jobs; packs are sent one after another."""
+    if source_lang == target_lang:
+        return list(texts)
+
+    src = LANG_MAP.get(source_lang, "eng_Latn")
+    tgt = LANG_MAP.get(target_lang, "hin_Deva")
+    results, packs = _plan_many(texts, src, tgt)
+
+    for pack in packs:
+        if len(pack) > 1:
+            joined = TRANSLATION_PACK_SEPARATOR.join(pack)
+            key = translation_key(src, tgt, joined)
+            translated = _translate_flight.do_sync(key, lambda: _request_translation_sync(joined, src, tgt))
+            if _unpack(pack, translated, results, src, tgt):
+                continue
+        for text in pack:
+            results[text] = translate_sync(text, source_lang=source_lang, target_lang=target_lang)
+
+    return [results[text] for text in texts]
+
+
+def get_translation_stats() -> dict:
+    return _pack_stats.snapshot()
+
+
+def get_translation_backend_stats() -> dict:
+    stats = {"backend": TRANSLATION_BACKEND, **_backend_stats.snapshot()}
+    if _local_model is not None:
+        stats["local_model"] = _local_model.stats()
+    return stats
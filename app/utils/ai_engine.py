@@ -3,11 +3,278 @@
 # Licensed under the MIT License - see the LICENSE file for details.
 
 
-from app.services.mistral_ai_service import get_mistral_reply
+import os
+import json
+import asyncio
+from typing import AsyncIterator, Callable, Optional
 
-def generate_ai_reply(prompt: str):
+from app.services.mistral_ai_service import (
+    SPACE_URL, LLM_TIMEOUT, LLM_DEADLINE,
+    get_mistral_reply, get_mistral_reply_async, stream_mistral_reply_async,
+)
+from app.utils.response_cache import TTLCache, normalize_prompt, content_hash, get_shared_cache
+from app.utils.intent_mappings_utils import ALL_VALID_INTENTS
+from app.utils.llm_scheduler import PriorityScheduler, PRIORITY_INTERACTIVE, PRIORITY_BATCH, current_priority
+
+# ---------------------------
+# ✅ Model Backends per Task Class
+# ---------------------------
+
+class ModelBackend:
+    """
+    One model endpoint with its own timeout and concurrency limit.
+    Calls queue for a slot in priority order (see llm_scheduler); async handlers
+    and cron threads share the same slots.
+    """
+
+    def __init__(self, name: str, url: str, timeout: float, deadline: float, max_concurrency: int):
+        self.name = name
+        self.url = url
+        self.timeout = timeout
+        self.deadline = deadline
+        self.scheduler = PriorityScheduler(f"llm:{name}", max_concurrency)
+
+    async def generate(self, prompt: str, priority: int) -> str:
+        await self.scheduler.acquire(priority)
+        try:
+            return await get_mistral_reply_async(
+                prompt, space_url=self.url, timeout=self.timeout, deadline=self.deadline
+            )
+        finally:
+            self.scheduler.release()
+
+    def generate_sync(self, prompt: str, priority: int) -> str:
+        self.scheduler.acquire_sync(priority)
+        try:
+            return get_mistral_reply(prompt, space_url=self.url, timeout=self.timeout)
+        finally:
+            self.scheduler.release()
+
+    def stats(self) -> dict:
+        return {"url": self.url, "timeout": self.timeout, **self.scheduler.stats()}
+
+
+def _make_backend(name: str, timeout: float, deadline: float, max_concurrency: int) -> ModelBackend:
+    """
+    `timeout`/`deadline` are tuned for a dedicated Space. A backend without its own
+    URL shares LLM_SPACE_URL, so it keeps that Space's LLM_TIMEOUT/LLM_DEADLINE.
+    """
+    prefix = f"LLM_{name.upper()}"
+    url = os.getenv(f"{prefix}_SPACE_URL")
+    if not url:
+        url, timeout, deadline = SPACE_URL, LLM_TIMEOUT, LLM_DEADLINE
+    return ModelBackend(
+        name,
+        url=url,
+        timeout=float(os.getenv(f"{prefix}_TIMEOUT", str(timeout))),
+        deadline=float(os.getenv(f"{prefix}_DEADLINE", str(deadline))),
+        max_concurrency=int(os.getenv(f"{prefix}_CONCURRENCY", str(max_concurrency))),
+    )
+
+
+# Every backend falls back to LLM_SPACE_URL and its timeouts, so routing is a
+# no-op until the LLM_SMALL_/LLM_LARGE_ Space URLs are configured.
+MODEL_BACKENDS = {
+    "small": _make_backend("small", timeout=8, deadline=10, max_concurrency=16),
+    "default": _make_backend("default", timeout=LLM_TIMEOUT, deadline=LLM_DEADLINE, max_concurrency=8),
+    "large": _make_backend("large", timeout=45, deadline=60, max_concurrency=4),
+}
+
+# Task class -> backend. Short structured outputs go to the small model.
+TASK_ROUTES = {
+    "classify": "small",
+    "extract": "small",
+    "summarize": "default",
+    "chat": "default",
+    "long_form": "large",
+}
+
+
+def get_backend(task: Optional[str] = None) -> ModelBackend:
+    return MODEL_BACKENDS[TASK_ROUTES.get(task or "chat", "default")]
+
+
+def get_backend_stats() -> dict:
+    return {name: backend.stats() for name, backend in MODEL_BACKENDS.items()}
+
+# ---------------------------
+# ✅ Response Cache Policies
+# ---------------------------
+
+class CachePolicy:
+    """
+    Per-call-site cache settings.
+    `vary_on_persona=False` keys only on the static prompt, so every persona shares one entry.
+    `shared=True` also reads/writes the optional shared backend.
+    `validate` checks a reply before it is stored, so a malformed answer is not
+    served to every later caller for the whole TTL.
+    """
+
+    def __init__(
+        self,
+        ttl: float,
+        max_entries: int,
+        vary_on_persona: bool = True,
+        shared: bool = False,
+        validate: Optional[Callable[[str], bool]] = None,
+    ):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.vary_on_persona = vary_on_persona
+        self.shared = shared
+        self.validate = validate
+        self.store = TTLCache(max_entries=max_entries, ttl=ttl)
+
+
+def _is_intent_reply(reply: str) -> bool:
+    """The classifier's JSON with an intent classify_intent will accept."""
+    try:
+        parsed = json.loads(reply)
+    except ValueError:
+        return False
+    intent = parsed.get("intent") if isinstance(parsed, dict) else None
+    return isinstance(intent, str) and intent.strip().lower() in ALL_VALID_INTENTS
+
+
+CACHE_POLICIES = {
+    "intent": CachePolicy(
+        ttl=6 * 3600, max_entries=5000, vary_on_persona=False, shared=True, validate=_is_intent_reply
+    ),
+    "search_summary": CachePolicy(ttl=30 * 60, max_entries=1000),
+    "city_tip": CachePolicy(ttl=12 * 3600, max_entries=500, shared=True),
+    "morning_news": CachePolicy(ttl=3 * 3600, max_entries=10, shared=True),
+}
+
+
+def _cache_key(policy_name: str, policy: CachePolicy, prompt: str, persona: str) -> str:
+    key = f"llm:{policy_name}:{content_hash(normalize_prompt(prompt))}"
+    if persona and policy.vary_on_persona:
+        key += f":{content_hash(normalize_prompt(persona))[:16]}"
+    return key
+
+
+def _is_cacheable(policy: CachePolicy, reply: str) -> bool:
+    # Error replies from the Space service all start with the warning sign
+    if not reply or reply.startswith("⚠️"):
+        return False
+    return policy.validate is None or policy.validate(reply)
+
+
+def _cache_lookup(policy: CachePolicy, key: str) -> Optional[str]:
+    cached = policy.store.get(key)
+    if cached is None and policy.shared:
+        shared = get_shared_cache()
+        if shared:
+            cached = shared.get(key)
+            if cached is not None:
+                if not _is_cacheable(policy, cached):
+                    # Stored before validation existed; let a fresh reply replace it
+                    return None
+                policy.store.set(key, cached)
+    return cached
+
+
+def _cache_store(policy: CachePolicy, key: str, reply: str):
+    if not _is_cacheable(policy, reply):
+        return
+    policy.store.set(key, reply)
+    if policy.shared:
+        shared = get_shared_cache()
+        if shared:
+            shared.set(key, reply, ttl=policy.ttl)
+
+
+def get_cache_stats() -> dict:
+    stats = {name: policy.store.stats() for name, policy in CACHE_POLICIES.items()}
+    shared = get_shared_cache()
+    if shared:
+        stats["shared"] = shared.stats()
+    return stats
+
+# ---------------------------
+# ✅ Public API
+# ---------------------------
+
+async def generate_ai_reply(
+    prompt: str,
+    cache: Optional[str] = None,
+    persona: str = "",
+    task: Optional[str] = None,
+    priority: Optional[int] = None,
+) -> str:
     """
     Wrapper function to generate an AI reply from a given prompt using Mistral.
        This keeps your app logic clean and abstracted from model implementation.
+       Must be awaited; it never blocks the event loop.
+
+    `cache` names a policy in CACHE_POLICIES; `persona` is an optional header
+    (see build_persona_header) that is prepended to the prompt but hashed separately.
+    `task` is a task class from TASK_ROUTES and picks the model backend (default "chat").
+    `priority` orders the call when the backend is saturated; by default it comes from
+    set_llm_priority for the current request, or interactive/free.
+    """
+    backend = get_backend(task)
+    if priority is None:
+        priority = current_priority(PRIORITY_INTERACTIVE)
+    policy = CACHE_POLICIES.get(cache) if cache else None
+    if policy is None:
+        return await backend.generate(f"{persona}{prompt}", priority)
+
+    key = _cache_key(cache, policy, prompt, persona)
+    # The shared backend does blocking network I/O, keep it off the event loop
+    use_thread = policy.shared and get_shared_cache() is not None
+    if use_thread:
+        cached = await asyncio.to_thread(_cache_lookup, policy, key)
+    else:
+        cached = _cache_lookup(policy, key)
+    if cached is not None:
+        return cached
+
+    reply = await backend.generate(f"{persona}{prompt}", priority)
+    if use_thread:
+        await asyncio.to_thread(_cache_store, policy, key, reply)
+    else:
+        _cache_store(policy, key, reply)
+    return reply
+
+
+def generate_ai_reply_sync(
+    prompt: str,
+    cache: Optional[str] = None,
+    persona: str = "",
+    task: Optional[str] = None,
+    priority: Optional[int] = None,
+) -> str:
+    """
+    Blocking twin of `generate_ai_reply` for cron jobs and other sync code paths.
+    Sync callers are scheduler threads, so they default to batch priority.
+    """
+    backend = get_backend(task)
+    if priority is None:
+        priority = current_priority(PRIORITY_BATCH)
+    policy = CACHE_POLICIES.get(cache) if cache else None
+    if policy is None:
+        return backend.generate_sync(f"{persona}{prompt}", priority)
+
+    key = _cache_key(cache, policy, prompt, persona)
+    cached = _cache_lookup(policy, key)
+    if cached is not None:
+        return cached
+
+    reply = backend.generate_sync(f"{persona}{prompt}", priority)
+    _cache_store(policy, key, reply)
+    return reply
+
+
+async def stream_ai_reply(prompt: str, persona: str = "") -> AsyncIterator[str]:
+    """
+    Streaming variant of `generate_ai_reply`: yields text chunks as the model produces them.
+    Streams are never cached, and hold a chat-backend slot until they finish.
     """
-    return get_mistral_reply(prompt)
+    scheduler = get_backend("chat").scheduler
+    await scheduler.acquire(current_priority(PRIORITY_INTERACTIVE))
+    try:
+        async for chunk in stream_mistral_reply_async(f"{persona}{prompt}"):
+            yield chunk
+    finally:
+        scheduler.release()
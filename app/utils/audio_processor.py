@@ -3,15 +3,32 @@
 # Licensed under the MIT License - see the LICENSE file for details.
 
 import os
+import time
+import asyncio
+import logging
+from typing import AsyncIterator, Awaitable, Callable, List, Optional
 from dotenv import load_dotenv
 from faster_whisper import WhisperModel
 import aiohttp
 import tempfile
 import uuid
 from storage3 import create_client
+from app.utils.single_flight import SingleFlight
+from app.utils.client_pool import LoopClientPool
+from app.utils.stats_counter import StatsCounter
+from app.utils.response_cache import content_hash
+from app.utils.tts_cache import TTSAudioCache, TTS_CACHE_ENABLED, TTS_CACHE_PREFIX
+from app.utils.sentence_splitter import chunk_for_tts
+from app.utils.llm_scheduler import PriorityScheduler, PRIORITY_INTERACTIVE, current_priority
+from app.utils.tts_worker_pool import (
+    TTSWorkerPool, TTSJob, TokenBucket, TTSProviderError,
+    LANE_INTERACTIVE, LANE_BACKGROUND, TTS_INTERACTIVE_WORKERS, TTS_BACKGROUND_WORKERS
+)
 
 load_dotenv()  # Load environment variables from .env
 
+logger = logging.getLogger(__name__)
+
 # ------------------- Whisper Transcription -------------------
 
 # Load Whisper model (small footprint)
@@ -45,12 +62,26 @@ if not ELEVENLABS_API_KEY:
     raise ValueError("ELEVENLABS_API_KEY not set in environment variables.")
 
 ELEVENLABS_MODEL_ID = "eleven_multilingual_v2"
+# Per-provider limits shared by every lane, event loop and thread (see tts_worker_pool)
+ELEVENLABS_CONCURRENCY = int(os.getenv("ELEVENLABS_CONCURRENCY", "4"))
+ELEVENLABS_RATE_PER_SECOND = float(os.getenv("ELEVENLABS_RATE_PER_SECOND", "3"))  # 0 = unlimited
+ELEVENLABS_BURST = float(os.getenv("ELEVENLABS_BURST", "6"))
+STORAGE_UPLOAD_CONCURRENCY = int(os.getenv("STORAGE_UPLOAD_CONCURRENCY", "8"))
 
 # Supabase Storage
 SUPABASE_URL = os.getenv("SUPABASE_URL")
 SUPABASE_KEY = os.getenv("SUPABASE_KEY")
 SUPABASE_BUCKET = "neura_tts_audio"
 
+# Sentence-chunked synthesis for long replies (see synthesize_playlist)
+TTS_CHUNKED_ENABLED = os.getenv("TTS_CHUNKED_ENABLED", "false").lower() == "true"
+TTS_CHUNK_MIN_CHARS = int(os.getenv("TTS_CHUNK_MIN_CHARS", "300"))   # shorter texts stay one file
+TTS_CHUNK_MAX_CHARS = int(os.getenv("TTS_CHUNK_MAX_CHARS", "400"))
+TTS_CHUNK_CONCURRENCY = int(os.getenv("TTS_CHUNK_CONCURRENCY", "3"))
+
+# Streamed speech is forwarded to the client in pieces of at most this many bytes
+TTS_STREAM_CHUNK_BYTES = int(os.getenv("TTS_STREAM_CHUNK_BYTES", "4096"))
+
 # ------------------- Voice / Emotion Settings -------------------
 
 EMOTION_VOICE_SETTINGS = {
@@ -83,33 +114,268 @@ LANG_VOICE_MAP = {
 
 # ------------------- Async Supabase Client -------------------
 
-storage = create_client(
+# One client per event loop: the app's loop, the TTS worker loop, and any loop a cron job opens
+_storage_clients = LoopClientPool("storage", lambda: create_client(
     url=SUPABASE_URL,
     headers={"apiKey": SUPABASE_KEY},
     is_async=True
-)
+))
+
+
+def _get_storage():
+    return _storage_clients.get()
+
+# ------------------- TTS Worker Pool -------------------
+
+# Identical synthesis requests in flight share one ElevenLabs call and upload
+_tts_flight = SingleFlight("tts")
+
+tts_pool = TTSWorkerPool("tts-worker", {
+    LANE_INTERACTIVE: TTS_INTERACTIVE_WORKERS,
+    LANE_BACKGROUND: TTS_BACKGROUND_WORKERS,
+})
+elevenlabs_slots = PriorityScheduler("tts:elevenlabs", ELEVENLABS_CONCURRENCY)
+elevenlabs_rate = TokenBucket("elevenlabs", ELEVENLABS_RATE_PER_SECOND, ELEVENLABS_BURST)
+storage_slots = PriorityScheduler("tts:storage", STORAGE_UPLOAD_CONCURRENCY)
 
 # ------------------- Async Text-to-Speech -------------------
 
+def _voice_for(gender: str, emotion: str, lang: str):
+    """Returns (voice_id, settings) for a gender/emotion/language combination."""
+    voice_opts = LANG_VOICE_MAP.get(lang, DEFAULT_VOICE_MAP)
+    voice_id = voice_opts.get(gender, DEFAULT_VOICE_MAP.get(gender, DEFAULT_VOICE_MAP["male"]))
+    settings = EMOTION_VOICE_SETTINGS.get(emotion, EMOTION_VOICE_SETTINGS["unknown"])
+    return voice_id, settings
+
+
+def audio_object_name(text: str, gender: str, emotion: str, lang: str, prefix: str = "") -> str:
+    """Deterministic storage path: the same text, voice and settings always map to the same file."""
+    voice_id, settings = _voice_for(gender, emotion, lang)
+    digest = content_hash(f"{voice_id}|{settings['stability']}|{settings['similarity_boost']}|{lang}|{text}")
+    return f"{prefix}{digest}.mp3"
+
+
 async def synthesize_voice(
     text: str,
     gender: str = "male",
     emotion: str = "unknown",
-    lang: str = "en"
+    lang: str = "en",
+    lane: str = LANE_INTERACTIVE
 ) -> str:
     """
-    - Calls ElevenLabs API for speech synthesis
+    - Reuses stored audio for identical (text, voice, settings, lang) requests
+    - Otherwise calls ElevenLabs API for speech synthesis
     - Uploads audio to Supabase Storage asynchronously
     - Returns a signed public URL to the audio
+    Runs on the TTS worker pool; await from async code, or use `submit_voice` from threads.
     """
+    return await submit_voice(text, gender=gender, emotion=emotion, lang=lang, lane=lane).wait()
+
+
+def submit_voice(
+    text: str,
+    gender: str = "male",
+    emotion: str = "unknown",
+    lang: str = "en",
+    lane: str = LANE_BACKGROUND
+) -> TTSJob:
+    """
+    Queue a synthesis and return its handle right away. Cron jobs submit every
+    user's audio first and collect the URLs after, with `job.result()`.
+    """
+    return tts_pool.submit(_synthesize, text, gender, emotion, lang, lane=lane)
+
+
+async def _synthesize(text: str, gender: str, emotion: str, lang: str) -> str:
     # -------- Voice Selection --------
-    voice_opts = LANG_VOICE_MAP.get(lang, DEFAULT_VOICE_MAP)
-    voice_id = voice_opts.get(gender, DEFAULT_VOICE_MAP.get(gender, DEFAULT_VOICE_MAP["male"]))
-    settings = EMOTION_VOICE_SETTINGS.get(emotion, EMOTION_VOICE_SETTINGS["unknown"])
+    voice_id, settings = _voice_for(gender, emotion, lang)
 
-    # -------- ElevenLabs API Request --------
-    url = f"https://api.elevenlabs.io/v1/text-to-speech/{voice_id}"
-    payload = {
+    if not TTS_CACHE_ENABLED:
+        key = content_hash(f"{voice_id}|{settings['stability']}|{settings['similarity_boost']}|{lang}|{text}")
+        return await _tts_flight.do(key, lambda: _synthesize_and_upload(text, voice_id, settings, lang))
+
+    name = audio_object_name(text, gender, emotion, lang, prefix=TTS_CACHE_PREFIX)
+    return await _tts_flight.do(name, lambda: _cached_synthesis(text, voice_id, settings, lang, name))
+
+
+async def _cached_synthesis(text: str, voice_id: str, settings: dict, lang: str, name: str) -> str:
+    url = await tts_cache.lookup(name)
+    if url:
+        return url
+
+    audio_bytes = await _request_tts(text, voice_id, settings, lang)
+    await _upload_audio(name, audio_bytes, upsert=True)
+    return await tts_cache.store(name, len(audio_bytes))
+
+
+# ------------------- Streaming Text-to-Speech -------------------
+
+# Streams run on request loops while archive callbacks run on the pool's thread
+_stream_stats = StatsCounter()
+
+
+async def cached_voice_url(
+    text: str,
+    gender: str = "male",
+    emotion: str = "unknown",
+    lang: str = "en"
+) -> Optional[str]:
+    """Signed URL of already stored audio for this text and voice, without synthesizing."""
+    if not TTS_CACHE_ENABLED:
+        return None
+    return await tts_cache.lookup(audio_object_name(text, gender, emotion, lang, prefix=TTS_CACHE_PREFIX))
+
+
+async def stream_voice(
+    text: str,
+    gender: str = "male",
+    emotion: str = "unknown",
+    lang: str = "en"
+) -> AsyncIterator[bytes]:
+    """
+    Yield MP3 bytes from ElevenLabs' streaming endpoint as they are generated.
+    Nothing is uploaded before the audio reaches the caller; once the stream is
+    complete it is archived under its content-addressed name in the background.
+    """
+    voice_id, settings = _voice_for(gender, emotion, lang)
+    url = f"https://api.elevenlabs.io/v1/text-to-speech/{voice_id}/stream"
+    started = time.monotonic()
+    audio = bytearray()
+
+    # The stream holds an ElevenLabs slot until it ends, like any other synthesis
+    await elevenlabs_slots.acquire(current_priority(PRIORITY_INTERACTIVE))
+    try:
+        await elevenlabs_rate.acquire()
+        async with aiohttp.ClientSession() as session:
+            async with session.post(
+                url,
+                headers={"xi-api-key": ELEVENLABS_API_KEY, "Content-Type": "application/json"},
+                json=_tts_payload(text, settings, lang)
+            ) as resp:
+                if resp.status != 200:
+                    _stream_stats.bump("errors")
+                    raise TTSProviderError(resp.status, await resp.text())
+                async for chunk in resp.content.iter_chunked(TTS_STREAM_CHUNK_BYTES):
+                    if not audio:
+                        _stream_stats.bump("streams")
+                        _stream_stats.bump("first_byte_ms_total", int((time.monotonic() - started) * 1000))
+                    audio.extend(chunk)
+                    yield chunk
+    finally:
+        elevenlabs_slots.release()
+
+    _stream_stats.bump("bytes", len(audio))
+    if audio:
+        _archive_in_background(audio_object_name(text, gender, emotion, lang, prefix=TTS_CACHE_PREFIX), bytes(audio))
+
+
+def _archive_in_background(name: str, audio_bytes: bytes):
+    async def archive():
+        await _upload_audio(name, audio_bytes, upsert=True)
+        if TTS_CACHE_ENABLED:
+            await tts_cache.store(name, len(audio_bytes))
+
+    def finished(job: TTSJob):
+        if job.future.exception() is None:
+            _stream_stats.bump("archived")
+        else:
+            _stream_stats.bump("archive_failures")
+            logger.warning(f"[TTSStream] could not archive {name}: {job.future.exception()}")
+
+    # Uploads queue on the background lane, behind interactive synthesis
+    tts_pool.submit(archive, lane=LANE_BACKGROUND).add_done_callback(finished)
+
+
+def get_tts_stream_stats() -> dict:
+    stats = _stream_stats.snapshot()
+    first_byte_total = stats.pop("first_byte_ms_total", 0)
+    streams = stats.get("streams", 0)
+    stats["avg_first_byte_ms"] = round(first_byte_total / streams, 1) if streams else 0.0
+    return stats
+
+
+# ------------------- Sentence-Chunked Text-to-Speech -------------------
+
+async def iter_voice_chunks(
+    text: str,
+    gender: str = "male",
+    emotion: str = "unknown",
+    lang: str = "en"
+) -> AsyncIterator[str]:
+    """
+    Yield signed URLs for the text's chunks in order. Chunks are synthesized
+    concurrently (at most TTS_CHUNK_CONCURRENCY at a time), and each URL is yielded
+    as soon as it and every chunk before it are ready.
+    """
+    if not TTS_CHUNKED_ENABLED or len(text) < TTS_CHUNK_MIN_CHARS:
+        yield await synthesize_voice(text, gender=gender, emotion=emotion, lang=lang)
+        return
+
+    limit = asyncio.Semaphore(TTS_CHUNK_CONCURRENCY)
+
+    async def synthesize_chunk(chunk: str) -> str:
+        async with limit:
+            return await synthesize_voice(chunk, gender=gender, emotion=emotion, lang=lang)
+
+    # Created in order, so earlier chunks claim the semaphore first
+    tasks = [asyncio.ensure_future(synthesize_chunk(chunk)) for chunk in chunk_for_tts(text, TTS_CHUNK_MAX_CHARS)]
+    try:
+        for task in tasks:
+            yield await task
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+async def synthesize_playlist(
+    text: str,
+    gender: str = "male",
+    emotion: str = "unknown",
+    lang: str = "en",
+    on_first: Optional[Callable[[str], Awaitable[None]]] = None
+) -> List[str]:
+    """
+    Ordered list of audio URLs covering `text` (a single URL for short texts or
+    when chunking is off). `on_first` is awaited with the first URL as soon as it
+    exists, before the remaining chunks finish.
+    """
+    playlist = []
+    async for url in iter_voice_chunks(text, gender=gender, emotion=emotion, lang=lang):
+        if not playlist and on_first is not None:
+            await on_first(url)
+        playlist.append(url)
+    return playlist
+
+
+async def synthesize_to_object(text: str, object_name: str, gender: str = "male", emotion: str = "unknown", lang: str = "en"):
+    """
+    Synthesize once and store under a fixed path (overwriting), for audio that is reused.
+    Queued on the background lane, since callers are warm-up fan-outs.
+    """
+    voice_id, settings = _voice_for(gender, emotion, lang)
+
+    async def store():
+        audio_bytes = await _request_tts(text, voice_id, settings, lang)
+        await _upload_audio(object_name, audio_bytes, upsert=True)
+
+    async def run():
+        await _tts_flight.do(object_name, store)
+
+    await tts_pool.submit(run, lane=LANE_BACKGROUND).wait()
+
+
+async def _synthesize_and_upload(text: str, voice_id: str, settings: dict, lang: str) -> str:
+    audio_bytes = await _request_tts(text, voice_id, settings, lang)
+
+    # -------- Generate filename --------
+    filename = f"{uuid.uuid4()}.mp3"
+
+    await _upload_audio(filename, audio_bytes)
+    return await sign_audio_url(filename, 3600)
+
+
+def _tts_payload(text: str, settings: dict, lang: str) -> dict:
+    return {
         "text": text,
         "voice_settings": {
             "stability": settings["stability"],
@@ -118,26 +384,42 @@ async def synthesize_voice(
         "generation_config": {"language": lang}
     }
 
-    async with aiohttp.ClientSession() as session:
-        async with session.post(
-            url,
-            headers={"xi-api-key": ELEVENLABS_API_KEY, "Content-Type": "application/json"},
-            json=payload
-        ) as resp:
-            if resp.status != 200:
-                raise Exception(f"TTS error: {resp.status} {await resp.text()}")
-            audio_bytes = await resp.read()
 
-    # -------- Generate filename --------
-    filename = f"{uuid.uuid4()}.mp3"
+async def _request_tts(text: str, voice_id: str, settings: dict, lang: str) -> bytes:
+    # -------- ElevenLabs API Request --------
+    url = f"https://api.elevenlabs.io/v1/text-to-speech/{voice_id}"
 
+    await elevenlabs_slots.acquire(current_priority(PRIORITY_INTERACTIVE))
+    try:
+        await elevenlabs_rate.acquire()
+        async with aiohttp.ClientSession() as session:
+            async with session.post(
+                url,
+                headers={"xi-api-key": ELEVENLABS_API_KEY, "Content-Type": "application/json"},
+                json=_tts_payload(text, settings, lang)
+            ) as resp:
+                if resp.status != 200:
+                    raise TTSProviderError(resp.status, await resp.text())
+                return await resp.read()
+    finally:
+        elevenlabs_slots.release()
+
+
+async def _upload_audio(filename: str, audio_bytes: bytes, upsert: bool = False):
     # -------- Async upload to Supabase --------
-    upload_response = await storage.from_(SUPABASE_BUCKET).upload(filename, audio_bytes)
+    file_options = {"content-type": "audio/mpeg", "upsert": "true"} if upsert else None
+    await storage_slots.acquire(current_priority(PRIORITY_INTERACTIVE))
+    try:
+        upload_response = await _get_storage().from_(SUPABASE_BUCKET).upload(filename, audio_bytes, file_options)
+    finally:
+        storage_slots.release()
     if "error" in upload_response and upload_response["error"]:
         raise Exception(f"Supabase upload failed: {upload_response['error']}")
 
-    # -------- Async generate signed URL (1 hour) --------
-    signed_url_response = await storage.from_(SUPABASE_BUCKET).create_signed_url(filename, 3600)
+
+async def sign_audio_url(filename: str, expires_in: int = 3600) -> str:
+    """Signed URL for a stored audio file, valid for `expires_in` seconds."""
+    signed_url_response = await _get_storage().from_(SUPABASE_BUCKET).create_signed_url(filename, expires_in)
     signed_url = signed_url_response.get("signedURL") or signed_url_response.get("signed_url")
     if not signed_url:
         raise Exception(f"Signed URL generation failed: {signed_url_response}")
@@ -147,3 +429,36 @@ async def synthesize_voice(
         signed_url = f"{SUPABASE_URL}{signed_url}"
 
     return signed_url
+
+
+async def list_audio_objects(folder: str) -> set:
+    """Names of the files stored directly under `folder`."""
+    entries = await _get_storage().from_(SUPABASE_BUCKET).list(folder, {"limit": 1000})
+    return {entry["name"] for entry in entries or [] if entry.get("name")}
+
+
+async def _list_audio_page(folder: str, limit: int, offset: int) -> list:
+    entries = await _get_storage().from_(SUPABASE_BUCKET).list(folder, {"limit": limit, "offset": offset})
+    return [entry for entry in entries or [] if entry.get("name")]
+
+
+async def remove_audio_objects(filenames: list):
+    await _get_storage().from_(SUPABASE_BUCKET).remove(filenames)
+
+
+# Content-addressed cache of synthesized audio (see tts_cache)
+tts_cache = TTSAudioCache(sign=sign_audio_url, remove=remove_audio_objects, list_folder=_list_audio_page)
+
+
+def get_tts_cache_stats() -> dict:
+    return tts_cache.stats()
+
+
+def get_tts_pool_stats() -> dict:
+    return {
+        "lanes": tts_pool.stats(),
+        "providers": {
+            "elevenlabs": {**elevenlabs_slots.stats(), "rate_limit": elevenlabs_rate.stats()},
+            "storage": storage_slots.stats(),
+        },
+    }
@@ -9,6 +9,7 @@ from sqlalchemy.orm import Session  # ✅ Needed for type hinting in get_memory_
 from app.utils.jwt_utils import verify_access_token
 from app.models.message_model import Message  # ✅ REQUIRED: You're using Message in queries
 from app.utils.ai_engine import generate_ai_reply
+from app.utils.prompt_builder import PromptSection, build_prompt
 
 # ✅ Token-user matching guard
 def ensure_token_user_match(token_sub: str, input_id: Union[str, int]):
@@ -24,7 +25,7 @@ def require_token(authorization: str = Header(...)):
     return verify_access_token(token)
 
 
-def build_chat_history(db, user_id, conversation_id, recent_count):
+async def build_chat_history(db, user_id, conversation_id, recent_count=10):
     """
     Builds chat history:
     - Summarizes older messages
@@ -47,11 +48,11 @@ def build_chat_history(db, user_id, conversation_id, recent_count):
     # Summarize older user messages
     summary = ""
     if older_msgs:
-        joined = " ".join(
+        joined = "\n".join(
             m.message for m in older_msgs if m.sender == "user"
         )
         if joined.strip():
-            summary = summarize_messages(joined)
+            summary = await summarize_messages(joined)
 
     # Build final prompt
     history = ""
@@ -64,15 +65,14 @@ def build_chat_history(db, user_id, conversation_id, recent_count):
 
     return history
 
-def summarize_messages(text: str) -> str:
-    prompt = f"""
+async def summarize_messages(text: str) -> str:
+    # Long conversations keep only their most recent messages within the summarize budget
+    prompt = build_prompt([
+        PromptSection("instruction", """
 You are a helpful assistant.
 
 Summarize the following conversation in 3-4 sentences, capturing key points:
-
-{text}
-"""
-    return generate_ai_reply(prompt).strip()
-
-
-
+""", priority=0),
+        PromptSection("conversation", text, priority=1, keep="tail"),
+    ], intent="summarize")
+    return (await generate_ai_reply(prompt, task="summarize")).strip()
@@ -0,0 +1,128 @@
+# Copyright (c) 2025 Shiladitya Mallick
+# This file is part of the Neura - Your Smart Assistant project.
+# Licensed under the MIT License - see the LICENSE file for details.
+
+
+import time
+import logging
+import threading
+from collections import deque
+from typing import Dict
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+_BREAKERS: Dict[str, "CircuitBreaker"] = {}
+
+
+class CircuitOpenError(Exception):
+    """Raised when a call is rejected because the upstream's breaker is open."""
+
+
+class CircuitBreaker:
+    """
+    Failure-rate circuit breaker over a sliding window of the last `window_size` calls.
+
+    - closed: calls pass; the breaker opens when at least `min_calls` outcomes are in
+      the window and the failure rate reaches `failure_rate_threshold`.
+    - open: calls are rejected for `open_seconds`.
+    - half_open: up to `half_open_max_calls` probes pass; one success closes the
+      breaker, one failure re-opens it.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_rate_threshold: float = 0.5,
+        window_size: int = 20,
+        min_calls: int = 5,
+        open_seconds: float = 30.0,
+        half_open_max_calls: int = 1,
+    ):
+        self.name = name
+        self.failure_rate_threshold = failure_rate_threshold
+        self.min_calls = min_calls
+        self.open_seconds = open_seconds
+        self.half_open_max_calls = half_open_max_calls
+
+        self._window = deque(maxlen=window_size)
+        self._state = CLOSED
+        self._opened_at = 0.0
+        self._probes = 0
+        self._lock = threading.Lock()
+        self.rejected = 0
+        _BREAKERS[name] = self
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            self._maybe_half_open()
+            return self._state
+
+    def _maybe_half_open(self):
+        if self._state == OPEN and time.monotonic() - self._opened_at >= self.open_seconds:
+            self._state = HALF_OPEN
+            self._probes = 0
+            logger.info(f"[CircuitBreaker:{self.name}] half-open, probing upstream")
+
+    def _open(self):
+        self._state = OPEN
+        self._opened_at = time.monotonic()
+        self._window.clear()
+        logger.warning(f"[CircuitBreaker:{self.name}] opened for {self.open_seconds}s")
+
+    def allow_request(self) -> bool:
+        """Reserve a call slot. Every allowed call must end in record_success/record_failure."""
+        with self._lock:
+            self._maybe_half_open()
+            if self._state == CLOSED:
+                return True
+            if self._state == HALF_OPEN and self._probes < self.half_open_max_calls:
+                self._probes += 1
+                return True
+            self.rejected += 1
+            return False
+
+    def record_success(self):
+        with self._lock:
+            if self._state == HALF_OPEN:
+                self._state = CLOSED
+                self._window.clear()
+                logger.info(f"[CircuitBreaker:{self.name}] closed")
+                return
+            self._window.append(True)
+
+    def record_cancelled(self):
+        """The caller gave up before the upstream answered; frees a half-open probe slot."""
+        with self._lock:
+            if self._state == HALF_OPEN and self._probes > 0:
+                self._probes -= 1
+
+    def record_failure(self):
+        with self._lock:
+            if self._state == HALF_OPEN:
+                self._open()
+                return
+            self._window.append(False)
+            failures = self._window.count(False)
+            if len(self._window) >= self.min_calls and failures / len(self._window) >= self.failure_rate_threshold:
+                self._open()
+
+    def stats(self) -> dict:
+        with self._lock:
+            self._maybe_half_open()
+            calls = len(self._window)
+            failures = self._window.count(False)
+            return {
+                "state": self._state,
+                "window_calls": calls,
+                "window_failure_rate": round(failures / calls, 4) if calls else 0.0,
+                "rejected": self.rejected,
+            }
+
+
+def get_breaker_stats() -> dict:
+    return {name: breaker.stats() for name, breaker in _BREAKERS.items()}
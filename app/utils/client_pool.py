@@ -0,0 +1,77 @@
+# Copyright (c) 2025 Shiladitya Mallick
+# This file is part of the Neura - Your Smart Assistant project.
+# Licensed under the MIT License - see the LICENSE file for details.
+
+
+import asyncio
+import logging
+import threading
+import weakref
+from typing import Any, Awaitable, Callable, Generic, List, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+_POOLS: List["LoopClientPool"] = []
+
+
+class LoopClientPool(Generic[T]):
+    """
+    One async client per event loop.
+    A client's connection pool belongs to the loop it was created on, so the app's loop,
+    the TTS worker loop and every loop a cron job opens with asyncio.run get their own.
+    Clients need an `aclose()` coroutine; cron loops close theirs via `run_with_clients`.
+    """
+
+    def __init__(self, name: str, factory: Callable[[], T]):
+        self.name = name
+        self._factory = factory
+        self._clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, T]" = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+        _POOLS.append(self)
+
+    def get(self) -> T:
+        """Return the running loop's client, creating it on first use."""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            client = self._clients.get(loop)
+            if client is None or getattr(client, "is_closed", False):
+                client = self._factory()
+                self._clients[loop] = client
+            return client
+
+    async def close(self):
+        """Close the running loop's client, if it has one."""
+        with self._lock:
+            client = self._clients.pop(asyncio.get_running_loop(), None)
+        if client is None:
+            return
+        try:
+            await client.aclose()
+        except Exception as e:
+            logger.warning(f"[ClientPool:{self.name}] could not close client: {e}")
+
+    def open_clients(self) -> int:
+        with self._lock:
+            return len(self._clients)
+
+
+async def close_loop_clients():
+    """Close every pool's client for the running loop."""
+    for pool in _POOLS:
+        await pool.close()
+
+
+def run_with_clients(main: Callable[[], Awaitable[Any]]) -> Any:
+    """
+    asyncio.run for scheduler jobs: the job's loop ends right after `main`, so the
+    clients it opened are closed first instead of leaking their connections.
+    """
+    async def run():
+        try:
+            return await main()
+        finally:
+            await close_loop_clients()
+
+    return asyncio.run(run())
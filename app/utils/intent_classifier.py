@@ -0,0 +1,245 @@
+# Copyright (c) 2025 Shiladitya Mallick
+# This file is part of the Neura - Your Smart Assistant project.
+# Licensed under the MIT License - see the LICENSE file for details.
+
+
+import os
+import re
+import math
+import random
+import logging
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+from app.utils.stats_counter import StatsCounter
+from app.utils.intent_mappings_utils import INTENT_ALIAS_MAP, INTENT_EXAMPLES, ALL_VALID_INTENTS
+
+logger = logging.getLogger(__name__)
+
+# ---------------------------
+# ✅ Settings
+# ---------------------------
+
+FAST_PATH_ENABLED = os.getenv("INTENT_FAST_PATH_ENABLED", "true").lower() == "true"
+FAST_PATH_THRESHOLD = float(os.getenv("INTENT_FAST_PATH_THRESHOLD", "0.65"))
+FAST_PATH_MARGIN = float(os.getenv("INTENT_FAST_PATH_MARGIN", "0.15"))
+# An alias that covers at least this share of the message counts as the whole message
+ALIAS_FULL_COVERAGE = float(os.getenv("INTENT_ALIAS_FULL_COVERAGE", "0.85"))
+# Score added to an intent whose alias covers at least ALIAS_MIN_COVERAGE of a longer message
+ALIAS_HIT_BONUS = float(os.getenv("INTENT_ALIAS_HIT_BONUS", "0.3"))
+ALIAS_MIN_COVERAGE = 0.5
+# Fraction of confident fast-path hits that are still sent to the LLM to measure agreement
+FAST_PATH_SHADOW_RATE = float(os.getenv("INTENT_FAST_PATH_SHADOW_RATE", "0.05"))
+
+NGRAM_RANGE = (3, 5)
+
+# Intents whose handlers need entities (ids) that only the LLM can extract
+ENTITY_INTENTS = {"mark_goal_completed", "mark_habit_completed"}
+
+# ---------------------------
+# ✅ Text Features
+# ---------------------------
+
+_NON_WORD = re.compile(r"[^a-z0-9\s]+")
+# Negated requests ("I dont want to go private") look like their alias; only the LLM can tell
+_NEGATION = re.compile(
+    r"\b(not|no|never|nothing|without|dont|cant|wont|didnt|doesnt|isnt|arent|wasnt|havent|shouldnt|wouldnt|couldnt)\b"
+    r"|n['’]t\b"
+)
+_SPACES = re.compile(r"\s+")
+
+
+def normalize_text(text: str) -> str:
+    text = _NON_WORD.sub(" ", (text or "").lower().replace("-", ""))
+    return _SPACES.sub(" ", text).strip()
+
+
+def _char_ngrams(text: str) -> Counter:
+    padded = f" {text} "
+    grams = Counter()
+    for n in range(NGRAM_RANGE[0], NGRAM_RANGE[1] + 1):
+        for i in range(len(padded) - n + 1):
+            grams[padded[i:i + n]] += 1
+    return grams
+
+# ---------------------------
+# ✅ Index
+# ---------------------------
+
+class IntentIndex:
+    """
+    Character n-gram TF-IDF nearest-neighbour index over the curated
+    alias phrases and example sentences.
+    """
+
+    def __init__(self, phrases: List[Tuple[str, str]]):
+        self.aliases = sorted(
+            ((normalize_text(p), intent) for p, intent in INTENT_ALIAS_MAP.items()),
+            key=lambda pair: len(pair[0]),
+            reverse=True,
+        )
+        self.phrases = phrases
+        self.entries: List[Tuple[str, str]] = [(normalize_text(p), intent) for p, intent in phrases]
+
+        doc_freq = Counter()
+        grams_per_entry = [_char_ngrams(text) for text, _ in self.entries]
+        for grams in grams_per_entry:
+            doc_freq.update(grams.keys())
+
+        total = len(self.entries)
+        self.idf = {g: math.log((1 + total) / (1 + df)) + 1.0 for g, df in doc_freq.items()}
+        self.vectors = [self._weigh(grams) for grams in grams_per_entry]
+
+    def _weigh(self, grams: Counter) -> Dict[str, float]:
+        vec = {g: (1 + math.log(tf)) * self.idf[g] for g, tf in grams.items() if g in self.idf}
+        norm = math.sqrt(sum(w * w for w in vec.values())) or 1.0
+        return {g: w / norm for g, w in vec.items()}
+
+    def _alias_hits(self, text: str) -> Dict[str, float]:
+        """Intents whose alias appears in the text, with the share of the text it covers."""
+        padded = f" {text} "
+        hits: Dict[str, float] = {}
+        for alias, intent in self.aliases:
+            if alias and f" {alias} " in padded:
+                hits[intent] = max(hits.get(intent, 0.0), len(alias) / len(text))
+        return hits
+
+    def _scores(self, text: str) -> List[float]:
+        query = self._weigh(_char_ngrams(text))
+        return [sum(w * vec[g] for g, w in query.items() if g in vec) for vec in self.vectors]
+
+    def nearest(self, message: str, k: int) -> List[Tuple[str, str]]:
+        """Return the k most similar training phrases as (phrase, intent), original casing."""
+        text = normalize_text(message)
+        if not text:
+            return []
+        scores = self._scores(text)
+        order = sorted(range(len(scores)), key=lambda i: scores[i], reverse=True)[:k]
+        return [self.phrases[i] for i in order]
+
+    def rank(self, message: str) -> List[Tuple[str, float]]:
+        """Return (intent, score) pairs, best first, one per intent."""
+        text = normalize_text(message)
+        if not text:
+            return []
+
+        # Only a message that is (nearly) just the alias skips scoring; an alias inside a
+        # longer sentence ("I dont want to go private") is evidence, not an answer
+        alias_hits = self._alias_hits(text)
+        for intent, coverage in alias_hits.items():
+            if coverage >= ALIAS_FULL_COVERAGE:
+                return [(intent, 1.0)]
+
+        best: Dict[str, float] = {}
+        for (_, intent), score in zip(self.entries, self._scores(text)):
+            if score > best.get(intent, 0.0):
+                best[intent] = score
+        for intent, coverage in alias_hits.items():
+            if coverage < ALIAS_MIN_COVERAGE:
+                continue
+            best[intent] = min(best.get(intent, 0.0) + ALIAS_HIT_BONUS * coverage, 0.99)
+        return sorted(best.items(), key=lambda item: item[1], reverse=True)
+
+    def predict(self, message: str) -> Tuple[Optional[str], float]:
+        """Return the most likely intent and a confidence in [0, 1]."""
+        ranked = self.rank(message)
+        if not ranked:
+            return None, 0.0
+        intent, top = ranked[0]
+        runner_up = ranked[1][1] if len(ranked) > 1 else 0.0
+        if top < 1.0 and top - runner_up < FAST_PATH_MARGIN:
+            # Two intents are nearly tied; scale confidence down by the margin shortfall
+            top *= (top - runner_up) / FAST_PATH_MARGIN
+        return intent, top
+
+
+def select_few_shots(message: str, k: int) -> Tuple[List[Tuple[str, str]], List[Tuple[str, str]]]:
+    """
+    Pick the k aliases and k examples closest to the message for the LLM prompt.
+    Returns (aliases, examples) as (phrase, intent) pairs.
+    """
+    return ALIAS_INDEX.nearest(message, k), EXAMPLE_INDEX.nearest(message, k)
+
+
+def _training_phrases() -> List[Tuple[str, str]]:
+    phrases = [(alias, intent) for alias, intent in INTENT_ALIAS_MAP.items()]
+    phrases += [(example, intent) for example, intent in INTENT_EXAMPLES]
+    return [(p, intent) for p, intent in phrases if intent in ALL_VALID_INTENTS]
+
+
+INTENT_INDEX = IntentIndex(_training_phrases())
+
+# Separate indexes so the prompt can show both kinds of few-shot evidence
+ALIAS_INDEX = IntentIndex([(p, i) for p, i in INTENT_ALIAS_MAP.items() if i in ALL_VALID_INTENTS])
+EXAMPLE_INDEX = IntentIndex([(p, i) for p, i in INTENT_EXAMPLES if i in ALL_VALID_INTENTS])
+
+# ---------------------------
+# ✅ Hit-rate / Accuracy Stats
+# ---------------------------
+
+_stats = StatsCounter()
+
+
+def fast_classify(message: str) -> Tuple[Optional[str], float]:
+    """
+    Resolve an intent locally when confidence is high.
+    Returns (intent, confidence); intent is None when the caller must ask the LLM.
+    """
+    if not FAST_PATH_ENABLED:
+        return None, 0.0
+
+    _stats.bump("lookups")
+    if _NEGATION.search((message or "").lower()):
+        _stats.bump("negated")
+        _stats.bump("misses")
+        return None, 0.0
+
+    intent, confidence = INTENT_INDEX.predict(message)
+    if intent and intent not in ENTITY_INTENTS and confidence >= FAST_PATH_THRESHOLD:
+        _stats.bump("hits")
+        return intent, confidence
+
+    _stats.bump("misses")
+    return None, confidence
+
+
+def should_shadow_check() -> bool:
+    """Sample a fraction of fast-path hits for comparison against the LLM."""
+    return FAST_PATH_SHADOW_RATE > 0 and random.random() < FAST_PATH_SHADOW_RATE
+
+
+def record_llm_agreement(message: str, llm_intent: str, confident: bool):
+    """
+    Compare the local prediction with the LLM's intent.
+    `confident` separates shadowed hits (true accuracy) from low-confidence misses
+    (useful for tuning the threshold).
+    """
+    local_intent, _ = INTENT_INDEX.predict(message)
+    bucket = "shadow" if confident else "miss"
+    _stats.bump(f"{bucket}_compared")
+    if local_intent == llm_intent:
+        _stats.bump(f"{bucket}_agreed")
+    else:
+        logger.debug(f"[IntentFastPath] local={local_intent} llm={llm_intent} msg={message!r}")
+
+
+def get_fast_path_stats() -> dict:
+    snapshot = _stats.snapshot()
+
+    lookups = snapshot.get("lookups", 0)
+    hits = snapshot.get("hits", 0)
+    shadow_compared = snapshot.get("shadow_compared", 0)
+    miss_compared = snapshot.get("miss_compared", 0)
+    return {
+        "enabled": FAST_PATH_ENABLED,
+        "threshold": FAST_PATH_THRESHOLD,
+        "lookups": lookups,
+        "hits": hits,
+        "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+        "negated": snapshot.get("negated", 0),
+        "llm_calls_saved": hits - shadow_compared,
+        "shadow_compared": shadow_compared,
+        "shadow_accuracy": round(snapshot.get("shadow_agreed", 0) / shadow_compared, 4) if shadow_compared else None,
+        "miss_compared": miss_compared,
+        "miss_accuracy": round(snapshot.get("miss_agreed", 0) / miss_compared, 4) if miss_compared else None,
+    }
@@ -0,0 +1,194 @@
+# Copyright (c) 2025 Shiladitya Mallick
+# This file is part of the Neura - Your Smart Assistant project.
+# Licensed under the MIT License - see the LICENSE file for details.
+
+
+import os
+import logging
+import threading
+import unicodedata
+from collections import Counter
+from typing import Optional
+
+from app.utils.response_cache import TTLCache, normalize_prompt
+from app.utils.stats_counter import StatsCounter
+
+logger = logging.getLogger(__name__)
+
+# ---------------------------
+# ✅ Settings
+# ---------------------------
+
+LANGUAGE_DETECT_CACHE_SIZE = int(os.getenv("LANGUAGE_DETECT_CACHE_SIZE", "5000"))
+# Latin-script texts shorter than this (in letters) are too short for the statistical model
+LANGUAGE_DETECT_MIN_LETTERS = int(os.getenv("LANGUAGE_DETECT_MIN_LETTERS", "12"))
+# Below this probability the model's guess loses to the caller's hint
+LANGUAGE_DETECT_MIN_CONFIDENCE = float(os.getenv("LANGUAGE_DETECT_MIN_CONFIDENCE", "0.80"))
+DEFAULT_LANGUAGE = "en"
+
+# Languages we support that are written in Latin script (see translation_service.LANG_MAP)
+LATIN_LANGUAGES = {
+    "cs", "da", "de", "en", "es", "fi", "fil", "fr", "hr", "hu", "id", "it",
+    "ms", "nl", "no", "pl", "pt", "ro", "sk", "sv", "tr", "vi",
+}
+# langdetect codes that differ from ours
+LANGDETECT_ALIASES = {"tl": "fil", "zh-cn": "zh", "zh-tw": "zh"}
+
+# ---------------------------
+# ✅ Unicode Script Fast Path
+# ---------------------------
+
+# (first code point, last code point, script)
+SCRIPT_RANGES = [
+    (0x0370, 0x03FF, "greek"), (0x1F00, 0x1FFF, "greek"),
+    (0x0400, 0x052F, "cyrillic"),
+    (0x0600, 0x06FF, "arabic"), (0x0750, 0x077F, "arabic"), (0x08A0, 0x08FF, "arabic"),
+    (0xFB50, 0xFDFF, "arabic"), (0xFE70, 0xFEFF, "arabic"),
+    (0x0900, 0x097F, "devanagari"),
+    (0x0B80, 0x0BFF, "tamil"),
+    (0x1EA0, 0x1EFF, "vietnamese"),  # Latin Extended Additional: tone-marked Vietnamese vowels
+    (0x1100, 0x11FF, "hangul"), (0x3130, 0x318F, "hangul"), (0xAC00, 0xD7AF, "hangul"),
+    (0x3040, 0x30FF, "kana"), (0x31F0, 0x31FF, "kana"), (0xFF66, 0xFF9F, "kana"),
+    (0x3400, 0x4DBF, "han"), (0x4E00, 0x9FFF, "han"), (0xF900, 0xFAFF, "han"),
+]
+
+# Scripts that name exactly one of our languages
+SCRIPT_LANGUAGES = {
+    "greek": "el",
+    "arabic": "ar",
+    "devanagari": "hi",
+    "tamil": "ta",
+    "hangul": "ko",
+    "kana": "ja",
+    "han": "zh",
+    "vietnamese": "vi",
+}
+
+UKRAINIAN_LETTERS = set("іїєґ")
+RUSSIAN_LETTERS = set("ыэё")
+
+
+def _script_of(char: str) -> Optional[str]:
+    code = ord(char)
+    for start, end, script in SCRIPT_RANGES:
+        if start <= code <= end:
+            return script
+    if char.isalpha() and unicodedata.name(char, "").startswith("LATIN"):
+        return "latin"
+    return None
+
+
+def _cyrillic_language(text: str) -> str:
+    """ru/uk/bg share the script; a few letters exist in only one of them."""
+    letters = set(text.lower())
+    if letters & UKRAINIAN_LETTERS:
+        return "uk"
+    if letters & RUSSIAN_LETTERS:
+        return "ru"
+    if "ъ" in letters:
+        # Bulgarian uses ъ as a vowel and has no ы/э; in Russian it is rare
+        return "bg"
+    return "ru"
+
+
+def detect_by_script(text: str) -> Optional[str]:
+    """
+    Return a language from the dominant non-Latin script, "latin" when the text is
+    Latin script, or None when it has no letters at all.
+    """
+    counts = Counter(script for script in map(_script_of, text) if script)
+    if not counts:
+        return None
+    # Vietnamese marks are Latin letters too; they only need to appear, not dominate
+    if counts["vietnamese"]:
+        return "vi"
+    if counts["kana"]:
+        # Japanese mixes kana with kanji; Chinese never uses kana
+        return "ja"
+    script, _ = counts.most_common(1)[0]
+    if script == "latin":
+        return "latin"
+    if script == "cyrillic":
+        return _cyrillic_language(text)
+    return SCRIPT_LANGUAGES.get(script)
+
+# ---------------------------
+# ✅ Statistical Model (Latin script only)
+# ---------------------------
+
+_model_lock = threading.Lock()
+_model_ready = False
+
+
+def _detect_latin(text: str) -> Optional[tuple]:
+    """Top (language, probability) from langdetect, limited to languages we support."""
+    global _model_ready
+    from langdetect import DetectorFactory, detect_langs
+
+    with _model_lock:
+        if not _model_ready:
+            # Fixed seed: the same text always gets the same answer
+            DetectorFactory.seed = 0
+            _model_ready = True
+    for guess in detect_langs(text):
+        lang = LANGDETECT_ALIASES.get(guess.lang, guess.lang)
+        if lang in LATIN_LANGUAGES:
+            return lang, guess.prob
+    return None
+
+# ---------------------------
+# ✅ Cached Detector
+# ---------------------------
+
+_cache = TTLCache(max_entries=LANGUAGE_DETECT_CACHE_SIZE)
+_stats = StatsCounter()
+
+
+def detect_language(text: str, hint: Optional[str] = None) -> str:
+    """
+    Detect the language code (LANG_MAP key) of a string.
+    `hint` (usually the user's preferred language) wins for Latin text that is too
+    short or too ambiguous for the model to call.
+    """
+    fallback = hint if hint in LATIN_LANGUAGES else DEFAULT_LANGUAGE
+    normalized = normalize_prompt(text)
+    if not normalized:
+        return fallback
+
+    script_lang = detect_by_script(normalized)
+    if script_lang is None:
+        _stats.bump("no_letters")
+        return fallback
+    if script_lang != "latin":
+        _stats.bump("script")
+        return script_lang
+
+    letters = sum(1 for char in normalized if char.isalpha())
+    if letters < LANGUAGE_DETECT_MIN_LETTERS:
+        _stats.bump("too_short")
+        return fallback
+
+    key = normalized.lower()
+    cached = _cache.get(key)
+    if cached is not None:
+        _stats.bump("cache_hits")
+        lang, prob = cached
+    else:
+        _stats.bump("model_calls")
+        try:
+            lang, prob = _detect_latin(normalized) or (None, 0.0)
+        except Exception as e:
+            logger.warning(f"[LanguageDetector] Failed to detect language: {e}")
+            return fallback
+        _cache.set(key, (lang, prob))
+
+    if lang is None or (prob < LANGUAGE_DETECT_MIN_CONFIDENCE and hint in LATIN_LANGUAGES):
+        _stats.bump("low_confidence")
+        return fallback
+    return lang
+
+
+def get_language_detection_stats() -> dict:
+    stats = _stats.snapshot()
+    stats["cache"] = _cache.stats()
+    return stats
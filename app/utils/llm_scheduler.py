@@ -0,0 +1,188 @@
+# Copyright (c) 2025 Shiladitya Mallick
+# This file is part of the Neura - Your Smart Assistant project.
+# Licensed under the MIT License - see the LICENSE file for details.
+
+
+import time
+import heapq
+import asyncio
+import itertools
+import threading
+from contextvars import ContextVar
+from typing import Dict, List, Optional
+
+# ---------------------------
+# ✅ Priority Classes
+# ---------------------------
+
+# Lower runs first. The request class dominates; within a class pro users go before basic and free.
+CLASS_RANKS = {"sos": 0, "interactive": 1, "batch": 2}
+TIER_RANKS = {"pro": 0, "basic": 1, "free": 2}
+
+_current_priority: ContextVar[Optional[int]] = ContextVar("llm_priority", default=None)
+
+
+def priority_for(user=None, sos: bool = False, batch: bool = False) -> int:
+    request_class = "sos" if sos else "batch" if batch else "interactive"
+    tier = getattr(getattr(user, "tier", None), "value", None) or "free"
+    return CLASS_RANKS[request_class] * 10 + TIER_RANKS.get(tier, TIER_RANKS["free"])
+
+
+PRIORITY_SOS = priority_for(sos=True)
+PRIORITY_INTERACTIVE = priority_for()
+PRIORITY_BATCH = priority_for(batch=True)
+
+
+def priority_label(priority: int) -> str:
+    request_class = next((name for name, rank in CLASS_RANKS.items() if rank == priority // 10), "batch")
+    tier = next((name for name, rank in TIER_RANKS.items() if rank == priority % 10), "free")
+    return f"{request_class}:{tier}"
+
+
+def set_llm_priority(user=None, sos: bool = False, batch: bool = False):
+    """
+    Tag every LLM call made from the current request (or thread) with a priority.
+    Call once an endpoint has loaded its user; tasks started afterwards inherit it.
+    """
+    return _current_priority.set(priority_for(user, sos=sos, batch=batch))
+
+
+def use_priority(priority: int):
+    """Tag the current context with a priority captured elsewhere (e.g. when a job was queued)."""
+    return _current_priority.set(priority)
+
+
+def current_priority(default: int) -> int:
+    priority = _current_priority.get()
+    return default if priority is None else priority
+
+# ---------------------------
+# ✅ Scheduler
+# ---------------------------
+
+_SCHEDULERS: List["PriorityScheduler"] = []
+
+
+class _Waiter:
+    def __init__(self, loop: Optional[asyncio.AbstractEventLoop] = None):
+        self.loop = loop
+        self.future = loop.create_future() if loop else None
+        self.event = None if loop else threading.Event()
+        self.granted = False
+        self.abandoned = False
+
+    def wake(self):
+        if self.loop:
+            self.loop.call_soon_threadsafe(self._resolve)
+        else:
+            self.event.set()
+
+    def _resolve(self):
+        if not self.future.done():
+            self.future.set_result(True)
+
+
+class PriorityScheduler:
+    """
+    Bounded concurrency with a priority queue in front of it.
+    One slot pool serves both event-loop callers (`acquire`) and cron threads
+    (`acquire_sync`), so batch work can never crowd out interactive requests.
+    Equal priorities are served first come, first served.
+    """
+
+    def __init__(self, name: str, max_concurrency: int):
+        self.name = name
+        self.max_concurrency = max_concurrency
+        self.active = 0
+        self._queue = []
+        self._seq = itertools.count()
+        self._lock = threading.Lock()
+        self._waits: Dict[int, list] = {}  # priority -> [calls, total wait, max wait]
+        _SCHEDULERS.append(self)
+
+    def _enqueue(self, priority: int, waiter: _Waiter) -> bool:
+        """Take a free slot right away, or queue the waiter. Returns True if granted."""
+        with self._lock:
+            if self.active < self.max_concurrency and not self._queue:
+                self.active += 1
+                waiter.granted = True
+                return True
+            heapq.heappush(self._queue, (priority, next(self._seq), waiter))
+            return False
+
+    def _record_wait(self, priority: int, waited: float):
+        with self._lock:
+            stats = self._waits.setdefault(priority, [0, 0.0, 0.0])
+            stats[0] += 1
+            stats[1] += waited
+            stats[2] = max(stats[2], waited)
+
+    async def acquire(self, priority: int):
+        started = time.monotonic()
+        waiter = _Waiter(asyncio.get_running_loop())
+        if not self._enqueue(priority, waiter):
+            try:
+                await waiter.future
+            except asyncio.CancelledError:
+                self._abandon(waiter)
+                raise
+        self._record_wait(priority, time.monotonic() - started)
+
+    def acquire_sync(self, priority: int):
+        """Blocking acquire for scheduler threads. Never call it from a thread running an event loop."""
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            pass
+        else:
+            raise RuntimeError(f"[{self.name}] acquire_sync called from a running event loop, await acquire() instead")
+        started = time.monotonic()
+        waiter = _Waiter()
+        if not self._enqueue(priority, waiter):
+            waiter.event.wait()
+        self._record_wait(priority, time.monotonic() - started)
+
+    def _abandon(self, waiter: _Waiter):
+        with self._lock:
+            waiter.abandoned = True
+            granted = waiter.granted
+        if granted:
+            # Woken just as the caller was cancelled: pass the slot on
+            self.release()
+
+    def release(self):
+        with self._lock:
+            while self._queue:
+                _, _, waiter = heapq.heappop(self._queue)
+                if not waiter.abandoned:
+                    waiter.granted = True
+                    waiter.wake()
+                    return
+            self.active -= 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            depth: Dict[str, int] = {}
+            for priority, _, waiter in self._queue:
+                if not waiter.abandoned:
+                    label = priority_label(priority)
+                    depth[label] = depth.get(label, 0) + 1
+            waits = {
+                priority_label(priority): {
+                    "calls": calls,
+                    "avg_wait_ms": round(total / calls * 1000, 1) if calls else 0.0,
+                    "max_wait_ms": round(longest * 1000, 1),
+                }
+                for priority, (calls, total, longest) in sorted(self._waits.items())
+            }
+            return {
+                "max_concurrency": self.max_concurrency,
+                "active": self.active,
+                "queue_depth": sum(depth.values()),
+                "queued_by_priority": depth,
+                "wait_by_priority": waits,
+            }
+
+
+def get_scheduler_stats() -> dict:
+    return {scheduler.name: scheduler.stats() for scheduler in _SCHEDULERS}
@@ -3,12 +3,13 @@
 # Licensed under the MIT License - see the LICENSE file for details.
 
 
+import json
 from datetime import datetime
 from sqlalchemy.orm import Session
 from app.models.user import User
 from app.models.journal import JournalEntry
 from app.models.notification import NotificationLog
-from app.utils.audio_processor import synthesize_voice
+from app.utils.audio_processor import synthesize_playlist
 from app.services.translation_service import translate
 from app.utils.firebase import send_fcm_push
 
@@ -81,7 +82,7 @@ async def generate_smart_city_tip(city: str, time_of_day: str = "morning", emoti
     )
 
     try:
-        summary_text = generate_ai_reply(enriched_prompt)
+        summary_text = await generate_ai_reply(enriched_prompt, cache="city_tip")
         return summary_text.strip()
     except Exception:
         return f"Welcome to {city.title()}! Let me know if I can help while you're here."
@@ -97,11 +98,12 @@ async def deliver_travel_tip(user: User, db: Session, lat: float, lon: float) ->
                                                                   "surprise"] else "joy"
 
     tips_text_en = await generate_smart_city_tip(city=city, time_of_day=time_of_day, emotion=user_emotion)
-    tips_text_final = translate(tips_text_en, source_lang="en",
+    tips_text_final = await translate(tips_text_en, source_lang="en",
                                 target_lang=user_lang) if user_lang != "en" else tips_text_en
 
     voice_gender = user.voice if user.voice in ["male", "female"] else "male"
-    tips_audio_url = synthesize_voice(tips_text_final, gender=voice_gender, emotion=user_emotion, lang=user_lang)
+    tips_playlist = await synthesize_playlist(tips_text_final, gender=voice_gender, emotion=user_emotion, lang=user_lang)
+    tips_audio_url = tips_playlist[0]
 
     # ✅ Send FCM push if available
     if user.fcm_token:
@@ -113,7 +115,8 @@ async def deliver_travel_tip(user: User, db: Session, lat: float, lon: float) ->
                 data={
                     "tips": tips_text_final,
                     "city_name": city,
-                    "tips_audio_url": tips_audio_url
+                    "tips_audio_url": tips_audio_url,
+                    "tips_audio_playlist": json.dumps(tips_playlist)
                 }
             )
         except Exception as e:
@@ -144,5 +147,6 @@ async def deliver_travel_tip(user: User, db: Session, lat: float, lon: float) ->
     return {
         "city": city,
         "tips": tips_text_final,
-        "audio_url": tips_audio_url
+        "audio_url": tips_audio_url,
+        "audio_playlist": tips_playlist
     }
\ No newline at end of file
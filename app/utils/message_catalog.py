@@ -0,0 +1,358 @@
+# Copyright (c) 2025 Shiladitya Mallick
+# This file is part of the Neura - Your Smart Assistant project.
+# Licensed under the MIT License - see the LICENSE file for details.
+
+
+import os
+import time
+import random
+import asyncio
+import logging
+import unicodedata
+from typing import Dict, List, Optional, Tuple
+
+from app.models.user import TierLevel
+from app.utils.tier_logic import get_monthly_limit
+from app.services.translation_service import (
+    LANG_MAP, translate, translate_sync, translate_many
+)
+from app.utils.llm_scheduler import set_llm_priority
+from app.utils.stats_counter import StatsCounter
+from app.utils.translation_cache import translation_key, get_cached_translation_async
+
+logger = logging.getLogger(__name__)
+
+# ---------------------------
+# ✅ Settings
+# ---------------------------
+
+MESSAGE_CATALOG_WARMUP = os.getenv("MESSAGE_CATALOG_WARMUP", "true").lower() == "true"
+# Opt-in: synthesizing every message for every language and voice is thousands of TTS calls
+MESSAGE_CATALOG_PRESYNTHESIZE = os.getenv("MESSAGE_CATALOG_PRESYNTHESIZE", "false").lower() == "true"
+# Comma-separated languages to pre-synthesize audio for; empty means every LANG_MAP language
+MESSAGE_CATALOG_AUDIO_LANGS = [lang for lang in os.getenv("MESSAGE_CATALOG_AUDIO_LANGS", "").split(",") if lang]
+MESSAGE_CATALOG_TTS_CONCURRENCY = int(os.getenv("MESSAGE_CATALOG_TTS_CONCURRENCY", "2"))
+# Catalog audio never changes, so its signed URLs can live long; renew them before they lapse
+CATALOG_AUDIO_URL_TTL = int(os.getenv("CATALOG_AUDIO_URL_TTL", str(7 * 24 * 3600)))
+CATALOG_AUDIO_RENEW_MARGIN = int(os.getenv("CATALOG_AUDIO_RENEW_MARGIN", "3600"))
+CATALOG_AUDIO_PREFIX = "catalog"
+CATALOG_VOICES = ("female", "male")
+
+# ---------------------------
+# ✅ Fixed System Messages (English source)
+# ---------------------------
+
+SYSTEM_MESSAGES = {
+    # Voice usage limits (stream_router)
+    "voice_limit_total": "⚠️ You've used your {limit} total messages this month.",
+    "voice_limit_voice": "⚠️ You've used your {limit} voice messages this month.",
+
+    # Voice mode toggles (stream_router)
+    "speaker_on": "🔊 Speaker mode enabled. I'll speak out loud now.",
+    "speaker_off": "🔇 Silent mode activated. I'll respond quietly.",
+    "interpreter_on": "🟢 Interpreter mode activated.",
+    "interpreter_off": "🛑 Interpreter mode deactivated.",
+
+    # Safety (stream_router, safety_router)
+    "sos_detected": "🚨 Emergency detected. Triggering SOS alert.",
+    "sos_received": "Your SOS alert was received. Help is on the way. Please stay safe.",
+    "sos_logged": "SOS alert triggered. I'm with you. Stay calm and help is coming.",
+
+    # Red-flag replies (prompt_templates)
+    "red_flag": (
+        "I'm sorry, but I can't share my {reason}. "
+        "My creator, Shiladitya Mallick, designed me with care to keep certain details private. "
+        "If you're curious, feel free to connect with him on Instagram: @byshiladityamallick."
+    ),
+    "creator_info": (
+        "I was created by Shiladitya Mallick. "
+        "If you’d like to learn more, you can reach out to him on Instagram: @byshiladityamallick."
+    ),
+    "self_query": (
+        "Hey there, I’m {ai_name} — always here for you, always listening and always learning. "
+        "Think of me as your personal companion for goals, habits, thoughts, and safety. "
+        "I’ll remember and understand emotions, also the important stuff, whisper reminders when you need them, and stay silent when you want peace. "
+        "Just say what’s on your mind — I’m right here with you."
+    ),
+
+    # Emotion nudges (nudge_service)
+    "emotion_nudge": {
+        "joy": "You seem upbeat today! Keep riding that wave 🌈",
+        "sadness": "Just checking in 💙 You're not alone—I'm here.",
+        "anger": "It's okay to feel off. I'm here if you want to vent.",
+        "fear": "Everything’s going to be alright. You're not alone.",
+        "love": "Sending good vibes your way 💖",
+        "surprise": "Hope the day’s unfolding well! Let me know if I can help.",
+    },
+    "emotion_nudge_default": "Hi! Just checking in. Hope you're doing well.",
+
+    # Hourly check-ins (hourly_notifier)
+    "hourly_emotion": {
+        "sadness": "Just checking in 💙 You're not alone—I'm here.",
+        "tired": "Hi, just checking in. Maybe it's a good moment to pause and rest.",
+        "joy": "I love that you're feeling good today! Keep shining.",
+        "anger": "It’s okay to feel frustrated sometimes. I’m here if you need a reset.",
+        "fear": "Everything’s going to be alright. You’ve got this. 🫶",
+        "surprise": "Sounds like an unexpected day! I’m here if you want to talk.",
+        "love": "Sending warmth and good vibes your way 💖",
+    },
+    "hourly_time": {
+        "morning": [
+            "Good morning! Ready to make today amazing?",
+            "Hi there, hope you woke up refreshed.",
+            "Morning! I'm here if you want to plan your day."
+        ],
+        "afternoon": [
+            "Hey, how's your day going so far?",
+            "I'm here if you need a break.",
+            "Hi! Just checking in to see how you're feeling."
+        ],
+        "evening": [
+            "Good evening. Want to unwind together?",
+            "Hope your day went well. Anything on your mind?",
+            "Evening check-in—I'm here to help if you need me."
+        ],
+        "night": [
+            "It's late—remember to rest well.",
+            "Hi, just making sure you're okay before bed.",
+            "Time to relax. Sweet dreams when you're ready!"
+        ]
+    },
+    "travel_fallback": [
+        "Hi! Just checking in 👋 Hope you're settling in well.",
+        "Neura here — if you're exploring somewhere new, I'm with you!",
+        "Hope your journey is going smoothly 🛫 Let me know if you need tips.",
+        "Settling in okay? I'm just a wakeword away 😊",
+        "If you're in a new place, don’t forget to stay safe and hydrated 💧",
+        "Hey traveler 👣 Let me know if you'd like local suggestions.",
+        "Hope you're enjoying your day. Want a quick vibe check?"
+    ],
+}
+
+# Parameter values known ahead of time; other values are translated on first use
+MESSAGE_PARAMS = {
+    "voice_limit_total": [{"limit": limit} for limit in sorted({get_monthly_limit(tier) for tier in TierLevel})],
+    "voice_limit_voice": [{"limit": limit} for limit in sorted({get_monthly_limit(tier) for tier in TierLevel})],
+    "red_flag": [{"reason": "code or internal details"}],
+    "self_query": [{"ai_name": "Neura"}],
+}
+
+# Voice tone for each message's audio; anything not listed uses "unknown"
+MESSAGE_EMOTIONS = {
+    "voice_limit_total": "sadness",
+    "voice_limit_voice": "sadness",
+    "speaker_on": "joy",
+    "interpreter_on": "joy",
+    "sos_detected": "fear",
+    "creator_info": "surprise",
+    "self_query": "joy",
+}
+
+
+def message(key: str, **params) -> str:
+    """English text of a single catalog message, with its parameters filled in."""
+    return SYSTEM_MESSAGES[key].format(**params) if params else SYSTEM_MESSAGES[key]
+
+
+def choose_message(key: str, group: Optional[str] = None) -> str:
+    """English text of a message that has several phrasings, picked at random."""
+    value = SYSTEM_MESSAGES[key]
+    if group is not None:
+        value = value[group]
+    return random.choice(value) if isinstance(value, list) else value
+
+
+def _flatten(value) -> List[str]:
+    if isinstance(value, str):
+        return [value]
+    if isinstance(value, dict):
+        value = value.values()
+    return [text for item in value for text in _flatten(item)]
+
+
+def catalog_texts() -> Dict[str, str]:
+    """Every precomputable English text, mapped to the emotion its audio is spoken with."""
+    texts: Dict[str, str] = {}
+    for key, value in SYSTEM_MESSAGES.items():
+        emotion = MESSAGE_EMOTIONS.get(key, "unknown")
+        if key in MESSAGE_PARAMS:
+            for params in MESSAGE_PARAMS[key]:
+                texts[message(key, **params)] = emotion
+        else:
+            for text in _flatten(value):
+                texts.setdefault(text, emotion)
+    return texts
+
+
+def speech_text(text: str) -> str:
+    """Drop emoji and other pictographs so TTS does not try to read them."""
+    kept = (c for c in text if unicodedata.category(c) != "So" and c not in "\ufe0f\u200d")
+    return " ".join("".join(kept).split())
+
+# ---------------------------
+# ✅ Catalog State
+# ---------------------------
+
+_emotions: Dict[str, str] = catalog_texts()
+_translations: Dict[Tuple[str, str], str] = {}          # (lang, english) -> translated text
+_audio: Dict[str, Tuple[str, float]] = {}               # object name -> (signed url, expires at)
+_stats = StatsCounter()
+
+
+def localize(text: str, lang: str) -> Optional[str]:
+    """Precomputed translation of a catalog text, or None if it is not in the catalog."""
+    if not lang or lang == "en":
+        return text
+    translated = _translations.get((lang, text))
+    _stats.bump("text_hits" if translated is not None else "text_misses")
+    return translated
+
+
+async def localized(text: str, lang: str) -> str:
+    """Catalog translation, falling back to the translation service for unknown texts."""
+    translated = localize(text, lang)
+    if translated is None:
+        translated = await translate(text, source_lang="en", target_lang=lang)
+    return translated
+
+
+def localized_sync(text: str, lang: str) -> str:
+    translated = localize(text, lang)
+    if translated is None:
+        translated = translate_sync(text, source_lang="en", target_lang=lang)
+    return translated
+
+
+def _voice(gender: Optional[str]) -> str:
+    return gender if gender in CATALOG_VOICES else "male"
+
+
+def _object_name(text: str, lang: str, gender: str) -> Tuple[str, str, str]:
+    """Returns (object name, speech text, emotion) for one catalog recording. `gender` must be a catalog voice."""
+    from app.utils.audio_processor import audio_object_name
+
+    emotion = _emotions.get(text, "unknown")
+    speech = speech_text(_translations.get((lang, text), text))
+    prefix = f"{CATALOG_AUDIO_PREFIX}/{lang}/{gender}/"
+    return audio_object_name(speech, gender, emotion, lang, prefix=prefix), speech, emotion
+
+
+def cached_catalog_audio(text: str, lang: str, gender: str) -> Optional[str]:
+    """Signed URL for pre-synthesized audio if it is on hand and not about to expire. No network."""
+    name, _, _ = _object_name(text, lang or "en", _voice(gender))
+    entry = _audio.get(name)
+    if entry and entry[1] - time.time() > CATALOG_AUDIO_RENEW_MARGIN:
+        _stats.bump("audio_hits")
+        return entry[0]
+    return None
+
+
+async def _sign(name: str) -> str:
+    from app.utils.audio_processor import sign_audio_url
+
+    url = await sign_audio_url(name, CATALOG_AUDIO_URL_TTL)
+    _audio[name] = (url, time.time() + CATALOG_AUDIO_URL_TTL)
+    return url
+
+
+async def catalog_audio(text: str, lang: str, gender: str) -> Optional[str]:
+    """
+    Audio for a catalog text in the user's language and voice.
+    Served from the pre-synthesized recording; an expiring URL is re-signed (no TTS),
+    and a recording that does not exist yet is synthesized once and kept.
+    Returns None if synthesis fails, like the routes' own TTS error handling.
+    """
+    from app.utils.audio_processor import synthesize_to_object
+
+    lang = lang or "en"
+    gender = _voice(gender)
+    url = cached_catalog_audio(text, lang, gender)
+    if url:
+        return url
+
+    name, speech, emotion = _object_name(text, lang, gender)
+    try:
+        if name in _audio:
+            _stats.bump("audio_renewed")
+        else:
+            _stats.bump("audio_synthesized")
+            await synthesize_to_object(speech, name, gender=gender, emotion=emotion, lang=lang)
+        return await _sign(name)
+    except Exception as e:
+        logger.warning(f"[MessageCatalog] audio unavailable for '{name}': {e}")
+        return None
+
+# ---------------------------
+# ✅ Startup Warm-up
+# ---------------------------
+
+async def _warm_translations(texts: List[str]):
+    for lang in LANG_MAP:
+        if lang == "en":
+            continue
+        try:
+            await translate_many(texts, source_lang="en", target_lang=lang)
+        except Exception as e:
+            logger.warning(f"[MessageCatalog] translation warm-up failed for {lang}: {e}")
+            continue
+        # translate_many hands back English on failure; only real translations are pinned
+        src, tgt = LANG_MAP["en"], LANG_MAP[lang]
+        for text in texts:
+            translated = await get_cached_translation_async(translation_key(src, tgt, text))
+            if translated is not None:
+                _translations[(lang, text)] = translated
+
+
+async def _warm_audio(texts: List[str]):
+    from app.utils.audio_processor import list_audio_objects
+
+    limit = asyncio.Semaphore(MESSAGE_CATALOG_TTS_CONCURRENCY)
+
+    async def warm_one(text: str, lang: str, gender: str, existing: set):
+        name, _, _ = _object_name(text, lang, gender)
+        async with limit:
+            if name.rsplit("/", 1)[-1] in existing:
+                await _sign(name)
+            else:
+                await catalog_audio(text, lang, gender)
+
+    for lang in MESSAGE_CATALOG_AUDIO_LANGS or list(LANG_MAP):
+        for gender in CATALOG_VOICES:
+            try:
+                existing = await list_audio_objects(f"{CATALOG_AUDIO_PREFIX}/{lang}/{gender}")
+            except Exception as e:
+                logger.warning(f"[MessageCatalog] could not list audio for {lang}/{gender}: {e}")
+                existing = set()
+            results = await asyncio.gather(
+                *[warm_one(text, lang, gender, existing) for text in texts], return_exceptions=True
+            )
+            failed = sum(1 for result in results if isinstance(result, Exception))
+            if failed:
+                logger.warning(f"[MessageCatalog] {failed} recordings failed for {lang}/{gender}")
+
+
+async def warm_message_catalog():
+    """
+    Build the catalog at startup: translations for every LANG_MAP language (served
+    from the persistent translation cache after the first boot), then, if
+    MESSAGE_CATALOG_PRESYNTHESIZE is set, audio for every voice (existing recordings
+    are only re-signed). Otherwise each recording is synthesized on first use.
+    """
+    if not MESSAGE_CATALOG_WARMUP:
+        return
+    set_llm_priority(batch=True)
+    started = time.monotonic()
+    texts = list(_emotions)
+    await _warm_translations(texts)
+    logger.info(f"[MessageCatalog] {len(_translations)} translations ready in {time.monotonic() - started:.1f}s")
+    if MESSAGE_CATALOG_PRESYNTHESIZE:
+        await _warm_audio(texts)
+        logger.info(f"[MessageCatalog] {len(_audio)} recordings ready in {time.monotonic() - started:.1f}s")
+
+
+def get_message_catalog_stats() -> dict:
+    stats = _stats.snapshot()
+    stats["texts"] = len(_emotions)
+    stats["translations"] = len(_translations)
+    stats["recordings"] = len(_audio)
+    return stats
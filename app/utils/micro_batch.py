@@ -0,0 +1,137 @@
+# Copyright (c) 2025 Shiladitya Mallick
+# This file is part of the Neura - Your Smart Assistant project.
+# Licensed under the MIT License - see the LICENSE file for details.
+
+
+import time
+import queue
+import logging
+import threading
+from concurrent.futures import Future
+from typing import List, Optional
+
+logger = logging.getLogger(__name__)
+
+# ---------------------------
+# ✅ Jobs
+# ---------------------------
+
+class BatchJob:
+    """One queued input; `future` resolves to its result."""
+
+    def __init__(self, text: str):
+        self.text = text
+        self.future: Future = Future()
+
+# ---------------------------
+# ✅ Micro-batching Worker
+# ---------------------------
+
+class MicroBatchWorker:
+    """
+    Runs an in-process model on one worker thread.
+    The thread loads the model once (`_load`), then drains the queue in micro-batches:
+    after the first job arrives it waits up to `wait_ms` for more, up to `batch_size`,
+    and hands them to `_process`, so concurrent callers share one forward pass.
+    A failed load is latched: later submits fail at once instead of reloading the model,
+    so callers fall back to their remote API without waiting on a timeout.
+    Subclasses implement `_load` and `_process`.
+    """
+
+    def __init__(self, name: str, batch_size: int, wait_ms: float):
+        self.name = name
+        self.batch_size = batch_size
+        self.wait_ms = wait_ms
+        self._queue: "queue.Queue[BatchJob]" = queue.Queue()
+        self._worker: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self.loaded = False
+        self.load_error: Optional[Exception] = None
+        self.batches = 0
+        self.texts = 0
+        self.busy_seconds = 0.0
+
+    def _load(self):
+        raise NotImplementedError
+
+    def _process(self, batch: List[BatchJob]):
+        """Resolve every job in `batch`. Jobs left unresolved after an exception get that exception."""
+        raise NotImplementedError
+
+    def _next_batch(self) -> List[BatchJob]:
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.wait_ms / 1000
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        # Callers that timed out cancelled their futures; claim the rest so they can't be
+        return [job for job in batch if job.future.set_running_or_notify_cancel()]
+
+    def _run(self):
+        try:
+            self._load()
+        except Exception as e:
+            logger.error(f"❌ {self.name} failed to load, not retrying: {e}")
+            with self._lock:
+                self.load_error = e
+            self._fail_pending(e)
+            return
+        self.loaded = True
+
+        while True:
+            batch = self._next_batch()
+            if not batch:
+                continue
+            started = time.monotonic()
+            try:
+                self._process(batch)
+            except Exception as e:
+                logger.warning(f"❌ {self.name} batch failed: {e}")
+                for job in batch:
+                    if not job.future.done():
+                        job.future.set_exception(e)
+            self.batches += 1
+            self.texts += len(batch)
+            self.busy_seconds += time.monotonic() - started
+
+    def _fail_pending(self, error: Exception):
+        while True:
+            try:
+                job = self._queue.get_nowait()
+            except queue.Empty:
+                return
+            if job.future.set_running_or_notify_cancel():
+                job.future.set_exception(error)
+
+    @property
+    def available(self) -> bool:
+        """False once loading has failed; callers can go straight to their fallback."""
+        return self.load_error is None
+
+    def submit_job(self, job: BatchJob) -> Future:
+        with self._lock:
+            # Under the lock, so a job is either rejected here or drained by _fail_pending
+            if self.load_error is not None:
+                job.future.set_exception(self.load_error)
+                return job.future
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(target=self._run, name=self.name, daemon=True)
+                self._worker.start()
+            self._queue.put(job)
+        return job.future
+
+    def stats(self) -> dict:
+        return {
+            "loaded": self.loaded,
+            "load_error": str(self.load_error) if self.load_error else None,
+            "batches": self.batches,
+            "texts": self.texts,
+            "avg_batch_size": round(self.texts / self.batches, 2) if self.batches else 0.0,
+            "avg_batch_ms": round(self.busy_seconds / self.batches * 1000, 1) if self.batches else 0.0,
+            "queued": self._queue.qsize(),
+        }
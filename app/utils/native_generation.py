@@ -0,0 +1,88 @@
+# Copyright (c) 2025 Shiladitya Mallick
+# This file is part of the Neura - Your Smart Assistant project.
+# Licensed under the MIT License - see the LICENSE file for details.
+
+
+import os
+from typing import Dict, Optional
+
+from app.utils.stats_counter import StatsCounter
+
+# ---------------------------
+# ✅ Settings
+# ---------------------------
+
+# Comma-separated preferred_lang codes whose conversational replies are generated in
+# that language directly, instead of English + NLLB translation back ("translate sandwich")
+NATIVE_GENERATION_LANGS = {
+    lang.strip() for lang in os.getenv("NATIVE_GENERATION_LANGS", "").split(",") if lang.strip()
+}
+
+# Names the model understands, for every LANG_MAP language
+LANGUAGE_NAMES = {
+    "ar": "Arabic", "bg": "Bulgarian", "zh": "Chinese (Simplified)", "hr": "Croatian",
+    "cs": "Czech", "da": "Danish", "nl": "Dutch", "en": "English",
+    "fil": "Filipino", "fi": "Finnish", "fr": "French", "de": "German",
+    "el": "Greek", "hi": "Hindi", "id": "Indonesian", "it": "Italian",
+    "ja": "Japanese", "ko": "Korean", "ms": "Malay", "pl": "Polish",
+    "pt": "Portuguese", "ro": "Romanian", "ru": "Russian", "sk": "Slovak",
+    "es": "Spanish", "sv": "Swedish", "ta": "Tamil", "tr": "Turkish",
+    "uk": "Ukrainian", "hu": "Hungarian", "no": "Norwegian", "vi": "Vietnamese",
+}
+
+
+def is_native_generation(lang: Optional[str]) -> bool:
+    return bool(lang) and lang != "en" and lang in NATIVE_GENERATION_LANGS and lang in LANGUAGE_NAMES
+
+
+def native_reply_instruction(lang: str) -> str:
+    name = LANGUAGE_NAMES[lang]
+    return (
+        f"The user speaks {name}. Reply only in {name}, naturally and fluently, "
+        "even if earlier messages are in another language."
+    )
+
+# ---------------------------
+# ✅ Latency per Language
+# ---------------------------
+
+# (lang, channel, mode, "turns" | "seconds" | "translation_seconds") -> total
+_latency = StatsCounter()
+
+
+def record_reply_latency(
+    lang: str,
+    native: bool,
+    seconds: float,
+    translation_seconds: float = 0.0,
+    channel: str = "chat"
+):
+    """Time for one conversational turn, from the user's text to the final reply."""
+    key = (lang, channel, "native" if native else "translated")
+    _latency.update({
+        (*key, "turns"): 1,
+        (*key, "seconds"): seconds,
+        (*key, "translation_seconds"): translation_seconds,
+    })
+
+
+def get_native_generation_stats() -> dict:
+    snapshot = _latency.snapshot()
+
+    languages: Dict[str, dict] = {}
+    for (lang, channel, mode, field), turns in sorted(snapshot.items()):
+        if field != "turns" or not turns:
+            continue
+        total = snapshot.get((lang, channel, mode, "seconds"), 0.0)
+        translation = snapshot.get((lang, channel, mode, "translation_seconds"), 0.0)
+        languages.setdefault(lang, {}).setdefault(channel, {})[mode] = {
+            "turns": turns,
+            "avg_ms": round(total / turns * 1000, 1),
+            "avg_translation_ms": round(translation / turns * 1000, 1),
+        }
+    for channels in languages.values():
+        for modes in channels.values():
+            if "native" in modes and "translated" in modes:
+                modes["saved_ms_per_turn"] = round(modes["translated"]["avg_ms"] - modes["native"]["avg_ms"], 1)
+
+    return {"enabled_languages": sorted(NATIVE_GENERATION_LANGS), "languages": languages}
@@ -9,10 +9,10 @@ from app.utils.user_persona_utils import get_user_persona_snapshot
 from app.utils.tone_bias_helper import generate_tone_instruction
 
 
-def inject_persona_into_prompt(user: User, raw_prompt: str, db: Session) -> str:
+def build_persona_header(user: User, db: Session) -> str:
     """
-    Injects user persona tone, emotion, behavior, and usage pattern modifiers into the prompt.
-    This version supports advanced prompt shaping for Mistral.
+    Builds the persona/tone header on its own, so callers can hand it to
+    `generate_ai_reply(persona=...)` and keep it out of the static cache key.
     """
 
     persona = get_user_persona_snapshot(user, db)
@@ -34,4 +34,12 @@ def inject_persona_into_prompt(user: User, raw_prompt: str, db: Session) -> str:
 
 """
 
-    return f"{persona_header}{raw_prompt}"
+    return persona_header
+
+
+def inject_persona_into_prompt(user: User, raw_prompt: str, db: Session) -> str:
+    """
+    Injects user persona tone, emotion, behavior, and usage pattern modifiers into the prompt.
+    This version supports advanced prompt shaping for Mistral.
+    """
+    return f"{build_persona_header(user, db)}{raw_prompt}"
@@ -0,0 +1,127 @@
+# Copyright (c) 2025 Shiladitya Mallick
+# This file is part of the Neura - Your Smart Assistant project.
+# Licensed under the MIT License - see the LICENSE file for details.
+
+
+import logging
+from typing import List, Optional
+
+logger = logging.getLogger(__name__)
+
+# ---------------------------
+# ✅ Token Counting (tiktoken)
+# ---------------------------
+
+_encoding = None
+_encoding_failed = False
+
+
+def _get_encoding():
+    """cl100k_base is close enough to the hosted model's tokenizer for budgeting."""
+    global _encoding, _encoding_failed
+    if _encoding is None and not _encoding_failed:
+        try:
+            import tiktoken
+            _encoding = tiktoken.get_encoding("cl100k_base")
+        except Exception as e:
+            # tiktoken downloads its BPE file on first use; fall back to an estimate offline
+            logger.warning(f"[PromptBuilder] tiktoken unavailable, estimating tokens: {e}")
+            _encoding_failed = True
+    return _encoding
+
+
+def count_tokens(text: str) -> int:
+    if not text:
+        return 0
+    encoding = _get_encoding()
+    if encoding is None:
+        return max(1, len(text) // 4)
+    return len(encoding.encode(text))
+
+
+def truncate_tokens(text: str, max_tokens: int, keep: str = "head") -> str:
+    """Cut text to `max_tokens`, keeping the start (`head`) or the end (`tail`)."""
+    if max_tokens <= 0:
+        return ""
+    encoding = _get_encoding()
+    if encoding is None:
+        limit = max_tokens * 4
+        return text[:limit] if keep == "head" else text[-limit:]
+    tokens = encoding.encode(text)
+    if len(tokens) <= max_tokens:
+        return text
+    kept = tokens[:max_tokens] if keep == "head" else tokens[-max_tokens:]
+    return encoding.decode(kept)
+
+# ---------------------------
+# ✅ Budgets per Intent
+# ---------------------------
+
+PROMPT_BUDGETS = {
+    "chat_fallback": 3000,
+    "voice_fallback": 1500,
+    "summarize": 2000,
+    "default": 2500,
+}
+
+# ---------------------------
+# ✅ Sections
+# ---------------------------
+
+class PromptSection:
+    """
+    One block of a prompt.
+    Lower `priority` numbers are more important; priority 0 is never trimmed unless
+    it alone exceeds the budget. `keep` decides which end survives trimming
+    ("tail" suits chat history, where the newest lines matter most).
+    """
+
+    def __init__(self, name: str, text: str, priority: int, keep: str = "head", separator: str = "\n"):
+        self.name = name
+        self.text = text or ""
+        self.priority = priority
+        self.keep = keep
+        self.separator = separator
+        self.tokens = count_tokens(self.text)
+
+    def trim_to(self, max_tokens: int):
+        if max_tokens <= 0:
+            self.text, self.tokens = "", 0
+            return
+        if self.keep == "tail" and "\n" in self.text:
+            # Drop whole lines from the top so no turn is cut mid-sentence
+            lines = self.text.splitlines()
+            while lines and count_tokens("\n".join(lines)) > max_tokens:
+                lines.pop(0)
+            self.text = "\n".join(lines)
+        else:
+            self.text = truncate_tokens(self.text, max_tokens, keep=self.keep)
+        self.tokens = count_tokens(self.text)
+
+
+def build_prompt(sections: List[PromptSection], intent: Optional[str] = None, budget: Optional[int] = None) -> str:
+    """
+    Join sections in the given order, trimming the least important ones first until
+    the total fits the budget for `intent` (or an explicit `budget`).
+    """
+    budget = budget or PROMPT_BUDGETS.get(intent or "default", PROMPT_BUDGETS["default"])
+    total = sum(s.tokens for s in sections)
+
+    if total > budget:
+        # Lower-priority sections give up tokens first; priority 0 only as a last resort
+        trim_order = sorted((s for s in sections if s.priority > 0), key=lambda s: s.priority, reverse=True)
+        trim_order += [s for s in sections if s.priority == 0]
+        for section in trim_order:
+            if total <= budget:
+                break
+            before = section.tokens
+            section.trim_to(before - (total - budget))
+            total -= before - section.tokens
+
+        logger.info(
+            "[PromptBuilder] %s trimmed to %d/%d tokens: %s",
+            intent or "prompt", total, budget,
+            ", ".join(f"{s.name}={s.tokens}" for s in sections)
+        )
+
+    return "".join(f"{s.text}{s.separator}" for s in sections if s.text)
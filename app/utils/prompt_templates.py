@@ -2,7 +2,7 @@
 # This file is part of the Neura - Your Smart Assistant project.
 # Licensed under the MIT License - see the LICENSE file for details.
 
-from app.services.translation_service import translate
+from app.utils.message_catalog import message, localized
 
 # -------------------------
 # Journal
@@ -471,29 +471,12 @@ Guidelines:
 # Copyright
 # -------------------------
 
-def red_flag_response(reason: str = "code or internal details", lang: str = "en") -> str:
-    text = (
-        f"I'm sorry, but I can't share my {reason}. "
-        "My creator, Shiladitya Mallick, designed me with care to keep certain details private. "
-        "If you're curious, feel free to connect with him on Instagram: @byshiladityamallick."
-    )
-    return translate(text, source_lang="en", target_lang=lang)
+async def red_flag_response(reason: str = "code or internal details", lang: str = "en") -> str:
+    return await localized(message("red_flag", reason=reason), lang)
 
-def creator_info_response(lang: str = "en") -> str:
-    text = (
-        "I was created by Shiladitya Mallick. "
-        "If you’d like to learn more, you can reach out to him on Instagram: @byshiladityamallick."
-    )
-    return translate(text, source_lang="en", target_lang=lang)
-
-
-def self_query_response(ai_name: str = "Neura", lang: str = "en") -> str:
-    text = (
-        f"Hey there, I’m {ai_name} — always here for you, always listening and always learning. "
-        "Think of me as your personal companion for goals, habits, thoughts, and safety. "
-        "I’ll remember and understand emotions, also the important stuff, whisper reminders when you need them, and stay silent when you want peace. "
-        "Just say what’s on your mind — I’m right here with you."
-    )
-    return translate(text, source_lang="en", target_lang=lang)
+async def creator_info_response(lang: str = "en") -> str:
+    return await localized(message("creator_info"), lang)
 
 
+async def self_query_response(ai_name: str = "Neura", lang: str = "en") -> str:
+    return await localized(message("self_query", ai_name=ai_name), lang)
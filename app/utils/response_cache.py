@@ -0,0 +1,144 @@
+# Copyright (c) 2025 Shiladitya Mallick
+# This file is part of the Neura - Your Smart Assistant project.
+# Licensed under the MIT License - see the LICENSE file for details.
+
+
+import os
+import time
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+# ---------------------------
+# ✅ Key Helpers
+# ---------------------------
+
+def normalize_prompt(text: str) -> str:
+    """Collapse whitespace so cosmetic differences in prompt templates share a key."""
+    return " ".join((text or "").split())
+
+
+def content_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+# ---------------------------
+# ✅ In-Memory Backend
+# ---------------------------
+
+class TTLCache:
+    """
+    Thread-safe LRU cache with a per-entry TTL.
+    Safe to share between the event loop and scheduler threads.
+    """
+
+    def __init__(self, max_entries: int = 1000, ttl: Optional[float] = None):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._data: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: str):
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                self.misses += 1
+                return None
+            value, expires_at = item
+            if expires_at is not None and expires_at < time.monotonic():
+                del self._data[key]
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: str, value, ttl: Optional[float] = None):
+        ttl = self.ttl if ttl is None else ttl
+        expires_at = time.monotonic() + ttl if ttl else None
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def __len__(self):
+        return len(self._data)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._data),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+# ---------------------------
+# ✅ Optional Shared Backend (Redis)
+# ---------------------------
+
+CACHE_REDIS_URL = os.getenv("CACHE_REDIS_URL")
+
+
+class RedisCache:
+    """Shared string cache so replicas reuse each other's results."""
+
+    def __init__(self, url: str, namespace: str = "neura"):
+        import redis  # optional dependency, only needed when CACHE_REDIS_URL is set
+        self.client = redis.Redis.from_url(url, socket_timeout=0.5, decode_responses=True)
+        self.namespace = namespace
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+
+    def get(self, key: str) -> Optional[str]:
+        try:
+            value = self.client.get(f"{self.namespace}:{key}")
+        except Exception as e:
+            self.errors += 1
+            logger.warning(f"[SharedCache] get failed: {e}")
+            return None
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    def set(self, key: str, value: str, ttl: Optional[float] = None):
+        try:
+            self.client.set(f"{self.namespace}:{key}", value, ex=int(ttl) if ttl else None)
+        except Exception as e:
+            self.errors += 1
+            logger.warning(f"[SharedCache] set failed: {e}")
+
+    def stats(self) -> dict:
+        return {"hits": self.hits, "misses": self.misses, "errors": self.errors}
+
+
+_shared_cache = None
+_shared_lock = threading.Lock()
+
+
+def get_shared_cache() -> Optional[RedisCache]:
+    """Return the shared backend, or None when CACHE_REDIS_URL is unset or unusable."""
+    global _shared_cache
+    if not CACHE_REDIS_URL:
+        return None
+    with _shared_lock:
+        if _shared_cache is None:
+            try:
+                _shared_cache = RedisCache(CACHE_REDIS_URL)
+            except Exception as e:
+                logger.warning(f"[SharedCache] disabled: {e}")
+                _shared_cache = False
+    return _shared_cache or None
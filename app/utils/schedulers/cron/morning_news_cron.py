@@ -8,8 +8,9 @@ from app.models.database import SessionLocal
 from app.models.user import User
 from app.utils.tier_logic import is_voice_ping_allowed
 from app.services.search_service import search_duckduckgo, format_results_for_summary
-from app.utils.ai_engine import generate_ai_reply
+from app.utils.ai_engine import generate_ai_reply_sync
 from app.utils.voice_sender import store_voice_weekly_summary
+from app.utils.tts_worker_pool import LANE_BACKGROUND
 import logging
 
 logger = logging.getLogger(__name__)
@@ -41,7 +42,7 @@ def run_morning_news_cron():
                     continue
 
                 prompt = format_results_for_summary(results[:5], "today's top news in India")
-                summary = generate_ai_reply(prompt).strip()
+                summary = generate_ai_reply_sync(prompt, cache="morning_news", task="summarize").strip()
 
                 # Optional: Weather alert injection
                 if any(word in summary.lower() for word in ["rain", "storm", "heatwave"]):
@@ -49,7 +50,7 @@ def run_morning_news_cron():
 
                 # Voice delivery
                 if is_voice_ping_allowed(user) and user.voice_nudges_enabled and user.preferred_delivery_mode == "voice":
-                    store_voice_weekly_summary(user, summary, db)
+                    store_voice_weekly_summary(user, summary, db, lane=LANE_BACKGROUND)
                     logger.info("[MorningNewsCron] Sent voice news to user %s", user.id)
 
             except Exception as e:
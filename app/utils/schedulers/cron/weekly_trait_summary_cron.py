@@ -10,9 +10,9 @@ from sqlalchemy.orm import Session
 from app.models.database import SessionLocal
 from app.models.user import User, TierLevel
 from app.services.trait_summary_service import generate_weekly_trait_summary
-from app.utils.audio_processor import synthesize_voice
+from app.utils.audio_processor import submit_voice
 from app.models.notification import NotificationLog
-from app.services.translation_service import translate
+from app.services.translation_service import translate_sync
 
 logger = logging.getLogger(__name__)
 logging.basicConfig(level=logging.INFO)
@@ -28,6 +28,8 @@ def weekly_trait_summaries_cron():
             getattr(User, "is_active", True) == True  # ✅ Safe fallback if field missing
         ).all()
 
+        # 🔊 Queue every user's audio first; the TTS pool's background lane bounds the fan-out
+        pending = []
         for user in users:
             try:
                 summary_text = generate_weekly_trait_summary(user, db)
@@ -37,14 +39,22 @@ def weekly_trait_summaries_cron():
 
                 # 🌐 Translate summary if needed
                 if user_lang != "en":
-                    summary_text = translate(summary_text, source_lang="en", target_lang=user_lang)
+                    summary_text = translate_sync(summary_text, source_lang="en", target_lang=user_lang)
 
-                stream_url = synthesize_voice(
+                job = submit_voice(
                     summary_text,
                     gender=voice_gender,
                     emotion=emotion,
                     lang=user_lang
                 )
+                pending.append((user, summary_text, job))
+
+            except Exception as e:
+                logger.warning(f"⚠️ Failed summary for user {user.id}: {e}")
+
+        for user, summary_text, job in pending:
+            try:
+                stream_url = job.result()
 
                 notification = NotificationLog(
                     user_id=user.id,
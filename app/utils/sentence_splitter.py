@@ -0,0 +1,53 @@
+# Copyright (c) 2025 Shiladitya Mallick
+# This file is part of the Neura - Your Smart Assistant project.
+# Licensed under the MIT License - see the LICENSE file for details.
+
+
+import re
+from typing import AsyncIterator, List
+
+# Sentence end: . ! ? (plus Devanagari danda and CJK full stops) followed by whitespace
+_SENTENCE_END = re.compile(r"(?<=[.!?।。！？])\s+")
+
+
+def split_sentences(text: str) -> List[str]:
+    """Split text into sentences, keeping punctuation attached."""
+    return [s.strip() for s in _SENTENCE_END.split(text or "") if s.strip()]
+
+
+def chunk_for_tts(text: str, max_chars: int) -> List[str]:
+    """
+    Split text at sentence boundaries into chunks of up to `max_chars`.
+    The first chunk is a single sentence so the first audio is ready quickly.
+    A single sentence longer than `max_chars` stays whole rather than being cut mid-sentence.
+    """
+    sentences = split_sentences(text)
+    if not sentences:
+        return []
+    chunks, current = [sentences[0]], ""
+    for sentence in sentences[1:]:
+        if current and len(current) + 1 + len(sentence) > max_chars:
+            chunks.append(current)
+            current = sentence
+        else:
+            current = f"{current} {sentence}" if current else sentence
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+async def stream_sentences(chunks: AsyncIterator[str]) -> AsyncIterator[str]:
+    """
+    Re-chunk a token stream into complete sentences.
+    The trailing partial sentence is flushed when the stream ends.
+    """
+    buffer = ""
+    async for chunk in chunks:
+        buffer += chunk
+        parts = _SENTENCE_END.split(buffer)
+        for sentence in parts[:-1]:
+            if sentence.strip():
+                yield sentence.strip()
+        buffer = parts[-1]
+    if buffer.strip():
+        yield buffer.strip()
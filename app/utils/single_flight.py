@@ -0,0 +1,131 @@
+# Copyright (c) 2025 Shiladitya Mallick
+# This file is part of the Neura - Your Smart Assistant project.
+# Licensed under the MIT License - see the LICENSE file for details.
+
+
+import asyncio
+import weakref
+import threading
+from typing import Any, Awaitable, Callable, Dict, List
+
+# ---------------------------
+# ✅ Single-Flight Groups
+# ---------------------------
+
+_GROUPS: List["SingleFlight"] = []
+
+
+class _SyncCall:
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent identical calls: while a call for `key` is in flight,
+    later callers wait for its result instead of hitting the upstream again.
+    Nothing is cached once the call finishes.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        # In-flight tasks per event loop: a task can only be awaited from its own loop,
+        # and cron jobs (asyncio.run) and the TTS worker run loops besides the app's
+        self._tasks: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, asyncio.Future]]" = (
+            weakref.WeakKeyDictionary()
+        )
+        self._waiters: Dict[asyncio.Future, int] = {}
+        self._calls: Dict[str, _SyncCall] = {}
+        self._lock = threading.Lock()
+        self.leaders = 0
+        self.coalesced = 0
+        _GROUPS.append(self)
+
+    def _count(self, leader: bool):
+        with self._lock:
+            if leader:
+                self.leaders += 1
+            else:
+                self.coalesced += 1
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Await `fn()` once per key. The upstream call runs as its own task, so a
+        cancelled caller (e.g. a dropped websocket) does not cancel it for the others.
+        Once every caller has gone away the upstream call is cancelled too.
+        """
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            tasks = self._tasks.setdefault(loop, {})
+            task = tasks.get(key)
+            leader = task is None
+            if leader:
+                task = asyncio.ensure_future(fn())
+                tasks[key] = task
+            self._waiters[task] = self._waiters.get(task, 0) + 1
+        if leader:
+            task.add_done_callback(lambda t, k=key, l=loop: self._forget(l, k, t))
+        self._count(leader)
+
+        try:
+            return await asyncio.shield(task)
+        finally:
+            with self._lock:
+                self._waiters[task] -= 1
+                abandoned = not self._waiters[task]
+                if abandoned:
+                    del self._waiters[task]
+            if abandoned and not task.done():
+                task.cancel()
+
+    def _forget(self, loop: asyncio.AbstractEventLoop, key: str, task: asyncio.Future):
+        with self._lock:
+            tasks = self._tasks.get(loop)
+            if tasks is not None and tasks.get(key) is task:
+                del tasks[key]
+        if not task.cancelled():
+            task.exception()  # mark retrieved even if every waiter went away
+
+    def do_sync(self, key: str, fn: Callable[[], Any]) -> Any:
+        """Thread-based twin of `do` for scheduler threads and other sync callers."""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = _SyncCall()
+                self._calls[key] = call
+        self._count(leader)
+
+        if not leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.event.set()
+
+    def stats(self) -> dict:
+        total = self.leaders + self.coalesced
+        with self._lock:
+            in_flight = sum(len(tasks) for tasks in self._tasks.values()) + len(self._calls)
+        return {
+            "upstream_calls": self.leaders,
+            "coalesced": self.coalesced,
+            "in_flight": in_flight,
+            "coalesced_rate": round(self.coalesced / total, 4) if total else 0.0,
+        }
+
+
+def get_single_flight_stats() -> dict:
+    return {group.name: group.stats() for group in _GROUPS}
@@ -0,0 +1,33 @@
+# Copyright (c) 2025 Shiladitya Mallick
+# This file is part of the Neura - Your Smart Assistant project.
+# Licensed under the MIT License - see the LICENSE file for details.
+
+
+import threading
+from collections import Counter
+from typing import Hashable, Mapping
+
+
+class StatsCounter:
+    """
+    Thread-safe counters behind the get_*_stats() helpers in /healthz/ai-metrics.
+    Request loops, the TTS worker loop and cron threads all bump the same instance.
+    Keys are usually names; tuples work too for per-lane or per-language counts.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counts = Counter()
+
+    def bump(self, key: Hashable, amount: float = 1):
+        with self._lock:
+            self._counts[key] += amount
+
+    def update(self, amounts: Mapping[Hashable, float]):
+        """Add several counts at once, so readers never see half of them."""
+        with self._lock:
+            self._counts.update(amounts)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return dict(self._counts)
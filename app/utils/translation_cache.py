@@ -0,0 +1,176 @@
+# Copyright (c) 2025 Shiladitya Mallick
+# This file is part of the Neura - Your Smart Assistant project.
+# Licensed under the MIT License - see the LICENSE file for details.
+
+
+import os
+import json
+import asyncio
+import sqlite3
+import logging
+import threading
+from pathlib import Path
+from typing import Optional
+
+from app.utils.response_cache import TTLCache, content_hash
+
+logger = logging.getLogger(__name__)
+
+# ---------------------------
+# ✅ Settings
+# ---------------------------
+
+CACHE_ROOT = Path(os.getenv("HF_HOME", "/data"))
+TRANSLATION_CACHE_DIR = Path(os.getenv("TRANSLATION_CACHE_DIR", str(CACHE_ROOT / "translation_cache")))
+TRANSLATION_CACHE_SIZE = int(os.getenv("TRANSLATION_CACHE_SIZE", "20000"))
+TRANSLATION_CACHE_PERSIST = os.getenv("TRANSLATION_CACHE_PERSIST", "true").lower() == "true"
+
+# ---------------------------
+# ✅ Persistent Store (SQLite)
+# ---------------------------
+
+class TranslationStore:
+    """
+    Disk-backed key/value store for translations.
+    Each new translation is one INSERT, so nothing is rewritten as the cache grows,
+    and WAL mode lets several workers share the file.
+    """
+
+    def __init__(self, directory: Path):
+        self.path = directory / "translations.sqlite3"
+        self._directory = directory
+        self._conn: Optional[sqlite3.Connection] = None
+        self._failed = False
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+
+    def _connect(self) -> Optional[sqlite3.Connection]:
+        if self._conn is None and not self._failed:
+            try:
+                self._directory.mkdir(parents=True, exist_ok=True)
+                conn = sqlite3.connect(str(self.path), check_same_thread=False, timeout=5)
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute("PRAGMA synchronous=NORMAL")
+                conn.execute("CREATE TABLE IF NOT EXISTS translations (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+                conn.commit()
+                self._conn = conn
+            except Exception as e:
+                # Read-only or missing volume: keep working with the in-memory cache only
+                logger.warning(f"[TranslationCache] persistent store unavailable: {e}")
+                self._failed = True
+                return None
+            self._import_legacy_json()
+        return self._conn
+
+    def _import_legacy_json(self):
+        """Fold the old per-language /translate-ui files (`{lang}.json`, English source) into the store."""
+        legacy_files = list(self._directory.glob("*.json"))
+        if not legacy_files:
+            return
+        from app.services.translation_service import LANG_MAP
+
+        for path in legacy_files:
+            lang = path.stem
+            if lang not in LANG_MAP:
+                continue
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    entries = json.load(f)
+                rows = [
+                    (translation_key(LANG_MAP["en"], LANG_MAP[lang], text), value)
+                    for text, value in entries.items()
+                ]
+                self._conn.executemany("INSERT OR IGNORE INTO translations (key, value) VALUES (?, ?)", rows)
+                self._conn.commit()
+                path.rename(path.with_suffix(".json.imported"))
+                logger.info(f"[TranslationCache] imported {len(rows)} legacy UI strings for '{lang}'")
+            except Exception as e:
+                logger.warning(f"[TranslationCache] could not import {path.name}: {e}")
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            conn = self._connect()
+            if conn is None:
+                return None
+            try:
+                row = conn.execute("SELECT value FROM translations WHERE key = ?", (key,)).fetchone()
+            except sqlite3.Error as e:
+                logger.warning(f"[TranslationCache] read failed: {e}")
+                return None
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return row[0]
+
+    def set(self, key: str, value: str):
+        with self._lock:
+            conn = self._connect()
+            if conn is None:
+                return
+            try:
+                conn.execute("INSERT OR REPLACE INTO translations (key, value) VALUES (?, ?)", (key, value))
+                conn.commit()
+                self.writes += 1
+            except sqlite3.Error as e:
+                logger.warning(f"[TranslationCache] write failed: {e}")
+
+    def stats(self) -> dict:
+        return {
+            "enabled": self._conn is not None,
+            "hits": self.hits,
+            "misses": self.misses,
+            "writes": self.writes,
+        }
+
+# ---------------------------
+# ✅ Two-Level Cache
+# ---------------------------
+
+_memory = TTLCache(max_entries=TRANSLATION_CACHE_SIZE)
+_store = TranslationStore(TRANSLATION_CACHE_DIR) if TRANSLATION_CACHE_PERSIST else None
+
+
+def translation_key(src: str, tgt: str, text: str) -> str:
+    """`src`/`tgt` are NLLB codes, so "en" and "eng_Latn" callers share entries."""
+    return f"{src}:{tgt}:{content_hash(text)}"
+
+
+def get_cached_translation(key: str) -> Optional[str]:
+    cached = _memory.get(key)
+    if cached is None and _store is not None:
+        cached = _store.get(key)
+        if cached is not None:
+            _memory.set(key, cached)
+    return cached
+
+
+def store_translation(key: str, value: str):
+    _memory.set(key, value)
+    if _store is not None:
+        _store.set(key, value)
+
+
+async def get_cached_translation_async(key: str) -> Optional[str]:
+    """Async twin of `get_cached_translation`: SQLite runs in a worker thread, off the event loop."""
+    cached = _memory.get(key)
+    if cached is None and _store is not None:
+        cached = await asyncio.to_thread(_store.get, key)
+        if cached is not None:
+            _memory.set(key, cached)
+    return cached
+
+
+async def store_translation_async(key: str, value: str):
+    _memory.set(key, value)
+    if _store is not None:
+        await asyncio.to_thread(_store.set, key, value)
+
+
+def get_translation_cache_stats() -> dict:
+    return {
+        "memory": _memory.stats(),
+        "persistent": _store.stats() if _store is not None else {"enabled": False},
+    }
@@ -0,0 +1,196 @@
+# Copyright (c) 2025 Shiladitya Mallick
+# This file is part of the Neura - Your Smart Assistant project.
+# Licensed under the MIT License - see the LICENSE file for details.
+
+
+import os
+import time
+import asyncio
+import logging
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Awaitable, Callable, List, Optional
+
+from app.utils.stats_counter import StatsCounter
+
+logger = logging.getLogger(__name__)
+
+# ---------------------------
+# ✅ Settings
+# ---------------------------
+
+TTS_CACHE_ENABLED = os.getenv("TTS_CACHE_ENABLED", "true").lower() == "true"
+TTS_CACHE_PREFIX = "tts/"
+TTS_CACHE_MAX_BYTES = int(os.getenv("TTS_CACHE_MAX_BYTES", str(500 * 1024 * 1024)))
+# Signed URLs are created for a day and re-signed once less than an hour is left,
+# so every URL handed out stays valid for at least as long as the old one-hour URLs
+TTS_SIGNED_URL_TTL = int(os.getenv("TTS_SIGNED_URL_TTL", "86400"))
+TTS_URL_MIN_VALIDITY = int(os.getenv("TTS_URL_MIN_VALIDITY", "3600"))
+TTS_INDEX_PAGE_SIZE = 1000
+
+# ---------------------------
+# ✅ Cache Index
+# ---------------------------
+
+class _Entry:
+    def __init__(self, size: int, url: Optional[str] = None, expires_at: float = 0.0):
+        self.size = size
+        self.url = url
+        self.expires_at = expires_at
+
+
+class TTSAudioCache:
+    """
+    Index of synthesized audio stored under content-addressed names.
+    Keeps each object's signed URL with its expiry, renews URLs before they lapse,
+    and deletes the least recently used objects once the total size is over budget.
+    Storage calls are passed in, so this module does not depend on the storage client.
+    """
+
+    def __init__(
+        self,
+        sign: Callable[[str, int], Awaitable[str]],
+        remove: Callable[[List[str]], Awaitable[None]],
+        list_folder: Callable[[str, int, int], Awaitable[list]],
+        max_bytes: int = TTS_CACHE_MAX_BYTES,
+    ):
+        self._sign = sign
+        self._remove = remove
+        self._list_folder = list_folder
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._indexed = False
+        self._indexing: Optional[Future] = None  # the load in progress, shared by every loop
+        self._stats = StatsCounter()
+
+    async def _load_index(self):
+        """
+        Rebuild the index from storage once per process, so restarts keep their cache.
+        Concurrent callers (from any event loop) wait for the one load in progress.
+        """
+        while not self._indexed:
+            with self._lock:
+                loading, owner = self._indexing, self._indexing is None
+                if owner:
+                    loading = self._indexing = Future()
+            if not owner:
+                # Shielded: a cancelled waiter must not cancel the load for everyone else
+                await asyncio.shield(asyncio.wrap_future(loading))
+                continue
+            try:
+                await self._build_index()
+            finally:
+                # If the load was cancelled `_indexed` is still False and the next caller retries
+                with self._lock:
+                    self._indexing = None
+                loading.set_result(None)
+
+    async def _build_index(self):
+        folder = TTS_CACHE_PREFIX.rstrip("/")
+        offset, found = 0, []
+        try:
+            while True:
+                page = await self._list_folder(folder, TTS_INDEX_PAGE_SIZE, offset)
+                found.extend(page)
+                if len(page) < TTS_INDEX_PAGE_SIZE:
+                    break
+                offset += TTS_INDEX_PAGE_SIZE
+        except Exception as e:
+            logger.warning(f"[TTSCache] could not index stored audio: {e}")
+
+        # Each file is pushed to the LRU end ahead of entries stored during the load, so
+        # walk newest first: the oldest file ends up first in line for eviction
+        found.sort(key=lambda item: item.get("last_accessed_at") or item.get("created_at") or "", reverse=True)
+        with self._lock:
+            for item in found:
+                name = f"{TTS_CACHE_PREFIX}{item['name']}"
+                if name not in self._entries:
+                    size = int((item.get("metadata") or {}).get("size") or 0)
+                    self._entries[name] = _Entry(size)
+                    self._entries.move_to_end(name, last=False)
+                    self._bytes += size
+            self._indexed = True
+        logger.info(f"[TTSCache] indexed {len(found)} stored files ({self._bytes} bytes)")
+        await self._evict()
+
+    async def _renew(self, name: str, entry: _Entry) -> str:
+        url = await self._sign(name, TTS_SIGNED_URL_TTL)
+        entry.url, entry.expires_at = url, time.time() + TTS_SIGNED_URL_TTL
+        return url
+
+    async def lookup(self, name: str) -> Optional[str]:
+        """
+        Signed URL for `name` if the audio is already stored, else None.
+        A URL close to expiry is re-signed; no audio is synthesized here.
+        """
+        await self._load_index()
+        with self._lock:
+            entry = self._entries.get(name)
+            if entry is not None:
+                self._entries.move_to_end(name)
+        if entry is None:
+            self._stats.bump("misses")
+            return None
+
+        if entry.url and entry.expires_at - time.time() > TTS_URL_MIN_VALIDITY:
+            self._stats.bump("hits")
+            return entry.url
+        try:
+            url = await self._renew(name, entry)
+        except Exception as e:
+            # The object is gone (deleted elsewhere); forget it and synthesize again
+            logger.warning(f"[TTSCache] could not sign {name}: {e}")
+            self._forget(name)
+            self._stats.bump("misses")
+            return None
+        self._stats.bump("renewals")
+        return url
+
+    async def store(self, name: str, size: int) -> str:
+        """Record a freshly uploaded object and return its signed URL."""
+        entry = _Entry(size)
+        url = await self._renew(name, entry)
+        with self._lock:
+            previous = self._entries.pop(name, None)
+            if previous is not None:
+                self._bytes -= previous.size
+            self._entries[name] = entry
+            self._bytes += size
+        self._stats.bump("stored")
+        self._stats.bump("bytes_uploaded", size)
+        await self._evict()
+        return url
+
+    def _forget(self, name: str):
+        with self._lock:
+            entry = self._entries.pop(name, None)
+            if entry is not None:
+                self._bytes -= entry.size
+
+    async def _evict(self):
+        victims = []
+        with self._lock:
+            while self._bytes > self.max_bytes and len(self._entries) > 1:
+                name, entry = self._entries.popitem(last=False)
+                self._bytes -= entry.size
+                victims.append(name)
+        if not victims:
+            return
+        self._stats.bump("evicted", len(victims))
+        try:
+            await self._remove(victims)
+        except Exception as e:
+            logger.warning(f"[TTSCache] could not delete {len(victims)} evicted files: {e}")
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "enabled": TTS_CACHE_ENABLED,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                **self._stats.snapshot(),
+            }
@@ -0,0 +1,240 @@
+# Copyright (c) 2025 Shiladitya Mallick
+# This file is part of the Neura - Your Smart Assistant project.
+# Licensed under the MIT License - see the LICENSE file for details.
+
+
+import os
+import time
+import asyncio
+import logging
+import threading
+from concurrent.futures import Future
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from app.utils.llm_scheduler import PRIORITY_BATCH, PRIORITY_INTERACTIVE, current_priority, use_priority
+from app.utils.stats_counter import StatsCounter
+
+logger = logging.getLogger(__name__)
+
+# ---------------------------
+# ✅ Settings
+# ---------------------------
+
+LANE_INTERACTIVE = "interactive"
+LANE_BACKGROUND = "background"  # cron fan-out, catalog warm-up, archival uploads
+
+TTS_INTERACTIVE_WORKERS = int(os.getenv("TTS_INTERACTIVE_WORKERS", "4"))
+TTS_BACKGROUND_WORKERS = int(os.getenv("TTS_BACKGROUND_WORKERS", "2"))
+TTS_MAX_ATTEMPTS = int(os.getenv("TTS_MAX_ATTEMPTS", "3"))
+TTS_RETRY_BACKOFF = float(os.getenv("TTS_RETRY_BACKOFF", "1.0"))  # 1s → 2s
+# How long a caller waits for a queued job (queueing, retries and backoff included)
+TTS_JOB_TIMEOUT = float(os.getenv("TTS_JOB_TIMEOUT", "90"))
+
+# ---------------------------
+# ✅ Provider Errors
+# ---------------------------
+
+class TTSProviderError(Exception):
+    """Non-success response from a TTS provider. Only 429 and 5xx are worth retrying."""
+
+    def __init__(self, status: int, detail: str = ""):
+        super().__init__(f"TTS error: {status} {detail}")
+        self.status = status
+
+    @property
+    def retryable(self) -> bool:
+        return self.status == 429 or self.status >= 500
+
+# ---------------------------
+# ✅ Token Bucket
+# ---------------------------
+
+class TokenBucket:
+    """
+    Request rate limit shared by every event loop and thread.
+    A caller that finds the bucket empty reserves the next token and sleeps until it
+    is due, so waiting callers are paced at `rate` per second in arrival order.
+    """
+
+    def __init__(self, name: str, rate: float, capacity: float):
+        self.name = name
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+        self.throttled = 0
+        self.waited = 0.0
+
+    def _reserve(self) -> float:
+        """Take one token, possibly in advance. Returns how long to wait for it."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0.0
+            delay = -self._tokens / self.rate
+            self.throttled += 1
+            self.waited += delay
+            return delay
+
+    async def acquire(self):
+        if self.rate <= 0:
+            return
+        delay = self._reserve()
+        if delay:
+            await asyncio.sleep(delay)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "rate_per_second": self.rate,
+                "burst": self.capacity,
+                "throttled": self.throttled,
+                "total_wait_ms": round(self.waited * 1000, 1),
+            }
+
+# ---------------------------
+# ✅ Jobs
+# ---------------------------
+
+class TTSJob:
+    """
+    Handle for a queued job. Sync callers (cron threads) block on `result()`;
+    async callers `await job.wait()`.
+    """
+
+    def __init__(self, fn: Callable[..., Awaitable[Any]], args: tuple, lane: str, priority: int):
+        self.fn = fn
+        self.args = args
+        self.lane = lane
+        self.priority = priority
+        self.future: Future = Future()
+        self.queued_at = time.monotonic()
+
+    def done(self) -> bool:
+        return self.future.done()
+
+    def result(self, timeout: Optional[float] = TTS_JOB_TIMEOUT) -> Any:
+        return self.future.result(timeout=timeout)
+
+    async def wait(self, timeout: Optional[float] = TTS_JOB_TIMEOUT) -> Any:
+        return await asyncio.wait_for(asyncio.wrap_future(self.future), timeout=timeout)
+
+    def add_done_callback(self, fn: Callable[["TTSJob"], None]):
+        """Run `fn(job)` once the job finishes (on the pool's thread)."""
+        self.future.add_done_callback(lambda _: fn(self))
+
+# ---------------------------
+# ✅ Worker Pool
+# ---------------------------
+
+class TTSWorkerPool:
+    """
+    Runs TTS jobs on a dedicated event loop thread, one queue per lane.
+    Each lane has its own workers, so a cron fan-out of thousands of users only
+    ever occupies the background workers and never delays interactive replies.
+    Failed jobs are retried with exponential backoff unless the error says not to.
+    """
+
+    def __init__(self, name: str, lanes: Dict[str, int]):
+        self.name = name
+        self.lanes = lanes
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._queues: Dict[str, asyncio.Queue] = {}
+        self._lock = threading.Lock()
+        # Keyed by (lane, name); "running" goes up and back down around each job
+        self._stats = StatsCounter()
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                ready = threading.Event()
+                self._thread = threading.Thread(target=self._run, args=(ready,), name=self.name, daemon=True)
+                self._thread.start()
+                ready.wait()
+            return self._loop
+
+    def _run(self, ready: threading.Event):
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        self._loop = loop
+        self._queues = {lane: asyncio.Queue() for lane in self.lanes}
+        for lane, workers in self.lanes.items():
+            for _ in range(workers):
+                loop.create_task(self._worker(lane))
+        ready.set()
+        loop.run_forever()
+
+    def submit(self, fn: Callable[..., Awaitable[Any]], *args, lane: str = LANE_INTERACTIVE) -> TTSJob:
+        """
+        Queue `await fn(*args)` on `lane` and return its handle. Safe from any thread.
+        Interactive jobs keep the caller's request priority for provider slots;
+        background jobs always queue behind them.
+        """
+        default = PRIORITY_BATCH if lane == LANE_BACKGROUND else PRIORITY_INTERACTIVE
+        priority = default if lane == LANE_BACKGROUND else current_priority(default)
+        job = TTSJob(fn, args, lane, priority)
+        loop = self._ensure_loop()
+        loop.call_soon_threadsafe(self._queues[lane].put_nowait, job)
+        self._stats.bump((lane, "submitted"))
+        return job
+
+    async def _worker(self, lane: str):
+        queue = self._queues[lane]
+        while True:
+            job = await queue.get()
+            if not job.future.set_running_or_notify_cancel():
+                self._stats.bump((lane, "cancelled"))
+                continue
+
+            use_priority(job.priority)
+            started = time.monotonic()
+            self._stats.bump((lane, "wait_seconds"), started - job.queued_at)
+            self._stats.bump((lane, "running"))
+            try:
+                job.future.set_result(await self._attempt(job))
+                self._stats.bump((lane, "completed"))
+            except Exception as e:
+                job.future.set_exception(e)
+                self._stats.bump((lane, "failed"))
+            finally:
+                self._stats.bump((lane, "running"), -1)
+                self._stats.bump((lane, "run_seconds"), time.monotonic() - started)
+
+    async def _attempt(self, job: TTSJob) -> Any:
+        for attempt in range(1, TTS_MAX_ATTEMPTS + 1):
+            try:
+                return await job.fn(*job.args)
+            except Exception as e:
+                if attempt == TTS_MAX_ATTEMPTS or not getattr(e, "retryable", True):
+                    raise
+                backoff = TTS_RETRY_BACKOFF * 2 ** (attempt - 1)
+                logger.warning(
+                    f"[TTSPool] {job.lane} job failed (attempt {attempt}/{TTS_MAX_ATTEMPTS}), "
+                    f"retrying in {backoff:.0f}s: {e}"
+                )
+                self._stats.bump((job.lane, "retries"))
+                await asyncio.sleep(backoff)
+
+    def stats(self) -> dict:
+        snapshot = self._stats.snapshot()
+        lanes = {}
+        for lane, workers in self.lanes.items():
+            counts = {key: value for (name, key), value in snapshot.items() if name == lane}
+            started = counts.get("completed", 0) + counts.get("failed", 0)
+            wait = counts.pop("wait_seconds", 0.0)
+            run = counts.pop("run_seconds", 0.0)
+            queue = self._queues.get(lane)
+            lanes[lane] = {
+                "workers": workers,
+                "running": counts.pop("running", 0),
+                "queued": queue.qsize() if queue is not None else 0,
+                **counts,
+                "avg_wait_ms": round(wait / started * 1000, 1) if started else 0.0,
+                "avg_run_ms": round(run / started * 1000, 1) if started else 0.0,
+            }
+        return lanes
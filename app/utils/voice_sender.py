@@ -4,7 +4,8 @@
 
 
 import logging
-from app.utils.audio_processor import synthesize_voice
+from app.utils.audio_processor import synthesize_voice, submit_voice
+from app.utils.tts_worker_pool import TTSJob, LANE_INTERACTIVE
 from app.models.notification import NotificationLog
 from app.models.database import SessionLocal
 from datetime import datetime
@@ -21,13 +22,16 @@ async def send_voice_to_neura(
     gender: str = "male",
     emotion: str = "unknown",
     lang: str = "en",
-    request: Optional[Request] = None
+    request: Optional[Request] = None,
+    audio_url: Optional[str] = None,
+    lane: str = LANE_INTERACTIVE
 ) -> dict:
     """
     Synthesizes voice and logs the notification (no file saved).
-    Returns a streaming URL.
+    Pass `audio_url` to reuse pre-synthesized audio instead, and `lane=LANE_BACKGROUND`
+    from cron fan-outs. Returns a streaming URL.
     """
-    stream_url = synthesize_voice(text, gender=gender, emotion=emotion, lang=lang)
+    stream_url = audio_url or await synthesize_voice(text, gender=gender, emotion=emotion, lang=lang, lane=lane)
 
     db = SessionLocal()
     try:
@@ -57,26 +61,42 @@ async def send_voice_to_neura(
     }
 
 
-def store_voice_weekly_summary(user: User, summary_text: str, db: Session):
+def store_voice_weekly_summary(user: User, summary_text: str, db: Session, lane: str = LANE_INTERACTIVE):
     """
     Synthesizes a weekly voice summary and logs it using streaming.
+    Returns at once: synthesis is queued on the TTS pool and the notification is
+    logged (in its own session) when the audio is ready, so neither request
+    handlers nor cron threads wait on ElevenLabs.
     """
-    try:
-        voice_gender = user.voice if user.voice in ["male", "female"] else "male"
-        stream_url = synthesize_voice(summary_text, gender=voice_gender, emotion=user.emotion_status, lang=user.preferred_lang)
+    user_id, user_name = user.id, user.name
+    voice_gender = user.voice if user.voice in ["male", "female"] else "male"
 
-        notification = NotificationLog(
-            user_id=user.id,
-            notification_type="weekly_summary_voice",
-            content=f"{summary_text} [stream: {stream_url}]",
-            delivered=False,
-            timestamp=datetime.utcnow()
-        )
+    def log_summary(job: TTSJob):
+        if job.future.exception() is not None:
+            logger.error("⚠️ Failed to synthesize voice summary for %s: %s", user_name, job.future.exception())
+            return
 
-        db.add(notification)
-        db.commit()
-        logger.info("🎧 Streamed voice summary saved for %s", user.name)
+        log_db = SessionLocal()
+        try:
+            log_db.add(NotificationLog(
+                user_id=user_id,
+                notification_type="weekly_summary_voice",
+                content=f"{summary_text} [stream: {job.result()}]",
+                delivered=False,
+                timestamp=datetime.utcnow()
+            ))
+            log_db.commit()
+            logger.info("🎧 Streamed voice summary saved for %s", user_name)
+        except Exception as e:
+            log_db.rollback()
+            logger.error("⚠️ Failed to log voice summary for %s: %s", user_name, str(e))
+        finally:
+            log_db.close()
 
-    except Exception as e:
-        db.rollback()
-        logger.error("⚠️ Failed to log voice summary for %s: %s", user.name, str(e))
+    submit_voice(
+        summary_text,
+        gender=voice_gender,
+        emotion=user.emotion_status or "unknown",
+        lang=user.preferred_lang or "en",
+        lane=lane
+    ).add_done_callback(log_summary)
@@ -0,0 +1,10 @@
+# Copyright (c) 2025 Shiladitya Mallick
+# This file is part of the Neura - Your Smart Assistant project.
+# Licensed under the MIT License - see the LICENSE file for details.
+
+
+import sys
+from pathlib import Path
+
+# The repo root holds an __init__.py, so make `import app` work however pytest is started
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
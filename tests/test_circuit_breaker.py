@@ -0,0 +1,98 @@
+# Copyright (c) 2025 Shiladitya Mallick
+# This file is part of the Neura - Your Smart Assistant project.
+# Licensed under the MIT License - see the LICENSE file for details.
+
+
+import pytest
+
+from app.utils import circuit_breaker
+from app.utils.circuit_breaker import CircuitBreaker, CLOSED, OPEN, HALF_OPEN
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = _Clock()
+    monkeypatch.setattr(circuit_breaker.time, "monotonic", clock)
+    return clock
+
+
+def _breaker(name: str) -> CircuitBreaker:
+    return CircuitBreaker(name, failure_rate_threshold=0.5, window_size=4, min_calls=4, open_seconds=30)
+
+
+def test_stays_closed_below_min_calls(clock):
+    breaker = _breaker("test-min-calls")
+    for _ in range(3):
+        breaker.record_failure()
+    assert breaker.state == CLOSED
+    assert breaker.allow_request()
+
+
+def test_opens_at_failure_rate_and_rejects(clock):
+    breaker = _breaker("test-opens")
+    breaker.record_success()
+    breaker.record_success()
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.state == OPEN
+    assert not breaker.allow_request()
+    assert breaker.stats()["rejected"] == 1
+
+
+def test_half_open_after_cooldown_allows_one_probe(clock):
+    breaker = _breaker("test-half-open")
+    for _ in range(4):
+        breaker.record_failure()
+    clock.now += 30
+    assert breaker.state == HALF_OPEN
+    assert breaker.allow_request()
+    assert not breaker.allow_request()
+
+
+def test_probe_success_closes(clock):
+    breaker = _breaker("test-probe-success")
+    for _ in range(4):
+        breaker.record_failure()
+    clock.now += 30
+    assert breaker.allow_request()
+    breaker.record_success()
+    assert breaker.state == CLOSED
+    assert breaker.stats()["window_calls"] == 0
+
+
+def test_probe_failure_reopens(clock):
+    breaker = _breaker("test-probe-failure")
+    for _ in range(4):
+        breaker.record_failure()
+    clock.now += 30
+    assert breaker.allow_request()
+    breaker.record_failure()
+    assert breaker.state == OPEN
+    assert not breaker.allow_request()
+
+
+def test_cancelled_probe_frees_its_slot(clock):
+    breaker = _breaker("test-probe-cancelled")
+    for _ in range(4):
+        breaker.record_failure()
+    clock.now += 30
+    assert breaker.allow_request()
+    breaker.record_cancelled()
+    assert breaker.state == HALF_OPEN
+    assert breaker.allow_request()
+
+
+def test_cancelled_calls_do_not_count_as_failures(clock):
+    breaker = _breaker("test-cancelled-closed")
+    for _ in range(4):
+        breaker.record_cancelled()
+    assert breaker.state == CLOSED
+    assert breaker.stats()["window_calls"] == 0
@@ -0,0 +1,74 @@
+# Copyright (c) 2025 Shiladitya Mallick
+# This file is part of the Neura - Your Smart Assistant project.
+# Licensed under the MIT License - see the LICENSE file for details.
+
+
+import asyncio
+
+import pytest
+
+from app.utils.client_pool import LoopClientPool, run_with_clients
+
+
+class _FakeClient:
+    def __init__(self):
+        self.is_closed = False
+
+    async def aclose(self):
+        self.is_closed = True
+
+
+def _pool():
+    made = []
+
+    def factory():
+        made.append(_FakeClient())
+        return made[-1]
+
+    return LoopClientPool("test", factory), made
+
+
+def test_one_client_per_loop():
+    pool, made = _pool()
+
+    async def use():
+        return pool.get() is pool.get()
+
+    assert asyncio.run(use()) and asyncio.run(use())
+    assert len(made) == 2
+
+
+def test_closed_client_is_replaced():
+    pool, made = _pool()
+
+    async def use():
+        first = pool.get()
+        await first.aclose()
+        return pool.get() is not first
+
+    assert asyncio.run(use())
+    assert len(made) == 2
+
+
+def test_run_with_clients_closes_the_jobs_clients():
+    pool, made = _pool()
+
+    async def job():
+        pool.get()
+        return "done"
+
+    assert run_with_clients(job) == "done"
+    assert made[0].is_closed
+    assert pool.open_clients() == 0
+
+
+def test_run_with_clients_closes_after_a_failure():
+    pool, made = _pool()
+
+    async def job():
+        pool.get()
+        raise ValueError("boom")
+
+    with pytest.raises(ValueError):
+        run_with_clients(job)
+    assert made[0].is_closed
@@ -0,0 +1,72 @@
+# Copyright (c) 2025 Shiladitya Mallick
+# This file is part of the Neura - Your Smart Assistant project.
+# Licensed under the MIT License - see the LICENSE file for details.
+
+
+import pytest
+
+from app.utils import intent_classifier as ic
+from app.utils.intent_classifier import IntentIndex, INTENT_INDEX, fast_classify
+
+
+@pytest.fixture(autouse=True)
+def fast_path(monkeypatch):
+    monkeypatch.setattr(ic, "FAST_PATH_ENABLED", True)
+    monkeypatch.setattr(ic, "FAST_PATH_THRESHOLD", 0.65)
+    monkeypatch.setattr(ic, "FAST_PATH_MARGIN", 0.15)
+
+
+def test_exact_alias_is_certain():
+    assert INTENT_INDEX.predict("Be my interpreter!") == ("interpreter_mode", 1.0)
+    assert fast_classify("be my interpreter") == ("interpreter_mode", 1.0)
+
+
+def test_alias_inside_a_longer_message_is_only_evidence():
+    intent, score = INTENT_INDEX.rank("please be my interpreter for the meeting with my whole team tomorrow morning")[0]
+    assert intent == "interpreter_mode"
+    assert score < 1.0
+
+
+def test_near_tie_scales_confidence_by_margin():
+    index = IntentIndex([
+        ("play some music please", "music"),
+        ("play some music now", "music_now"),
+        ("book a cab to the airport", "cab"),
+    ])
+    (top_intent, top), (_, runner_up) = index.rank("play some music")[:2]
+    assert top - runner_up < ic.FAST_PATH_MARGIN
+
+    intent, confidence = index.predict("play some music")
+    assert intent == top_intent
+    assert confidence == pytest.approx(top * (top - runner_up) / ic.FAST_PATH_MARGIN)
+    assert confidence < ic.FAST_PATH_THRESHOLD
+
+
+def test_clear_winner_keeps_its_score():
+    index = IntentIndex([("play some music please", "music"), ("book a cab to the airport", "cab")])
+    ranked = index.rank("play some music please")
+    top = ranked[0][1]
+    runner_up = ranked[1][1] if len(ranked) > 1 else 0.0
+    assert top - runner_up >= ic.FAST_PATH_MARGIN
+    assert index.predict("play some music please") == ("music", top)
+
+
+def test_low_confidence_goes_to_the_llm():
+    intent, confidence = fast_classify("what's the weather like on mars tomorrow")
+    assert intent is None
+    assert confidence < ic.FAST_PATH_THRESHOLD
+
+
+@pytest.mark.parametrize("message", [
+    "i dont want you to be my interpreter",
+    "don't be my interpreter",
+    "never start journaling again",
+])
+def test_negated_messages_go_to_the_llm(message):
+    before = ic.get_fast_path_stats().get("negated", 0)
+    assert fast_classify(message) == (None, 0.0)
+    assert ic.get_fast_path_stats()["negated"] == before + 1
+
+
+def test_empty_message_has_no_intent():
+    assert INTENT_INDEX.predict("  ?! ") == (None, 0.0)
@@ -0,0 +1,104 @@
+# Copyright (c) 2025 Shiladitya Mallick
+# This file is part of the Neura - Your Smart Assistant project.
+# Licensed under the MIT License - see the LICENSE file for details.
+
+
+import asyncio
+
+import pytest
+
+from app.utils.llm_scheduler import (
+    PriorityScheduler, PRIORITY_SOS, PRIORITY_INTERACTIVE, PRIORITY_BATCH, priority_for
+)
+
+
+class _User:
+    def __init__(self, tier: str):
+        self.tier = type("Tier", (), {"value": tier})()
+
+
+def test_priority_classes_and_tiers_order():
+    assert PRIORITY_SOS < PRIORITY_INTERACTIVE < PRIORITY_BATCH
+    assert priority_for(_User("pro")) < priority_for(_User("basic")) < priority_for(_User("free"))
+    # Request class outranks tier: a free SOS beats a pro interactive request
+    assert priority_for(sos=True) < priority_for(_User("pro"))
+
+
+def test_waiters_are_served_by_priority_then_arrival():
+    async def scenario():
+        scheduler = PriorityScheduler("test-order", max_concurrency=1)
+        await scheduler.acquire(PRIORITY_INTERACTIVE)
+        served = []
+
+        async def wait(label: str, priority: int):
+            await scheduler.acquire(priority)
+            served.append(label)
+            scheduler.release()
+
+        tasks = [
+            asyncio.ensure_future(wait("batch", PRIORITY_BATCH)),
+            asyncio.ensure_future(wait("interactive-1", PRIORITY_INTERACTIVE)),
+            asyncio.ensure_future(wait("sos", PRIORITY_SOS)),
+            asyncio.ensure_future(wait("interactive-2", PRIORITY_INTERACTIVE)),
+        ]
+        await asyncio.sleep(0)
+        assert scheduler.stats()["queue_depth"] == 4
+
+        scheduler.release()
+        await asyncio.gather(*tasks)
+        return served, scheduler.active
+
+    served, active = asyncio.run(scenario())
+    assert served == ["sos", "interactive-1", "interactive-2", "batch"]
+    assert active == 0
+
+
+def test_release_frees_slot_when_queue_is_empty():
+    async def scenario():
+        scheduler = PriorityScheduler("test-release", max_concurrency=2)
+        await scheduler.acquire(PRIORITY_INTERACTIVE)
+        await scheduler.acquire(PRIORITY_INTERACTIVE)
+        assert scheduler.active == 2
+        scheduler.release()
+        scheduler.release()
+        return scheduler.active
+
+    assert asyncio.run(scenario()) == 0
+
+
+def test_cancelled_waiter_does_not_leak_its_slot():
+    async def scenario():
+        scheduler = PriorityScheduler("test-cancel", max_concurrency=1)
+        await scheduler.acquire(PRIORITY_INTERACTIVE)
+
+        abandoned = asyncio.ensure_future(scheduler.acquire(PRIORITY_SOS))
+        waiting = asyncio.ensure_future(scheduler.acquire(PRIORITY_BATCH))
+        await asyncio.sleep(0)
+        abandoned.cancel()
+        await asyncio.sleep(0)
+
+        scheduler.release()
+        await asyncio.wait_for(waiting, timeout=1)
+        scheduler.release()
+        return scheduler.active, scheduler.stats()["queue_depth"]
+
+    assert asyncio.run(scenario()) == (0, 0)
+
+
+def test_sync_acquire_shares_slots_with_async_callers():
+    scheduler = PriorityScheduler("test-sync", max_concurrency=1)
+    scheduler.acquire_sync(PRIORITY_BATCH)
+    assert scheduler.active == 1
+    scheduler.release()
+    assert scheduler.active == 0
+
+
+def test_sync_acquire_refuses_a_running_loop():
+    scheduler = PriorityScheduler("test-sync-loop", max_concurrency=1)
+
+    async def scenario():
+        scheduler.acquire_sync(PRIORITY_BATCH)
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(scenario())
+    assert scheduler.active == 0
@@ -0,0 +1,78 @@
+# Copyright (c) 2025 Shiladitya Mallick
+# This file is part of the Neura - Your Smart Assistant project.
+# Licensed under the MIT License - see the LICENSE file for details.
+
+
+from app.utils.prompt_builder import (
+    PROMPT_BUDGETS, PromptSection, build_prompt, count_tokens, truncate_tokens
+)
+
+
+def _history(turns: int) -> str:
+    return "\n".join(f"User: message number {i} about the weekend plans" for i in range(turns))
+
+
+def test_prompt_under_budget_is_unchanged():
+    prompt = build_prompt([
+        PromptSection("persona", "You are Neura.", priority=2),
+        PromptSection("user", "User: hi", priority=0, separator=""),
+    ], budget=100)
+    assert prompt == "You are Neura.\nUser: hi"
+
+
+def test_lowest_priority_section_is_trimmed_first():
+    persona = "You are Neura, a kind assistant."
+    user = "User: what should I do this weekend?"
+    sections = [
+        PromptSection("persona", persona, priority=1),
+        PromptSection("history", _history(200), priority=2, keep="tail"),
+        PromptSection("memory", "likes hiking " * 200, priority=3),
+        PromptSection("user", user, priority=0, separator=""),
+    ]
+    prompt = build_prompt(sections, budget=300)
+
+    by_name = {s.name: s for s in sections}
+    assert by_name["memory"].text == ""
+    assert by_name["persona"].text == persona
+    assert by_name["user"].text == user
+    assert by_name["history"].text
+    assert sum(s.tokens for s in sections) <= 300
+    assert prompt.startswith(persona) and prompt.endswith(user)
+
+
+def test_history_keeps_the_newest_whole_lines():
+    history = PromptSection("history", _history(200), priority=1, keep="tail")
+    build_prompt([history, PromptSection("user", "User: hi", priority=0)], budget=200)
+
+    lines = history.text.splitlines()
+    assert lines[-1] == "User: message number 199 about the weekend plans"
+    assert all(line.startswith("User: message number") and line.endswith("plans") for line in lines)
+    assert history.tokens <= 200
+
+
+def test_priority_zero_is_cut_only_as_a_last_resort():
+    user = PromptSection("user", "word " * 1000, priority=0)
+    build_prompt([user], budget=50)
+    assert 0 < user.tokens <= 50
+
+
+def test_intent_budgets():
+    assert PROMPT_BUDGETS["summarize"] < PROMPT_BUDGETS["chat_fallback"]
+    long_text = _history(2000)
+    prompt = build_prompt([
+        PromptSection("instruction", "Summarize:", priority=0),
+        PromptSection("conversation", long_text, priority=1, keep="tail"),
+    ], intent="summarize")
+    # Budgets count section text; separators add at most one token each
+    assert count_tokens(prompt) <= PROMPT_BUDGETS["summarize"] + 2
+    # Unknown intents use the default budget
+    assert build_prompt([PromptSection("x", long_text, priority=1)], intent="nope").count("\n") < long_text.count("\n")
+
+
+def test_truncate_tokens_keeps_requested_end():
+    text = " ".join(f"w{i}" for i in range(500))
+    head = truncate_tokens(text, 20)
+    tail = truncate_tokens(text, 20, keep="tail")
+    assert text.startswith(head) and text.endswith(tail)
+    assert count_tokens(head) <= 20 and count_tokens(tail) <= 20
+    assert truncate_tokens(text, 0) == ""
@@ -0,0 +1,62 @@
+# Copyright (c) 2025 Shiladitya Mallick
+# This file is part of the Neura - Your Smart Assistant project.
+# Licensed under the MIT License - see the LICENSE file for details.
+
+
+import asyncio
+
+from app.utils.sentence_splitter import chunk_for_tts, split_sentences, stream_sentences
+
+
+def test_split_sentences_keeps_punctuation():
+    assert split_sentences("Hi there! How are you? Fine.") == ["Hi there!", "How are you?", "Fine."]
+
+
+def test_split_sentences_handles_danda_and_cjk():
+    assert split_sentences("नमस्ते। आप कैसे हैं?") == ["नमस्ते।", "आप कैसे हैं?"]
+    assert split_sentences("你好。 再见！") == ["你好。", "再见！"]
+
+
+def test_split_sentences_ignores_blank_text():
+    assert split_sentences("") == []
+    assert split_sentences(None) == []
+    assert split_sentences("   ") == []
+
+
+def test_decimals_do_not_split():
+    assert split_sentences("It costs 3.50 today. Thanks.") == ["It costs 3.50 today.", "Thanks."]
+
+
+def test_first_chunk_is_a_single_sentence():
+    text = "One. Two. Three. Four."
+    assert chunk_for_tts(text, max_chars=100) == ["One.", "Two. Three. Four."]
+
+
+def test_chunks_respect_max_chars():
+    sentences = [f"Sentence number {i} is here." for i in range(12)]
+    chunks = chunk_for_tts(" ".join(sentences), max_chars=60)
+
+    assert chunks[0] == sentences[0]
+    assert all(len(chunk) <= 60 for chunk in chunks)
+    assert " ".join(chunks) == " ".join(sentences)
+
+
+def test_long_sentence_is_never_cut():
+    long_sentence = "word " * 50 + "end."
+    chunks = chunk_for_tts(f"Hi. {long_sentence} Bye.", max_chars=40)
+    assert chunks == ["Hi.", long_sentence.strip(), "Bye."]
+
+
+def test_chunk_for_tts_empty():
+    assert chunk_for_tts("", max_chars=40) == []
+
+
+def test_stream_sentences_rechunks_tokens():
+    async def tokens():
+        for token in ["Hel", "lo there", ". How", " are you", "? I am", " fine"]:
+            yield token
+
+    async def collect():
+        return [sentence async for sentence in stream_sentences(tokens())]
+
+    assert asyncio.run(collect()) == ["Hello there.", "How are you?", "I am fine"]
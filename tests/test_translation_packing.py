@@ -0,0 +1,96 @@
+# Copyright (c) 2025 Shiladitya Mallick
+# This file is part of the Neura - Your Smart Assistant project.
+# Licensed under the MIT License - see the LICENSE file for details.
+
+
+import asyncio
+
+import pytest
+
+pytest.importorskip("httpx")
+pytest.importorskip("dotenv")
+
+from app.services import translation_service as ts  # noqa: E402
+
+
+class _FakeSpace:
+    """Records requests; by default translates by upper-casing each packed part."""
+
+    def __init__(self):
+        self.requests = []
+        self.cache = {}
+        self.reply = lambda text: ts.TRANSLATION_PACK_SEPARATOR.join(
+            part.upper() for part in text.split(ts.TRANSLATION_PACK_SEPARATOR)
+        )
+
+    async def request(self, text, src, tgt):
+        self.requests.append(text)
+        return self.reply(text)
+
+    async def cached(self, key):
+        return self.cache.get(key)
+
+    async def store(self, key, value):
+        self.cache[key] = value
+
+
+@pytest.fixture
+def space(monkeypatch):
+    """translation_service with an in-memory cache and a fake Space instead of the network."""
+    fake = _FakeSpace()
+    monkeypatch.setattr(ts, "_local_model", None)
+    monkeypatch.setattr(ts, "_request_translation", fake.request)
+    monkeypatch.setattr(ts, "get_cached_translation", fake.cache.get)
+    monkeypatch.setattr(ts, "store_translation", fake.cache.__setitem__)
+    monkeypatch.setattr(ts, "get_cached_translation_async", fake.cached)
+    monkeypatch.setattr(ts, "store_translation_async", fake.store)
+    return fake
+
+
+def test_pack_texts_respects_limits(monkeypatch):
+    monkeypatch.setattr(ts, "_local_model", None)
+    monkeypatch.setattr(ts, "TRANSLATION_PACK_MAX_ITEMS", 3)
+    texts = [f"line {i}" for i in range(7)] + ["has ||| separator", "x" * ts.TRANSLATION_PACK_MAX_CHARS]
+    packs = ts._pack_texts(texts)
+
+    assert [len(pack) for pack in packs] == [3, 3, 1, 1, 1]
+    assert ["has ||| separator"] in packs
+    assert ["x" * ts.TRANSLATION_PACK_MAX_CHARS] in packs
+    assert sorted(text for pack in packs for text in pack) == sorted(texts)
+
+
+def test_translate_many_packs_dedupes_and_keeps_order(space):
+    texts = ["good morning", "good night", "good morning", "", "see you"]
+    result = asyncio.run(ts.translate_many(texts, source_lang="en", target_lang="hi"))
+
+    assert result == ["GOOD MORNING", "GOOD NIGHT", "GOOD MORNING", "", "SEE YOU"]
+    assert len(space.requests) == 1  # three unique strings, one packed request
+    src, tgt = ts.LANG_MAP["en"], ts.LANG_MAP["hi"]
+    assert space.cache[ts.translation_key(src, tgt, "see you")] == "SEE YOU"
+
+
+def test_translate_many_serves_cached_strings_without_requests(space):
+    src, tgt = ts.LANG_MAP["en"], ts.LANG_MAP["hi"]
+    space.cache[ts.translation_key(src, tgt, "hello")] = "namaste"
+
+    assert asyncio.run(ts.translate_many(["hello"], source_lang="en", target_lang="hi")) == ["namaste"]
+    assert space.requests == []
+
+
+def test_pack_mismatch_falls_back_to_single_strings(space):
+    # The Space merged two parts into one, so the pack cannot be split back
+    packed = ts.TRANSLATION_PACK_SEPARATOR.join(["one", "two"])
+    space.reply = lambda text: "MERGED" if text == packed else text.upper()
+
+    result = asyncio.run(ts.translate_many(["one", "two"], source_lang="en", target_lang="hi"))
+
+    assert result == ["ONE", "TWO"]
+    assert space.requests == [packed, "one", "two"]
+    assert ts.get_translation_stats().get("pack_mismatches", 0) >= 1
+
+
+def test_unpack_rejects_empty_parts(space):
+    results = {}
+    translated = ts.TRANSLATION_PACK_SEPARATOR.join(["A", ""])
+    assert not ts._unpack(["a", "b"], translated, results, "eng_Latn", "hin_Deva")
+    assert results == {}
@@ -0,0 +1,123 @@
+# Copyright (c) 2025 Shiladitya Mallick
+# This file is part of the Neura - Your Smart Assistant project.
+# Licensed under the MIT License - see the LICENSE file for details.
+
+
+import asyncio
+
+from app.utils import tts_cache
+from app.utils.tts_cache import TTSAudioCache, TTS_CACHE_PREFIX
+
+
+class _FakeStorage:
+    """Storage calls TTSAudioCache is given, recorded in memory."""
+
+    def __init__(self, stored=None, list_delay: float = 0.0):
+        self.stored = stored or []
+        self.list_delay = list_delay
+        self.list_calls = 0
+        self.signed = []
+        self.removed = []
+
+    async def sign(self, name: str, ttl: int) -> str:
+        self.signed.append(name)
+        return f"https://signed/{name}?n={len(self.signed)}"
+
+    async def remove(self, names):
+        self.removed.extend(names)
+
+    async def list_folder(self, folder: str, limit: int, offset: int) -> list:
+        self.list_calls += 1
+        await asyncio.sleep(self.list_delay)
+        return self.stored[offset:offset + limit]
+
+    def cache(self, max_bytes: int = 1000) -> TTSAudioCache:
+        return TTSAudioCache(self.sign, self.remove, self.list_folder, max_bytes=max_bytes)
+
+
+def _name(n: int) -> str:
+    return f"{TTS_CACHE_PREFIX}{n}.mp3"
+
+
+def test_store_evicts_least_recently_used():
+    async def scenario():
+        storage = _FakeStorage()
+        cache = storage.cache(max_bytes=250)
+        await cache.store(_name(1), 100)
+        await cache.store(_name(2), 100)
+        await cache.lookup(_name(1))        # 1 is now the most recently used
+        await cache.store(_name(3), 100)    # over budget: 2 goes
+        return storage, cache
+
+    storage, cache = asyncio.run(scenario())
+    assert storage.removed == [_name(2)]
+    stats = cache.stats()
+    assert stats["entries"] == 2 and stats["bytes"] == 200 and stats["evicted"] == 1
+
+
+def test_the_newest_entry_is_never_evicted():
+    async def scenario():
+        storage = _FakeStorage()
+        cache = storage.cache(max_bytes=50)
+        await cache.store(_name(1), 100)
+        return storage, await cache.lookup(_name(1))
+
+    storage, url = asyncio.run(scenario())
+    assert storage.removed == []
+    assert url is not None
+
+
+def test_index_is_rebuilt_oldest_first_and_trimmed():
+    stored = [
+        {"name": "new.mp3", "created_at": "2025-03-01", "metadata": {"size": 400}},
+        {"name": "old.mp3", "created_at": "2025-01-01", "metadata": {"size": 400}},
+        {"name": "mid.mp3", "created_at": "2025-02-01", "metadata": {"size": 400}},
+    ]
+
+    async def scenario():
+        storage = _FakeStorage(stored)
+        cache = storage.cache(max_bytes=1000)
+        hit = await cache.lookup(f"{TTS_CACHE_PREFIX}new.mp3")
+        return storage, cache, hit
+
+    storage, cache, hit = asyncio.run(scenario())
+    assert storage.removed == [f"{TTS_CACHE_PREFIX}old.mp3"]
+    assert hit is not None
+    assert cache.stats()["bytes"] == 800
+
+
+def test_concurrent_lookups_share_one_index_load():
+    stored = [{"name": "a.mp3", "metadata": {"size": 10}}]
+
+    async def scenario():
+        storage = _FakeStorage(stored, list_delay=0.05)
+        cache = storage.cache()
+        urls = await asyncio.gather(*[cache.lookup(f"{TTS_CACHE_PREFIX}a.mp3") for _ in range(5)])
+        return storage, urls
+
+    storage, urls = asyncio.run(scenario())
+    assert storage.list_calls == 1
+    assert all(urls)
+
+
+def test_expiring_url_is_renewed(monkeypatch):
+    async def scenario():
+        storage = _FakeStorage()
+        cache = storage.cache()
+        first = await cache.store(_name(1), 10)
+        assert await cache.lookup(_name(1)) == first
+        monkeypatch.setattr(tts_cache, "TTS_URL_MIN_VALIDITY", tts_cache.TTS_SIGNED_URL_TTL + 1)
+        return first, await cache.lookup(_name(1)), cache.stats()
+
+    first, renewed, stats = asyncio.run(scenario())
+    assert renewed != first
+    assert stats["hits"] == 1 and stats["renewals"] == 1
+
+
+def test_unknown_name_is_a_miss():
+    async def scenario():
+        cache = _FakeStorage().cache()
+        return await cache.lookup(_name(9)), cache.stats()
+
+    url, stats = asyncio.run(scenario())
+    assert url is None and stats["misses"] == 1